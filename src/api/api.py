@@ -1,13 +1,36 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from api.container import ServiceContainer
+from api.middleware import RequestTimingMiddleware
 from api.routes.v1.table import table_router
 from api.routes.v1.player import player_router
 from api.routes.v1.wallet import wallet_router
+from api.routes.ws import ws_router
+from shared.metrics import CONTENT_TYPE, REGISTRY
+from shared.profiler import ProfilerBusyError, SamplingProfiler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = ServiceContainer()
+    await container.start()
+    app.state.container = container
+    yield
+    await container.shutdown()
 
-app = FastAPI(title="Poker Sibs API", version="1.0")
+
+app = FastAPI(title="Poker Sibs API", version="1.0", lifespan=lifespan)
+app.add_middleware(RequestTimingMiddleware)
+profiler = SamplingProfiler()
 
 app.include_router(table_router, prefix="/api")
 app.include_router(player_router, prefix="/api")
 app.include_router(wallet_router, prefix="/api")
+app.include_router(ws_router)
 
 
 @app.get("/api/health")
@@ -16,3 +39,35 @@ async def health_check():
     Health check endpoint to verify the API is running.
     """
     return {"status": "ok", "version": app.version}
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Latency histograms and counters in the Prometheus text format.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/api/metrics/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=300),
+    interval: float = Query(0.005, ge=0.001, le=1.0),
+):
+    """
+    Sample the event loop's stack for the given number of seconds and return
+    collapsed stacks for a flame graph. Only served when PROFILER_ENABLED is
+    set, and one profile at a time.
+    """
+    if not SamplingProfiler.enabled():
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    profiler.interval = interval
+    try:
+        profiler.start()
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        stacks = profiler.stop()
+    return PlainTextResponse(stacks)
@@ -0,0 +1,394 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Dict, List, Optional, Set
+
+from api.lobby_hub import LobbyHub
+from api.table_hub import TableHubRegistry
+from game.application.hand_dealer import HandDealer
+from game.application.hand_history_writer import (
+    HandHistoryBacklogError,
+    HandHistoryWriter,
+)
+from game.application.table_actor import TableActorRegistry
+from game.domain.exceptions import ChipConservationError
+from game.domain.factories import GameFactory
+from game.domain.interfaces import GameState
+from game.domain.poker.engine import PokerRulesEngine
+from game.domain.poker.hand_history import CompletedHand
+from game.domain.poker.value_objects import PokerGameState, RakeRule
+from game.infrastructure.deck_service import DeckService
+from game.infrastructure.entropy_pool import EntropyPool
+from game.infrastructure.hand_history_repository import SQLiteHandHistoryRepository
+from game.infrastructure.randomness_provider import LocalRandomnessProvider
+from player.application.player_query_service import FileSystemPlayerQueryService
+from player.application.player_service import PlayerService
+from player.infrastructure.hashing_service import HashingExecutor
+from player.infrastructure.player_repository import FileSystemPlayerRepository
+from player.infrastructure.player_store import PlayerLogStore
+from shared.metrics import REGISTRY, Metric, stats_metrics
+from table.application.lobby import LobbyView
+from table.application.table_service import TableService
+from table.infrastructure.table_registry import (
+    ConsistentHashTableRegistry,
+    InMemoryRegistryStore,
+    IRegistryStore,
+    RedisRegistryStore,
+    TableMigration,
+    WorkerInfo,
+)
+from table.infrastructure.table_respository import (
+    InMemoryTableRepository,
+    RedisTableRepository,
+    TableRepository,
+)
+from wallet.application.wallet_query_service import FileSystemWalletQueryService
+from wallet.application.wallet_service import WalletService
+from wallet.infrastructure.wallet_ledger import WalletLedger
+
+_SHOWDOWN_SECONDS = REGISTRY.histogram(
+    "poker_showdown_seconds", "Time to find a finished hand's winners and payouts"
+)
+_VOIDED_HANDS = REGISTRY.counter(
+    "poker_hands_voided",
+    "Finished hands whose payouts didn't add up, so every bet was refunded",
+)
+_MIGRATIONS = REGISTRY.counter(
+    "poker_table_migrations",
+    "Tables moved off this worker at a hand boundary, by outcome",
+    ("outcome",),
+)
+_LOBBY_REFRESH_FAILURES = REGISTRY.counter(
+    "poker_lobby_refresh_failures",
+    "Polls of the table repository for other workers' tables that failed",
+)
+_HUB_COUNTERS = (
+    "messages_enqueued",
+    "messages_sent",
+    "messages_dropped",
+    "resyncs",
+    "slow_consumers_dropped",
+)
+
+
+class ServiceContainer:
+    """
+    Services shared by every request on this worker. Created once by the app
+    lifespan so repositories, pools and caches are reused across requests.
+    """
+
+    def __init__(
+        self,
+        players_file: str = "players.json",
+        hand_history_file: str = "hand_history.db",
+        hand_history_journal: str = "hand_history.journal",
+        wallet_ledger_file: str = "wallet_ledger.jsonl",
+        hashing_workers: Optional[int] = None,
+        registry_store: Optional[IRegistryStore] = None,
+        table_repository: Optional[TableRepository] = None,
+        rake: Optional[RakeRule] = None,
+        rebalance_interval: float = 30.0,
+        lobby_refresh_interval: float = 5.0,
+    ):
+        self.worker = WorkerInfo(
+            worker_id=os.environ.get("GAME_WORKER_ID", "worker-0"),
+            url=os.environ.get("GAME_WORKER_URL", "http://127.0.0.1:8000"),
+        )
+        self.player_store = PlayerLogStore(players_file)
+        self.player_repository = FileSystemPlayerRepository(
+            players_file, store=self.player_store
+        )
+        self.player_query_service = FileSystemPlayerQueryService(
+            players_file, store=self.player_store
+        )
+        self.hashing_executor = HashingExecutor(max_workers=hashing_workers)
+        self.player_service = PlayerService(
+            self.player_repository, self.hashing_executor
+        )
+        self.table_hubs = TableHubRegistry()
+        self.hand_history_repository = SQLiteHandHistoryRepository(hand_history_file)
+        self.hand_history_writer = HandHistoryWriter(
+            self.hand_history_repository, journal_path=hand_history_journal
+        )
+        self.table_actors = TableActorRegistry(
+            GameFactory(), on_state=self._on_table_state
+        )
+        self.wallet_ledger = WalletLedger(wallet_ledger_file)
+        self.wallet_service = WalletService(self.wallet_ledger)
+        self.wallet_query_service = FileSystemWalletQueryService(
+            self.wallet_service, self.wallet_ledger
+        )
+        redis_url = os.environ.get("TABLE_REDIS_URL")
+        if table_repository is None:
+            table_repository = (
+                RedisTableRepository.from_url(redis_url)
+                if redis_url
+                else InMemoryTableRepository()
+            )
+        self.table_repository = table_repository
+        self.lobby = LobbyView()
+        self.lobby_hub = LobbyHub(self.lobby)
+        self.entropy_pool = EntropyPool(LocalRandomnessProvider())
+        self.deck_service = DeckService(self.entropy_pool)
+        self.dealer = HandDealer(
+            self.table_actors,
+            self.deck_service,
+            on_hand_boundary=self._on_hand_boundary,
+        )
+        self.rake = rake or RakeRule(
+            rate=int(os.environ.get("POKER_RAKE_BPS", "0")),
+            cap=int(os.environ.get("POKER_RAKE_CAP", "0")),
+        )
+        self.table_service = TableService(
+            self.table_actors,
+            self.wallet_service,
+            self.table_repository,
+            self.lobby,
+            self.dealer,
+        )
+        if registry_store is None:
+            registry_store = (
+                RedisRegistryStore.from_url(redis_url)
+                if redis_url
+                else InMemoryRegistryStore()
+            )
+        self.table_registry = ConsistentHashTableRegistry(registry_store)
+        self.rebalance_interval = rebalance_interval
+        self.lobby_refresh_interval = lobby_refresh_interval
+        self._tasks: Set[asyncio.Task] = set()
+        # Planned moves off this worker, refreshed from the registry by the
+        # rebalance loop so hand boundaries can check them without awaiting
+        self._outgoing: Dict[str, TableMigration] = {}
+
+    async def start(self) -> None:
+        """Warm up pools so the first requests don't pay for process start-up"""
+        self.hashing_executor.start()
+        await self.entropy_pool.start()
+        await self.hand_history_writer.start()
+        await self.wallet_service.start()
+        await self.table_repository.start()
+        await self.table_service.load_lobby()
+        if not await self.table_service.watch_lobby():
+            self._background(self._lobby_refresh_loop())
+        await self.table_registry.register_worker(self.worker)
+        self._background(self._rebalance_loop())
+        REGISTRY.register_collector(self.collect_metrics)
+
+    async def shutdown(self) -> None:
+        REGISTRY.unregister_collector(self.collect_metrics)
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.table_actors.close()
+        self.table_hubs.close()
+        self.lobby_hub.close()
+        await self.hand_history_writer.stop()
+        await self.entropy_pool.stop()
+        await self.wallet_service.stop()
+        self.hand_history_repository.close()
+        await self.table_repository.close()
+        await self.table_registry.store.close()
+        self.hashing_executor.shutdown()
+        self.player_store.close()
+
+    def collect_metrics(self) -> List[Metric]:
+        """The components' own metrics, published alongside the registry's"""
+        return [
+            *stats_metrics(
+                "poker_table_actor",
+                self.table_actors.metrics(),
+                "table_id",
+                counters=(
+                    "processed",
+                    "actions",
+                    "rejected",
+                    "failed",
+                    "read_batches",
+                ),
+            ),
+            *stats_metrics(
+                "poker_table_hub",
+                self.table_hubs.metrics(),
+                "table_id",
+                counters=_HUB_COUNTERS,
+            ),
+            *stats_metrics(
+                "poker_lobby_hub", self.lobby_hub.metrics, counters=_HUB_COUNTERS
+            ),
+            *stats_metrics(
+                "poker_lobby",
+                self.lobby.metrics,
+                counters=("deltas", "snapshots_built"),
+            ),
+            *stats_metrics(
+                "poker_hashing",
+                self.hashing_executor.metrics,
+                counters=("submitted", "completed", "rejected"),
+            ),
+            *stats_metrics(
+                "poker_hand_history",
+                self.hand_history_writer.metrics,
+                counters=("submitted", "flushed", "batches", "failed_flushes"),
+            ),
+            *stats_metrics(
+                "poker_entropy_pool",
+                self.entropy_pool.metrics,
+                counters=(
+                    "refills",
+                    "bytes_fetched",
+                    "bytes_served",
+                    "stalls",
+                    "refill_errors",
+                ),
+            ),
+            *stats_metrics(
+                "poker_wallet_ledger",
+                self.wallet_ledger.metrics,
+                counters=(
+                    "appended",
+                    "flushes",
+                    "conflicts",
+                    "failed_writes",
+                    "failed_flushes",
+                    "caught_up",
+                ),
+            ),
+        ]
+
+    def tables_served(self) -> int:
+        """Tables running or watched on this worker"""
+        return len(set(self.table_actors.metrics()) | set(self.table_hubs.metrics()))
+
+    async def close_table(self, table_id: str, moved_to: str = "") -> None:
+        """
+        Stop running a table here. Its sockets are closed with moved_to, the
+        URL of the table's new worker, so clients can reconnect there.
+        """
+        await self.table_actors.remove(table_id)
+        self.table_hubs.remove(table_id, moved_to)
+        self.dealer.forget_table(table_id)
+
+    async def adopt_table(self, table_id: str) -> None:
+        """
+        Seat a table another worker moved here, if its handoff is waiting.
+        Called before the table is used on this worker.
+        """
+        owner = await self.table_registry.get_server_for_table(table_id)
+        if owner != self.worker.url:
+            return
+        handoff = await self.table_registry.take_handoff(table_id)
+        if handoff is not None:
+            await self.dealer.take_over(table_id, handoff)
+
+    async def release_if_idle(self, table_id: str) -> None:
+        """Close a table nobody sits at or watches and give up its assignment"""
+        actor = self.table_actors.get(table_id)
+        if actor is not None and actor.game.seats:
+            return
+        if self.table_hubs.watched(table_id):
+            return
+        await self.close_table(table_id)
+        await self.table_registry.release_table(table_id, self.worker.worker_id)
+
+    async def _rebalance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebalance_interval)
+            try:
+                await self.table_registry.report_load(
+                    self.worker.worker_id, self.tables_served()
+                )
+                await self.table_registry.rebalance()
+                self._outgoing = {
+                    migration.table_id: migration
+                    for migration in await self.table_registry.migrations_from(
+                        self.worker.worker_id
+                    )
+                }
+                # Tables moved here that no client has followed yet
+                for table_id in await self.table_registry.handed_off_to(
+                    self.worker.worker_id
+                ):
+                    await self.adopt_table(table_id)
+            except Exception:
+                _MIGRATIONS.labels("rebalance_failed").inc()
+
+    async def _lobby_refresh_loop(self) -> None:
+        """Pick up other workers' tables when the repository can't push them"""
+        while True:
+            await asyncio.sleep(self.lobby_refresh_interval)
+            try:
+                await self.table_service.load_lobby()
+            except Exception:
+                _LOBBY_REFRESH_FAILURES.inc()
+
+    def _on_hand_boundary(self, table_id: str) -> bool:
+        migration = self._outgoing.pop(table_id, None)
+        if migration is None:
+            return False
+        self._background(self._migrate_table(migration))
+        return True
+
+    async def _migrate_table(self, migration: TableMigration) -> None:
+        """
+        Hand a table held between hands over to the worker it is moving to.
+        Its seats, stacks and button travel with the move, so players keep
+        their seats and buy-ins and are dealt in again once the new worker
+        adopts it. If the move is called off the table deals on here.
+        """
+        table_id = migration.table_id
+        try:
+            handoff = await self.dealer.hand_off(table_id)
+        except Exception:
+            _MIGRATIONS.labels("failed").inc()
+            self.dealer.resume(table_id)
+            return
+        try:
+            moved = await self.table_registry.on_hand_boundary(migration, handoff)
+        except Exception:
+            # It may have been applied before the error; only take the table
+            # back if it is still ours, so it never deals on two workers
+            owner = await self.table_registry.get_server_for_table(table_id)
+            moved = owner != self.worker.url
+        if not moved:
+            _MIGRATIONS.labels("called_off").inc()
+            await self.dealer.take_over(table_id, handoff)
+            return
+        moved_to = await self.table_registry.get_server_for_table(table_id)
+        await self.close_table(table_id, moved_to or "")
+        _MIGRATIONS.labels("moved").inc()
+
+    def _background(self, job: Awaitable) -> None:
+        task = asyncio.ensure_future(job)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _on_table_state(self, table_id: str, state: GameState) -> None:
+        self.table_hubs.hub_for(table_id).publish_state(state)
+        if not isinstance(state, PokerGameState):
+            return
+        if not state.is_complete:
+            self.dealer.action_pending(table_id, state)
+            return
+        started = time.perf_counter()
+        rake = self.rake.amount_for(state)
+        try:
+            payouts = PokerRulesEngine.calculate_payouts(state, rake)
+        except ChipConservationError:
+            # Void the hand rather than strand the table or pay a wrong pot;
+            # the refunds are recorded as its payouts, so the audit flags it
+            _VOIDED_HANDS.inc()
+            rake = 0
+            payouts = PokerRulesEngine.refunds(state)
+        _SHOWDOWN_SECONDS.observe(time.perf_counter() - started)
+        self.dealer.hand_finished(table_id, state, payouts)
+        hand = CompletedHand.from_state(
+            table_id,
+            state,
+            payouts,
+            shuffle_seed=self.deck_service.release_seed(state.hand_id),
+            rake=rake,
+        )
+        try:
+            self.hand_history_writer.submit(hand)
+        except HandHistoryBacklogError:
+            self.hand_history_writer.spill(hand)
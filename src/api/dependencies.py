@@ -0,0 +1,64 @@
+from fastapi import Depends
+from starlette.requests import HTTPConnection
+
+from api.container import ServiceContainer
+from api.lobby_hub import LobbyHub
+from api.table_hub import TableHubRegistry
+from player.application.player_query_service import FileSystemPlayerQueryService
+from player.application.player_service import PlayerService
+from table.application.table_service import TableService
+from table.infrastructure.table_registry import ConsistentHashTableRegistry
+from wallet.application.wallet_query_service import FileSystemWalletQueryService
+from wallet.application.wallet_service import WalletService
+
+
+def get_container(connection: HTTPConnection) -> ServiceContainer:
+    return connection.app.state.container
+
+
+def get_player_service(
+    container: ServiceContainer = Depends(get_container),
+) -> PlayerService:
+    return container.player_service
+
+
+def get_player_query_service(
+    container: ServiceContainer = Depends(get_container),
+) -> FileSystemPlayerQueryService:
+    return container.player_query_service
+
+
+def get_table_hubs(
+    container: ServiceContainer = Depends(get_container),
+) -> TableHubRegistry:
+    return container.table_hubs
+
+
+def get_lobby_hub(
+    container: ServiceContainer = Depends(get_container),
+) -> LobbyHub:
+    return container.lobby_hub
+
+
+def get_table_registry(
+    container: ServiceContainer = Depends(get_container),
+) -> ConsistentHashTableRegistry:
+    return container.table_registry
+
+
+def get_table_service(
+    container: ServiceContainer = Depends(get_container),
+) -> TableService:
+    return container.table_service
+
+
+def get_wallet_service(
+    container: ServiceContainer = Depends(get_container),
+) -> WalletService:
+    return container.wallet_service
+
+
+def get_wallet_query_service(
+    container: ServiceContainer = Depends(get_container),
+) -> FileSystemWalletQueryService:
+    return container.wallet_query_service
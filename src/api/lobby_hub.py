@@ -0,0 +1,76 @@
+import asyncio
+import time
+from typing import Set
+
+from fastapi import WebSocket
+
+from api.table_hub import FANOUT_SECONDS, HubMetrics, Subscriber, _close_quietly
+from table.application.lobby import LobbyView
+
+_FANOUT_SECONDS = FANOUT_SECONDS.labels("lobby")
+
+
+class LobbyHub:
+    """
+    Pushes lobby deltas to every lobby connection. A new connection starts
+    from the current snapshot; one that falls max_buffer deltas behind has
+    them thrown away and gets a fresh snapshot in their place, so a slow
+    client costs at most one snapshot per overflow.
+    """
+
+    kind = "lobby"
+
+    def __init__(
+        self, lobby: LobbyView, max_buffer: int = 64, send_timeout: float = 5.0
+    ):
+        self.lobby = lobby
+        self.max_buffer = max_buffer
+        self.send_timeout = send_timeout
+        self.metrics = HubMetrics()
+        self._subscribers: Set[Subscriber] = set()
+        lobby.subscribe(self.broadcast)
+
+    def subscribe(self, websocket: WebSocket) -> Subscriber:
+        # Taking the snapshot first publishes any pending delta to the others
+        snapshot = self.lobby.snapshot()
+        subscriber = Subscriber(websocket, None, self.max_buffer)
+        self._subscribers.add(subscriber)
+        self.metrics.subscribers = len(self._subscribers)
+        subscriber.task = asyncio.create_task(subscriber.run(self))
+        subscriber.enqueue(snapshot)
+        self.metrics.messages_enqueued += 1
+        return subscriber
+
+    def drop(self, subscriber: Subscriber, slow: bool = False) -> None:
+        if subscriber not in self._subscribers:
+            return
+        self._subscribers.discard(subscriber)
+        self.metrics.subscribers = len(self._subscribers)
+        if slow:
+            self.metrics.slow_consumers_dropped += 1
+            asyncio.create_task(_close_quietly(subscriber.websocket))
+        if subscriber.task is not None and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
+
+    def resync(self, subscriber: Subscriber) -> None:
+        subscriber.enqueue(self.lobby.snapshot())
+        self.metrics.messages_enqueued += 1
+
+    def broadcast(self, delta: bytes) -> None:
+        started = time.perf_counter()
+        for subscriber in self._subscribers:
+            if subscriber.queue_depth >= subscriber.max_buffer:
+                # The snapshot already contains this delta
+                self.metrics.messages_dropped += subscriber.clear()
+                self.metrics.resyncs += 1
+                subscriber.enqueue(self.lobby.snapshot())
+            else:
+                subscriber.enqueue(delta)
+            self.metrics.messages_enqueued += 1
+        elapsed = time.perf_counter() - started
+        self.metrics.last_fanout_seconds = elapsed
+        _FANOUT_SECONDS.observe(elapsed)
+
+    def close(self) -> None:
+        for subscriber in list(self._subscribers):
+            self.drop(subscriber)
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
+from api.dependencies import get_player_query_service, get_player_service
 from api.schemas import (
     CreatePlayerResponse,
     GetPlayerResponse,
@@ -9,17 +10,22 @@ from api.schemas import (
 )
 from player.application.player_query_service import FileSystemPlayerQueryService
 from player.application.player_service import PlayerService
+from player.infrastructure.hashing_service import HashingQueueFullError
 
 
 player_router = APIRouter(prefix="/v1/player", tags=["Player"])
 
 
 @player_router.get("/{player_id}", response_model=GetPlayerResponse)
-async def get_player(player_id: int):
+async def get_player(
+    player_id: int,
+    player_query_service: FileSystemPlayerQueryService = Depends(
+        get_player_query_service
+    ),
+):
     """
     Retrieve player information by player ID.
     """
-    player_query_service = FileSystemPlayerQueryService()
     try:
         player = player_query_service.get_player(player_id)
         return GetPlayerResponse(**player)
@@ -28,13 +34,15 @@ async def get_player(player_id: int):
 
 
 @player_router.post("/login", response_model=LoginPlayerResponse)
-async def player_login(login_request: LoginPlayerRequest):
+async def player_login(
+    login_request: LoginPlayerRequest,
+    player_service: PlayerService = Depends(get_player_service),
+):
     """
     Log in a player by player ID.
     """
-    player_service = PlayerService()
     try:
-        player = player_service.login(
+        player = await player_service.login(
             username=login_request.username, password=login_request.password
         )
         if not player:
@@ -44,16 +52,22 @@ async def player_login(login_request: LoginPlayerRequest):
         )
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
+    except HashingQueueFullError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "1"}
+        )
 
 
 @player_router.post("/register", response_model=CreatePlayerResponse)
-async def create_player(player: CreatePlayerRequest):
+async def create_player(
+    player: CreatePlayerRequest,
+    player_service: PlayerService = Depends(get_player_service),
+):
     """
     Create a new player.
     """
-    player_service = PlayerService()
     try:
-        player_service.register(
+        await player_service.register(
             username=player.username, password=player.password
         )
         return CreatePlayerResponse(
@@ -61,3 +75,7 @@ async def create_player(player: CreatePlayerRequest):
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HashingQueueFullError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "1"}
+        )
@@ -1,15 +1,209 @@
-from fastapi import APIRouter
+import json
+from dataclasses import asdict
+from typing import Optional
 
-from api.schemas import GetTableResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import RedirectResponse
+
+from api.container import ServiceContainer
+from api.dependencies import get_container
+from api.schemas import (
+    CreateTableRequest,
+    GetTableResponse,
+    JoinTableRequest,
+    JoinTableResponse,
+    LeaveTableRequest,
+    TableInfoResponse,
+)
+from game.application.table_actor import MailboxFullError
+from game.domain.enums import GameType
+from game.domain.exceptions import PlayerInHandError
+from table.domain.entities import TableConfig
+from table.domain.exceptions import (
+    NoOpenSeatsAtTableError,
+    PlayerNotAtTableError,
+    TableAlreadyExistsError,
+    TableNotFoundError,
+)
+from wallet.domain.exceptions import (
+    DuplicateReservationError,
+    InsufficientFundsError,
+    ReservationNotFoundError,
+    WalletNotFoundError,
+)
+from wallet.infrastructure.wallet_ledger import LedgerWriteError
 
 
 table_router = APIRouter(prefix="/v1/table", tags=["Table"])
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@table_router.get("", responses={304: {"description": "Lobby unchanged"}})
+async def list_tables(
+    stakes: Optional[str] = None,
+    game_type: Optional[str] = None,
+    max_seats: Optional[int] = None,
+    min_open_seats: Optional[int] = Query(None, ge=1),
+    buy_in: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    if_none_match: Optional[str] = Header(None),
+    container: ServiceContainer = Depends(get_container),
+):
+    """
+    The lobby: every table with its stakes, buy-in range and seated players,
+    as {"type": "lobby_snapshot", "version": ..., "tables": [...]}. With any
+    filter, only the matching tables are listed, e.g.
+    ?stakes=1/2&max_seats=6&min_open_seats=1 for 6-max 1/2 tables with a seat.
+
+    Send the ETag back as If-None-Match to get a 304 while nothing changed,
+    or connect to /ws/lobby to have changes pushed instead of polling.
+    """
+    lobby = container.lobby
+    etag = lobby.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    filters = {
+        name: value
+        for name, value in (
+            ("stakes", stakes),
+            ("game_type", game_type),
+            ("max_seats", max_seats),
+            ("min_open_seats", min_open_seats),
+            ("buy_in", buy_in),
+        )
+        if value is not None
+    }
+    if not filters:
+        body = lobby.snapshot()
+    else:
+        try:
+            tables = await container.table_service.find_tables(filters, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        body = json.dumps(
+            {
+                "type": "lobby_snapshot",
+                "version": lobby.version,
+                "tables": [asdict(info) for info in tables],
+            },
+            separators=(",", ":"),
+        ).encode()
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@table_router.post("", response_model=TableInfoResponse, status_code=201)
+async def create_table(
+    request: CreateTableRequest,
+    container: ServiceContainer = Depends(get_container),
+):
+    """
+    Open a new table and list it in the lobby.
+    """
+    try:
+        info = await container.table_service.create_table(
+            TableConfig(
+                id=request.table_id,
+                name=request.name,
+                stakes=request.stakes,
+                max_seats=request.max_seats,
+                min_buy_in=request.min_buy_in,
+                max_buy_in=request.max_buy_in,
+                game_type=GameType(request.game_type),
+            )
+        )
+    except TableAlreadyExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TableInfoResponse(**vars(info))
+
+
 @table_router.get("/{table_id}", response_model=GetTableResponse)
-async def get_table(table_id: int):
+async def get_table(
+    table_id: str,
+    container: ServiceContainer = Depends(get_container),
+):
     """
     Retrieve table information by table ID.
     """
-    # Placeholder for actual implementation
-    return {"table_id": table_id, "status": "open", "max_seats": 6}
+    try:
+        info = await container.table_service.get_table(table_id)
+    except TableNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    players = await container.table_service.players_at(table_id)
+    return GetTableResponse(
+        table_id=info.id,
+        name=info.name,
+        players=players,
+        stakes=info.stakes,
+        status="full" if len(players) >= info.max_players else "open",
+    )
+
+
+@table_router.post("/{table_id}/join", response_model=JoinTableResponse)
+async def join_table(
+    table_id: str,
+    request: JoinTableRequest,
+    container: ServiceContainer = Depends(get_container),
+):
+    """
+    Seat a player at a table. The response names the game worker to open the
+    table's WebSocket on.
+    """
+    owner = await container.table_registry.assign_table_to_server(table_id)
+    if owner != container.worker.url:
+        return RedirectResponse(f"{owner}/api/v1/table/{table_id}/join", 307)
+    try:
+        await container.adopt_table(table_id)
+        await container.table_service.join_table(
+            table_id, request.player_id, request.buy_in
+        )
+    except (NoOpenSeatsAtTableError, DuplicateReservationError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except TableNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InsufficientFundsError as e:
+        raise HTTPException(status_code=402, detail=str(e))
+    except WalletNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (MailboxFullError, LedgerWriteError) as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
+    return JoinTableResponse(
+        table_id=table_id, player_id=request.player_id, game_server_url=owner
+    )
+
+
+@table_router.post("/{table_id}/leave")
+async def leave_table(
+    table_id: str,
+    request: LeaveTableRequest,
+    container: ServiceContainer = Depends(get_container),
+):
+    """
+    Remove a player from a table and settle their buy-in against the chips
+    they leave with. Players still live in a hand get 409 until it ends.
+    """
+    try:
+        await container.adopt_table(table_id)
+        await container.table_service.leave_table(table_id, request.player_id)
+        await container.release_if_idle(table_id)
+    except (PlayerNotAtTableError, ReservationNotFoundError, WalletNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PlayerInHandError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except MailboxFullError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
+    return {"table_id": table_id, "player_id": request.player_id}
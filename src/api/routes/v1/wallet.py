@@ -1,13 +1,169 @@
-from fastapi import APIRouter
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from api.dependencies import get_wallet_query_service, get_wallet_service
+from api.schemas import (
+    ReservationPageResponse,
+    ReservationResponse,
+    TransactionPageResponse,
+    TransactionRequest,
+    TransactionResponse,
+    WalletResponse,
+)
+from wallet.application.wallet_query_service import FileSystemWalletQueryService
+from wallet.application.wallet_service import WalletService
+from wallet.domain.entities import Wallet
+from wallet.domain.exceptions import InsufficientFundsError, WalletNotFoundError
+from wallet.domain.value_objects import Reservation, Transaction
+from wallet.infrastructure.wallet_ledger import LedgerSyncError, LedgerWriteError
 
 
 wallet_router = APIRouter(prefix="/v1/wallet", tags=["Wallet"])
 
 
-@wallet_router.get("/{player_id}")
-async def get_wallet(player_id: int):
+def _transaction_response(transaction: Transaction) -> TransactionResponse:
+    return TransactionResponse(
+        transaction_id=transaction.id,
+        amount=transaction.amount,
+        reason=transaction.reason,
+        timestamp=transaction.timestamp,
+        reservation_id=transaction.reservation_id,
+    )
+
+
+def _reservation_response(reservation: Reservation) -> ReservationResponse:
+    return ReservationResponse(
+        reservation_id=reservation.id,
+        table_id=reservation.table_id,
+        amount=reservation.amount,
+        timestamp=reservation.timestamp,
+    )
+
+
+def _wallet_response(wallet: Wallet) -> WalletResponse:
+    return WalletResponse(
+        player_id=str(wallet.owner_id),
+        wallet_id=wallet.id,
+        balance=wallet.balance,
+        available_balance=wallet.available_balance,
+        version=wallet.version,
+    )
+
+
+@wallet_router.get("/{player_id}", response_model=WalletResponse)
+async def get_wallet(
+    player_id: str,
+    wallet_service: WalletService = Depends(get_wallet_service),
+):
     """
     Retrieve wallet information by player ID.
     """
-    # Placeholder for actual implementation
-    return {"player_id": player_id, "balance": 1000, "currency": "USD"}
+    try:
+        return _wallet_response(await wallet_service.get_balance(player_id))
+    except WalletNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@wallet_router.post("/{player_id}", response_model=WalletResponse)
+async def create_wallet(
+    player_id: str,
+    wallet_service: WalletService = Depends(get_wallet_service),
+):
+    """
+    Open a wallet for a player; returns the existing one if there is one.
+    """
+    return _wallet_response(await wallet_service.create_wallet(player_id))
+
+
+@wallet_router.post("/{player_id}/transactions", response_model=TransactionResponse)
+async def apply_transaction(
+    player_id: str,
+    request: TransactionRequest,
+    wallet_service: WalletService = Depends(get_wallet_service),
+):
+    """
+    Deposit to or withdraw from a wallet. 503 means nothing was applied and
+    the request can be retried; 202 means it was applied but isn't durable
+    yet, and must not be retried.
+    """
+    try:
+        transaction = await wallet_service.apply_transaction(
+            player_id, request.amount, request.reason
+        )
+    except WalletNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InsufficientFundsError as e:
+        raise HTTPException(status_code=402, detail=str(e))
+    except LedgerWriteError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except LedgerSyncError as e:
+        return JSONResponse(status_code=202, content={"detail": str(e)})
+    return _transaction_response(transaction)
+
+
+@wallet_router.get("/{player_id}/transactions", response_model=TransactionPageResponse)
+async def get_transactions(
+    player_id: str,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    wallet_service: WalletService = Depends(get_wallet_service),
+    query_service: FileSystemWalletQueryService = Depends(get_wallet_query_service),
+):
+    """
+    Transaction history, newest first. Pass next_cursor back as cursor for the
+    following page, or stream=true for the whole history as NDJSON, read in
+    batches of limit.
+    """
+    try:
+        wallet_id = (await wallet_service.get_balance(player_id)).id
+        # Read the first page up front, so a bad cursor is a 400 rather than
+        # a stream that breaks after the headers went out
+        page = await query_service.get_wallet_transactions(wallet_id, limit, cursor)
+    except WalletNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not stream:
+        return TransactionPageResponse(
+            items=[_transaction_response(item) for item in page.items],
+            next_cursor=page.next_cursor,
+        )
+
+    async def lines() -> AsyncIterator[bytes]:
+        for transaction in page.items:
+            yield _transaction_response(transaction).model_dump_json().encode() + b"\n"
+        if page.next_cursor is None:
+            return
+        async for transaction in query_service.stream_wallet_transactions(
+            wallet_id, limit, page.next_cursor
+        ):
+            yield _transaction_response(transaction).model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@wallet_router.get("/{player_id}/reservations", response_model=ReservationPageResponse)
+async def get_reservations(
+    player_id: str,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    wallet_service: WalletService = Depends(get_wallet_service),
+    query_service: FileSystemWalletQueryService = Depends(get_wallet_query_service),
+):
+    """
+    Active reservations, newest first.
+    """
+    try:
+        wallet_id = (await wallet_service.get_balance(player_id)).id
+        page = await query_service.get_wallet_reservations(wallet_id, limit, cursor)
+    except WalletNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ReservationPageResponse(
+        items=[_reservation_response(item) for item in page.items],
+        next_cursor=page.next_cursor,
+    )
@@ -0,0 +1,108 @@
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+
+from api.container import ServiceContainer
+from api.dependencies import get_container
+from game.application.table_actor import MailboxFullError
+from game.domain.exceptions import InvalidActionError
+from game.domain.poker.enums import Action
+from game.domain.poker.value_objects import PlayerAction
+
+
+ws_router = APIRouter(tags=["Realtime"])
+
+
+@ws_router.websocket("/ws/lobby")
+async def lobby_socket(
+    websocket: WebSocket,
+    container: ServiceContainer = Depends(get_container),
+):
+    """
+    Lobby updates. The first message is a lobby_snapshot; after that only
+    lobby_delta messages with the tables that changed and the ids of removed
+    ones. Send {"type": "resync"} for a fresh snapshot.
+    """
+    await websocket.accept()
+    hub = container.lobby_hub
+    subscriber = hub.subscribe(websocket)
+    try:
+        while True:
+            try:
+                message = await _receive_object(websocket)
+            except ValueError as e:
+                subscriber.enqueue(_error(e))
+                continue
+            if message.get("type") == "resync":
+                hub.resync(subscriber)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.drop(subscriber)
+
+
+@ws_router.websocket("/ws/tables/{table_id}")
+async def table_socket(
+    websocket: WebSocket,
+    table_id: str,
+    player_id: Optional[str] = None,
+    container: ServiceContainer = Depends(get_container),
+):
+    """
+    Real-time game connection. Connections without a player_id are spectators.
+    Connections for a table owned by another game worker are closed with that
+    worker's URL as the reason so the client can reconnect there.
+
+    Players send {"type": "action", "action": "raise", "amount": 200}; the
+    resulting state reaches every client through the table hub.
+    """
+    owner = await container.table_registry.assign_table_to_server(table_id)
+    if owner != container.worker.url:
+        await websocket.close(code=4004, reason=owner)
+        return
+    await container.adopt_table(table_id)
+    await websocket.accept()
+    hub = container.table_hubs.hub_for(table_id)
+    subscriber = hub.subscribe(websocket, player_id)
+    try:
+        while True:
+            try:
+                message = await _receive_object(websocket)
+                if message.get("type") == "resync":
+                    hub.resync(subscriber)
+                elif message.get("type") == "action" and player_id is not None:
+                    try:
+                        amount = int(message.get("amount") or 0)
+                    except (TypeError, ValueError):
+                        raise ValueError("amount must be an integer")
+                    action = PlayerAction(Action(message.get("action")), amount)
+                    actor = container.table_actors.get(table_id)
+                    if actor is None:
+                        raise InvalidActionError("No hand is in progress")
+                    await actor.act(player_id, action)
+            except (ValueError, InvalidActionError, MailboxFullError) as e:
+                subscriber.enqueue(_error(e))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.drop(subscriber)
+        await container.release_if_idle(table_id)
+
+
+async def _receive_object(websocket: WebSocket) -> dict:
+    """Next message as a JSON object; raises ValueError for anything else"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    try:
+        payload = json.loads(message.get("text") or message.get("bytes") or "")
+    except (ValueError, UnicodeDecodeError):
+        payload = None
+    if not isinstance(payload, dict):
+        raise ValueError("Messages must be JSON objects")
+    return payload
+
+
+def _error(exc: Exception) -> bytes:
+    return json.dumps({"type": "error", "message": str(exc)}).encode()
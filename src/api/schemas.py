@@ -1,4 +1,6 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 from shared.types import PlayerId
@@ -38,3 +40,77 @@ class GetTableResponse(BaseModel):
     players: List[str]
     stakes: str
     status: str
+
+
+class CreateTableRequest(BaseModel):
+    table_id: str
+    name: str
+    stakes: str
+    max_seats: int = 9
+    min_buy_in: int  # minor units
+    max_buy_in: int
+    game_type: str = "poker"
+
+
+class TableInfoResponse(BaseModel):
+    id: str
+    name: str
+    stakes: str
+    current_players: int
+    max_players: int
+    min_buy_in: int
+    max_buy_in: int
+    game_type: str
+
+
+class JoinTableRequest(BaseModel):
+    player_id: str
+    buy_in: int  # minor units
+
+
+class LeaveTableRequest(BaseModel):
+    player_id: str
+
+
+class JoinTableResponse(BaseModel):
+    table_id: str
+    player_id: str
+    game_server_url: str
+
+
+class WalletResponse(BaseModel):
+    player_id: str
+    wallet_id: str
+    balance: int  # minor units
+    available_balance: int
+    version: int
+
+
+class TransactionRequest(BaseModel):
+    amount: int  # minor units, negative for withdrawals
+    reason: str
+
+
+class TransactionResponse(BaseModel):
+    transaction_id: str
+    amount: int
+    reason: str
+    timestamp: datetime
+    reservation_id: Optional[str] = None
+
+
+class TransactionPageResponse(BaseModel):
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
+
+
+class ReservationResponse(BaseModel):
+    reservation_id: str
+    table_id: str
+    amount: int
+    timestamp: datetime
+
+
+class ReservationPageResponse(BaseModel):
+    items: List[ReservationResponse]
+    next_cursor: Optional[str] = None
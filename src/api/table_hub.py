@@ -0,0 +1,272 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from game.application.state_broadcaster import StateBroadcaster
+from shared.metrics import REGISTRY
+
+FANOUT_SECONDS = REGISTRY.histogram(
+    "poker_ws_fanout_seconds",
+    "Time for one published message to be queued for every subscriber",
+    ("hub",),
+)
+WRITE_LAG_SECONDS = REGISTRY.histogram(
+    "poker_ws_write_lag_seconds",
+    "Time from queueing a message for a subscriber to finishing its send",
+    ("hub",),
+)
+_TABLE_FANOUT_SECONDS = FANOUT_SECONDS.labels("table")
+
+
+@dataclass
+class HubMetrics:
+    subscribers: int = 0
+    messages_enqueued: int = 0
+    messages_sent: int = 0
+    messages_dropped: int = 0
+    resyncs: int = 0
+    slow_consumers_dropped: int = 0
+    last_fanout_seconds: float = 0.0  # time for one publish to reach every queue
+    max_write_lag_seconds: float = 0.0  # time a message waited in a send buffer
+
+
+class Subscriber:
+    """
+    One WebSocket connection to a table. Outgoing messages are buffered and
+    written by the subscriber's own task, so a slow socket never holds up the
+    rest of the table.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        player_id: Optional[str],
+        max_buffer: int,
+    ):
+        self.websocket = websocket
+        self.player_id = player_id
+        self.max_buffer = max_buffer
+        self.version = 0  # last broadcast version queued for this client
+        self.overflows = 0
+        self._buffer: Deque[Tuple[float, bytes]] = deque()
+        self._ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def is_spectator(self) -> bool:
+        return self.player_id is None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._buffer)
+
+    def enqueue(self, message: bytes) -> None:
+        self._buffer.append((time.perf_counter(), message))
+        self._ready.set()
+
+    def clear(self) -> int:
+        dropped = len(self._buffer)
+        self._buffer.clear()
+        return dropped
+
+    async def run(self, hub: "TableHub") -> None:
+        write_lag = WRITE_LAG_SECONDS.labels(hub.kind)
+        while True:
+            await self._ready.wait()
+            while self._buffer:
+                enqueued_at, message = self._buffer.popleft()
+                try:
+                    await asyncio.wait_for(
+                        self.websocket.send_bytes(message), hub.send_timeout
+                    )
+                except asyncio.TimeoutError:
+                    hub.drop(self, slow=True)
+                    return
+                except Exception:
+                    hub.drop(self)
+                    return
+                lag = time.perf_counter() - enqueued_at
+                write_lag.observe(lag)
+                hub.metrics.messages_sent += 1
+                if lag > hub.metrics.max_write_lag_seconds:
+                    hub.metrics.max_write_lag_seconds = lag
+            self._ready.clear()
+
+
+class TableHub:
+    """
+    Fans table messages out to every subscriber. Each message is encoded once
+    and only appended to per-subscriber buffers here; writes happen
+    concurrently in the subscribers' tasks. A player whose buffer overflows is
+    resynced with a snapshot, and dropped after max_overflows overflows.
+    Spectators keep only the most recent message.
+    """
+
+    kind = "table"
+
+    def __init__(
+        self,
+        table_id: str,
+        max_buffer: int = 32,
+        max_overflows: int = 3,
+        send_timeout: float = 5.0,
+    ):
+        self.table_id = table_id
+        self.max_buffer = max_buffer
+        self.max_overflows = max_overflows
+        self.send_timeout = send_timeout
+        self.broadcaster = StateBroadcaster()
+        self.metrics = HubMetrics()
+        self._subscribers: Set[Subscriber] = set()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(subscriber.queue_depth for subscriber in self._subscribers)
+
+    def subscribe(self, websocket: WebSocket, player_id: Optional[str]) -> Subscriber:
+        subscriber = Subscriber(
+            websocket, player_id, 1 if player_id is None else self.max_buffer
+        )
+        self._subscribers.add(subscriber)
+        self.metrics.subscribers = len(self._subscribers)
+        subscriber.task = asyncio.create_task(subscriber.run(self))
+        if self.broadcaster.frame is not None:
+            self._send_state(subscriber, {})
+        return subscriber
+
+    def drop(self, subscriber: Subscriber, slow: bool = False) -> None:
+        if subscriber not in self._subscribers:
+            return
+        self._subscribers.discard(subscriber)
+        self.metrics.subscribers = len(self._subscribers)
+        if slow:
+            self.metrics.slow_consumers_dropped += 1
+            asyncio.create_task(_close_quietly(subscriber.websocket))
+        if subscriber.player_id is not None:
+            self.broadcaster.forget(subscriber.player_id)
+        if subscriber.task is not None and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
+
+    def broadcast(self, message: bytes) -> None:
+        """Send an already encoded message to every subscriber"""
+        started = time.perf_counter()
+        for subscriber in list(self._subscribers):
+            if subscriber.queue_depth >= subscriber.max_buffer:
+                if not self._overflow(subscriber):
+                    continue
+                if self.broadcaster.frame is not None:
+                    subscriber.version = -1
+                    self._send_state(subscriber, {})
+            subscriber.enqueue(message)
+            self.metrics.messages_enqueued += 1
+        self._fanout_done(started)
+
+    def publish_state(self, state) -> None:
+        """Publish a new game state version to every subscriber"""
+        started = time.perf_counter()
+        self.broadcaster.publish(state)
+        spectator_messages: Dict[int, bytes] = {}
+        for subscriber in list(self._subscribers):
+            self._send_state(subscriber, spectator_messages)
+        self._fanout_done(started)
+
+    def resync(self, subscriber: Subscriber) -> None:
+        """Send a full snapshot to a client that asked to resync"""
+        if self.broadcaster.frame is None:
+            return
+        subscriber.version = -1
+        self._send_state(subscriber, {})
+
+    def _send_state(
+        self, subscriber: Subscriber, spectator_messages: Dict[int, bytes]
+    ) -> None:
+        if subscriber.queue_depth >= subscriber.max_buffer:
+            if not self._overflow(subscriber):
+                return
+            # What was buffered is gone, so the client can only catch up from
+            # a snapshot. For spectators this is the coalescing step.
+            subscriber.version = -1
+        if subscriber.is_spectator:
+            # Spectators at the same version share one encoded message
+            message = spectator_messages.get(subscriber.version)
+            if message is None:
+                message = self.broadcaster.message_for(None, subscriber.version)
+                spectator_messages[subscriber.version] = message
+        else:
+            message = self.broadcaster.message_for(
+                subscriber.player_id, subscriber.version
+            )
+        subscriber.version = self.broadcaster.version
+        subscriber.enqueue(message)
+        self.metrics.messages_enqueued += 1
+
+    def _fanout_done(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        self.metrics.last_fanout_seconds = elapsed
+        _TABLE_FANOUT_SECONDS.observe(elapsed)
+
+    def _overflow(self, subscriber: Subscriber) -> bool:
+        """Empty a full buffer; returns False if the subscriber was dropped"""
+        self.metrics.messages_dropped += subscriber.clear()
+        if subscriber.is_spectator:
+            return True
+        subscriber.overflows += 1
+        if subscriber.overflows > self.max_overflows:
+            self.drop(subscriber, slow=True)
+            return False
+        self.metrics.resyncs += 1
+        return True
+
+
+async def _close_quietly(
+    websocket: WebSocket, code: int = 1013, reason: str = ""
+) -> None:
+    try:
+        await websocket.close(code=code, reason=reason)  # 1013: try again later
+    except Exception:
+        pass
+
+
+class TableHubRegistry:
+    """Hubs for every table served by this worker"""
+
+    def __init__(self, **hub_options):
+        self.hub_options = hub_options
+        self._hubs: Dict[str, TableHub] = {}
+
+    def hub_for(self, table_id: str) -> TableHub:
+        hub = self._hubs.get(table_id)
+        if hub is None:
+            hub = self._hubs[table_id] = TableHub(table_id, **self.hub_options)
+        return hub
+
+    def remove(self, table_id: str, reason: str = "") -> None:
+        """
+        Drop a closed table's hub, closing its connections; reason, such as
+        the URL of the worker the table moved to, is sent as the close reason
+        """
+        hub = self._hubs.pop(table_id, None)
+        if hub is None:
+            return
+        for subscriber in list(hub._subscribers):
+            hub.drop(subscriber)
+            asyncio.create_task(
+                _close_quietly(subscriber.websocket, code=4004, reason=reason)
+            )
+
+    def watched(self, table_id: str) -> bool:
+        hub = self._hubs.get(table_id)
+        return hub is not None and bool(hub._subscribers)
+
+    def metrics(self) -> Dict[str, HubMetrics]:
+        return {table_id: hub.metrics for table_id, hub in self._hubs.items()}
+
+    def close(self) -> None:
+        for hub in self._hubs.values():
+            for subscriber in list(hub._subscribers):
+                hub.drop(subscriber)
+        self._hubs.clear()
@@ -0,0 +1,74 @@
+import argparse
+
+from benchmarks import api, engine, hashing, players  # noqa: F401 (registers)
+from benchmarks.harness import (
+    DEFAULT_THRESHOLD,
+    compare,
+    format_seconds,
+    load_baselines,
+    measure,
+    save_baselines,
+    select,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the benchmarks and compare them with the stored baselines"
+    )
+    parser.add_argument("-k", dest="pattern", default=None, help="regex on names")
+    parser.add_argument("--quick", action="store_true", help="skip 1M-player sizes")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="measure a regressed benchmark again before failing it",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store these results as the baselines"
+    )
+    args = parser.parse_args()
+
+    baselines = load_baselines()
+    results = []
+    regressions = []
+    print(f"{'benchmark':<38} {'per op':>10} {'ops/s':>12} {'baseline':>10} ratio")
+    for bench in select(args.pattern, args.quick):
+        result = measure(bench, args.rounds, args.min_time)
+        comparison = compare(result, baselines, args.threshold)
+        # A busy machine only ever makes code look slower, so keep the best
+        for _ in range(args.retries):
+            if not comparison.regressed:
+                break
+            retry = measure(bench, args.rounds, args.min_time)
+            if retry.seconds_per_op < result.seconds_per_op:
+                result = retry
+                comparison = compare(result, baselines, args.threshold)
+        results.append(result)
+        baseline = "-"
+        ratio = ""
+        if comparison.ratio is not None:
+            baseline = format_seconds(comparison.baseline)
+            ratio = f"{comparison.ratio:.2f}"
+            if comparison.regressed:
+                ratio += f"  REGRESSED (> {comparison.threshold:.2f})"
+                regressions.append(comparison)
+        print(
+            f"{result.name:<38} {format_seconds(result.seconds_per_op):>10} "
+            f"{result.ops_per_second:>12,.0f} {baseline:>10} {ratio}",
+            flush=True,
+        )
+
+    if args.save:
+        save_baselines(results)
+        print(f"saved {len(results)} baselines")
+    elif regressions:
+        print(f"{len(regressions)} benchmarks regressed")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
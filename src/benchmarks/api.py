@@ -0,0 +1,87 @@
+import atexit
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from fastapi.testclient import TestClient
+
+from benchmarks.harness import benchmark
+
+TABLES = 1000
+_client: Optional[TestClient] = None
+
+
+def _started_client() -> TestClient:
+    """An in-process client for the app, with a seeded lobby and wallet"""
+    global _client
+    if _client is None:
+        from api.api import app
+
+        # The container keeps its files in the working directory
+        directory = tempfile.mkdtemp(prefix="bench-api-")
+        cwd = os.getcwd()
+        os.chdir(directory)
+        client = TestClient(app)
+        client.__enter__()
+        os.chdir(cwd)
+        atexit.register(shutil.rmtree, directory, True)
+        atexit.register(client.__exit__, None, None, None)
+        for i in range(TABLES):
+            client.post(
+                "/api/v1/table",
+                json={
+                    "table_id": f"t{i}",
+                    "name": f"Table {i}",
+                    "stakes": ("1/2", "2/5", "5/10")[i % 3],
+                    "max_seats": (6, 9)[i % 2],
+                    "min_buy_in": 100,
+                    "max_buy_in": 1000,
+                },
+            )
+        client.post("/api/v1/wallet/bench-player")
+        _client = client
+    return _client
+
+
+def _get(path: str, headers: Optional[dict] = None, status: int = 200):
+    client = _started_client()
+    response = client.get(path, headers=headers)
+    assert response.status_code == status, response.text
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            client.get(path, headers=headers)
+
+    return run
+
+
+@benchmark("api.health")
+def health():
+    yield _get("/api/health")
+
+
+@benchmark(f"api.lobby[{TABLES} tables]")
+def lobby():
+    yield _get("/api/v1/table")
+
+
+@benchmark("api.lobby[not modified]")
+def lobby_not_modified():
+    etag = _started_client().get("/api/v1/table").headers["etag"]
+    yield _get("/api/v1/table", {"If-None-Match": etag}, 304)
+
+
+@benchmark("api.lobby[filtered]")
+def lobby_filtered():
+    yield _get("/api/v1/table?stakes=1/2&max_seats=6&min_open_seats=1")
+
+
+@benchmark("api.get_table")
+def get_table():
+    yield _get("/api/v1/table/t1")
+
+
+@benchmark("api.get_wallet")
+def get_wallet():
+    yield _get("/api/v1/wallet/bench-player")
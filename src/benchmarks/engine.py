@@ -0,0 +1,179 @@
+import json
+import random
+from typing import List, Tuple
+
+from benchmarks.harness import benchmark
+from game.application.self_play import RandomBot
+from game.domain.enums import GameType
+from game.domain.factories import GameFactory
+from game.domain.poker.engine import PokerRulesEngine, shuffle_deck
+from game.domain.poker.enums import Action
+from game.domain.poker.hand_evaluator import evaluate, evaluate_batch
+from game.domain.poker.value_objects import PlayerAction, PokerGameState
+
+
+def _play_hands(
+    hands: int, players: int, seed: int = 1
+) -> List[List[Tuple[PokerGameState, str, PlayerAction]]]:
+    """Transitions (state, player_id, action) of bot-played hands"""
+    rng = random.Random(seed)
+    bot = RandomBot()
+    player_ids = [f"p{seat}" for seat in range(players)]
+    played = []
+    for number in range(hands):
+        state = PokerRulesEngine.start_hand(
+            f"h{number}",
+            player_ids,
+            [10_000] * players,
+            number % players,
+            50,
+            100,
+            shuffle_deck(f"bench:{number}"),
+        )
+        transitions = []
+        while not state.is_complete:
+            seat = state.action_on
+            action = bot.act(state, seat, rng)
+            transitions.append((state, player_ids[seat], action))
+            state = PokerRulesEngine.apply_action(state, player_ids[seat], action)
+        transitions.append((state, None, None))
+        played.append(transitions)
+    return played
+
+
+def _transitions(hands: int = 500, players: int = 6):
+    return [
+        transition
+        for hand in _play_hands(hands, players)
+        for transition in hand
+        if transition[1] is not None
+    ]
+
+
+@benchmark("engine.evaluate[7 cards]")
+def evaluate_seven_cards():
+    rng = random.Random(1)
+    hands = [bytes(rng.sample(range(52), 7)) for _ in range(4096)]
+
+    def run(n: int) -> None:
+        for i in range(n):
+            evaluate(hands[i & 4095])
+
+    yield run
+
+
+@benchmark("engine.evaluate_batch[9 hands]")
+def evaluate_nine_hands():
+    rng = random.Random(1)
+    deals = []
+    for _ in range(1024):
+        cards = rng.sample(range(52), 23)
+        deals.append(
+            (bytes(cards[:5]), [bytes(cards[5 + 2 * i : 7 + 2 * i]) for i in range(9)])
+        )
+
+    def run(n: int) -> None:
+        for i in range(n):
+            board, hands = deals[i & 1023]
+            evaluate_batch(board, hands)
+
+    yield run
+
+
+@benchmark("engine.apply_action")
+def apply_action():
+    transitions = _transitions()
+    count = len(transitions)
+
+    def run(n: int) -> None:
+        for i in range(n):
+            state, player_id, action = transitions[i % count]
+            PokerRulesEngine.apply_action(state, player_id, action)
+
+    yield run
+
+
+@benchmark("engine.validate_action")
+def validate_action():
+    transitions = _transitions()
+    count = len(transitions)
+
+    def run(n: int) -> None:
+        for i in range(n):
+            state, player_id, action = transitions[i % count]
+            PokerRulesEngine.validate_action(state, player_id, action)
+
+    yield run
+
+
+@benchmark("engine.showdown[9 players]")
+def showdown():
+    finals = [hand[-1][0] for hand in _play_hands(300, 9)]
+    count = len(finals)
+
+    def run(n: int) -> None:
+        for i in range(n):
+            PokerRulesEngine.calculate_payouts(finals[i % count])
+
+    yield run
+
+
+@benchmark("engine.showdown[9 players all in]")
+def showdown_all_in():
+    """Every player shoves a different stack, so most hands have eight side pots"""
+    rng = random.Random(1)
+    player_ids = [f"p{seat}" for seat in range(9)]
+    finals = []
+    for number in range(300):
+        state = PokerRulesEngine.start_hand(
+            f"h{number}",
+            player_ids,
+            rng.sample(range(1_000, 20_000, 100), 9),
+            number % 9,
+            50,
+            100,
+            shuffle_deck(f"bench:{number}"),
+        )
+        while not state.is_complete:
+            seat = state.action_on
+            all_in_to = state.bets[seat] + state.stacks[seat]
+            if all_in_to > state.current_bet and not state.acted >> seat & 1:
+                action = PlayerAction(Action.RAISE, all_in_to)
+            else:
+                action = PlayerAction(Action.CALL)
+            state = PokerRulesEngine.apply_action(state, player_ids[seat], action)
+        finals.append(state)
+    count = len(finals)
+
+    def run(n: int) -> None:
+        for i in range(n):
+            PokerRulesEngine.calculate_payouts(finals[i % count])
+
+    yield run
+
+
+@benchmark("game.seat_and_remove_player")
+def seat_and_remove_player():
+    game = GameFactory.create_game("bench", 9, GameType.POKER)
+    for seat in range(8):
+        game.seat_player(f"p{seat}")
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            game.seat_player("guest")
+            game.remove_player("guest")
+
+    yield run
+
+
+@benchmark("state.view_for_player[json]")
+def view_for_player():
+    states = [(state, player_id) for state, player_id, _ in _transitions(100, 9)]
+    count = len(states)
+
+    def run(n: int) -> None:
+        for i in range(n):
+            state, player_id = states[i % count]
+            json.dumps(state.view_for_player(player_id), separators=(",", ":"))
+
+    yield run
@@ -0,0 +1,148 @@
+import json
+import os
+import platform
+import re
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_THRESHOLD = 1.3  # fail when more than 30% slower than the baseline
+
+# A benchmark's setup yields run(n), which performs n operations
+Runner = Callable[[int], None]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], ContextManager[Runner]]
+    large: bool = False  # skipped by --quick
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    seconds_per_op: float  # best round
+    median_seconds_per_op: float
+    ops_per_round: int
+    rounds: int
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1 / self.seconds_per_op if self.seconds_per_op else 0.0
+
+
+@dataclass
+class Comparison:
+    result: BenchmarkResult
+    baseline: Optional[float]  # seconds per op
+    threshold: float
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline:
+            return None
+        return self.result.seconds_per_op / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio is not None and self.ratio > self.threshold
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, large: bool = False):
+    """
+    Register a generator function that sets up state, yields run(n) and
+    cleans up afterwards
+    """
+
+    def register(fn: Callable[[], Iterator[Runner]]):
+        BENCHMARKS[name] = Benchmark(name, contextmanager(fn), large)
+        return fn
+
+    return register
+
+
+def select(pattern: Optional[str] = None, quick: bool = False) -> List[Benchmark]:
+    return [
+        bench
+        for name, bench in sorted(BENCHMARKS.items())
+        if (pattern is None or re.search(pattern, name))
+        and not (quick and bench.large)
+    ]
+
+
+def measure(
+    bench: Benchmark, rounds: int = 5, min_time: float = 0.2
+) -> BenchmarkResult:
+    """
+    Time rounds of run(n), with n grown until one round takes min_time, and
+    keep the best and median time per operation. The best round is the one
+    least disturbed by the rest of the machine, so it is what gets compared.
+    """
+    with bench.setup() as run:
+        ops = 1
+        while True:
+            started = time.perf_counter()
+            run(ops)
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time or ops >= 1 << 24:
+                break
+            ops = min(ops * 10, max(ops * 2, int(ops * min_time / max(elapsed, 1e-9))))
+        timings = [elapsed / ops]
+        for _ in range(rounds - 1):
+            started = time.perf_counter()
+            run(ops)
+            timings.append((time.perf_counter() - started) / ops)
+    return BenchmarkResult(
+        bench.name, min(timings), statistics.median(timings), ops, len(timings)
+    )
+
+
+def load_baselines(path: str = BASELINES_FILE) -> dict:
+    if not os.path.exists(path):
+        return {"machine": None, "benchmarks": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results: List[BenchmarkResult], path: str = BASELINES_FILE) -> None:
+    """Record results as the new baselines, keeping per-benchmark thresholds"""
+    baselines = load_baselines(path)
+    baselines["machine"] = machine_info()
+    for result in results:
+        entry = baselines["benchmarks"].setdefault(result.name, {})
+        entry["seconds_per_op"] = result.seconds_per_op
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(
+    result: BenchmarkResult, baselines: dict, threshold: float = DEFAULT_THRESHOLD
+) -> Comparison:
+    entry = baselines["benchmarks"].get(result.name, {})
+    return Comparison(
+        result, entry.get("seconds_per_op"), entry.get("threshold", threshold)
+    )
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
@@ -0,0 +1,44 @@
+import asyncio
+
+from benchmarks.harness import benchmark
+from player.infrastructure.hashing_service import HashingExecutor, HashingService
+
+
+@benchmark("hashing.hash")
+def hash_password():
+    def run(n: int) -> None:
+        for _ in range(n):
+            HashingService.hash("correct horse battery staple")
+
+    yield run
+
+
+@benchmark("hashing.verify")
+def verify_password():
+    stored = HashingService.hash("correct horse battery staple")
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            HashingService.verify(stored, "correct horse battery staple")
+
+    yield run
+
+
+@benchmark("hashing.executor[throughput]")
+def executor_throughput():
+    """Time per hash with the executor's whole pool busy"""
+    executor = HashingExecutor()
+    executor.start()
+
+    async def burst(n: int) -> None:
+        await asyncio.gather(
+            *(executor.hash("correct horse battery staple") for _ in range(n))
+        )
+
+    def run(n: int) -> None:
+        asyncio.run(burst(n))
+
+    try:
+        yield run
+    finally:
+        executor.shutdown()
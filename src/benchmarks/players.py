@@ -0,0 +1,77 @@
+import atexit
+import json
+import random
+import shutil
+import tempfile
+import uuid
+from typing import Dict, List, Tuple
+
+from benchmarks.harness import benchmark
+from player.infrastructure.player_repository import FileSystemPlayerRepository
+from player.infrastructure.player_store import PlayerLogStore
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+_repositories: Dict[int, Tuple[FileSystemPlayerRepository, List[str], List[str]]] = {}
+
+
+def _repository(size: int) -> Tuple[FileSystemPlayerRepository, List[str], List[str]]:
+    """A repository over a generated log of size players, built once per run"""
+    if size not in _repositories:
+        directory = tempfile.mkdtemp(prefix="bench-players-")
+        path = f"{directory}/players.json"
+        rng = random.Random(size)
+        ids = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(size)]
+        usernames = [f"player{i}" for i in range(size)]
+        with open(path, "w") as f:
+            for player_id, username in zip(ids, usernames):
+                record = {
+                    "op": "put",
+                    "player": {
+                        "player_id": player_id,
+                        "username": username,
+                        "password_hash": "$2b$12$" + "x" * 53,
+                    },
+                }
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        store = PlayerLogStore(path)
+        atexit.register(shutil.rmtree, directory, True)
+        atexit.register(store.close)
+        _repositories[size] = (
+            FileSystemPlayerRepository(path, store=store),
+            ids,
+            usernames,
+        )
+    return _repositories[size]
+
+
+def _register(label: str, size: int) -> None:
+    large = size >= 1_000_000
+
+    @benchmark(f"players.get_by_id[{label}]", large=large)
+    def get_by_id():
+        repository, ids, _ = _repository(size)
+        rng = random.Random(1)
+        keys = [rng.choice(ids) for _ in range(4096)]
+
+        def run(n: int) -> None:
+            for i in range(n):
+                repository.get_player_by_id(keys[i & 4095])
+
+        yield run
+
+    @benchmark(f"players.get_by_username[{label}]", large=large)
+    def get_by_username():
+        repository, _, usernames = _repository(size)
+        rng = random.Random(2)
+        keys = [rng.choice(usernames) for _ in range(4096)]
+
+        def run(n: int) -> None:
+            for i in range(n):
+                repository.get_player_by_username(keys[i & 4095])
+
+        yield run
+
+
+for _label, _size in SIZES.items():
+    _register(_label, _size)
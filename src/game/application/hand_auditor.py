@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from game.application.interfaces import IHandHistoryRepository
+from game.domain.exceptions import ChipConservationError, InvalidActionError
+from game.domain.poker.engine import PokerRulesEngine, shuffle_deck
+from game.domain.poker.hand_history import CompletedHand, decode_hand
+
+
+@dataclass
+class AuditMismatch:
+    hand_id: str
+    reason: str
+
+
+@dataclass
+class AuditReport:
+    hands: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    mismatches: List[AuditMismatch] = field(default_factory=list)
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds else 0.0
+
+
+def verify_hand(hand: CompletedHand) -> Optional[str]:
+    """
+    Replay a completed hand from its seed and action log; returns why it does
+    not match what was stored, or None if it does.
+    """
+    deck = hand.deck
+    if hand.shuffle_seed:
+        deck = shuffle_deck(hand.shuffle_seed)
+        if hand.deck and hand.deck != deck:
+            return "stored deck does not match the shuffle seed"
+    if not deck:
+        return "hand has neither a shuffle seed nor a deck"
+
+    players = sorted(hand.players, key=lambda player: player.seat)
+    state = PokerRulesEngine.start_hand(
+        hand.hand_id,
+        [player.player_id for player in players],
+        [player.starting_stack for player in players],
+        hand.button,
+        hand.small_blind,
+        hand.big_blind,
+        deck,
+    )
+    for player in players:
+        if player.hole_cards != state.cards_for_seat(player.seat):
+            return f"hole cards of {player.player_id} do not match the deck"
+
+    for number, (seat, street, action) in enumerate(hand.actions()):
+        if seat != state.action_on or street is not state.street:
+            return f"action {number} is out of turn"
+        try:
+            state = PokerRulesEngine.apply_action(
+                state, state.player_ids[seat], action
+            )
+        except InvalidActionError as exc:
+            return f"action {number} is illegal: {exc}"
+
+    if not state.is_complete:
+        return "action log ends before the hand is complete"
+    if state.board != hand.community_cards:
+        return "community cards do not match"
+    try:
+        payouts = PokerRulesEngine.calculate_payouts(state, hand.rake)
+    except ChipConservationError as exc:
+        return f"payouts do not add up: {exc}"
+    winners = sorted(payouts)
+    if winners != sorted(hand.winners):
+        return f"winners {winners} were stored as {sorted(hand.winners)}"
+    stored = {
+        player_id: amount
+        for player_id, amount in hand.pot_distribution.items()
+        if amount
+    }
+    if payouts != stored:
+        return f"pot distribution {payouts} was stored as {stored}"
+    return None
+
+
+def verify_records(records: List[bytes]) -> Tuple[int, List[AuditMismatch]]:
+    """Decode and verify one batch of encoded hands; runs in a pool worker"""
+    mismatches = []
+    for record in records:
+        try:
+            hand = decode_hand(record)
+        except (IndexError, ValueError) as exc:
+            mismatches.append(AuditMismatch("?", f"undecodable record: {exc}"))
+            continue
+        try:
+            reason = verify_hand(hand)
+        except Exception as exc:
+            reason = f"replay failed: {exc!r}"
+        if reason is not None:
+            mismatches.append(AuditMismatch(hand.hand_id, reason))
+    return len(records), mismatches
+
+
+class HandAuditor:
+    """
+    Streams stored hands from the repository in batches and verifies them in
+    a process pool. Only max_in_flight batches are held at a time, so memory
+    stays flat however many hands are stored. Encoded records go to the
+    workers as they are and are decoded there.
+    """
+
+    def __init__(
+        self,
+        repository: IHandHistoryRepository,
+        workers: Optional[int] = None,
+        batch_size: int = 2000,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.repository = repository
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight or self.workers * 2
+
+    async def run(
+        self,
+        after_hand_id: Optional[str] = None,
+        on_progress: Optional[Callable[[AuditReport], None]] = None,
+    ) -> AuditReport:
+        """Verify every stored hand after after_hand_id"""
+        report = AuditReport()
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        in_flight: Set[asyncio.Future] = set()
+
+        def collect(done: Iterable[asyncio.Future]) -> None:
+            for future in done:
+                count, mismatches = future.result()
+                report.hands += count
+                report.batches += 1
+                report.mismatches.extend(mismatches)
+            report.seconds = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(report)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            async for records in self.repository.iter_record_batches(
+                self.batch_size, after_hand_id
+            ):
+                if len(in_flight) >= self.max_in_flight:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    collect(done)
+                in_flight.add(loop.run_in_executor(pool, verify_records, records))
+            if in_flight:
+                done, _ = await asyncio.wait(in_flight)
+                collect(done)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    async def verify(self, hand_id: str) -> Optional[str]:
+        """Verify a single hand in-process, e.g. for a dispute"""
+        hand = await self.repository.get_completed_hand(hand_id)
+        if hand is None:
+            return "hand not found"
+        return verify_hand(hand)
+
+
+def main() -> None:
+    from game.infrastructure.hand_history_repository import (
+        SQLiteHandHistoryRepository,
+    )
+
+    parser = argparse.ArgumentParser(description="Replay and verify stored hands")
+    parser.add_argument("--db", default="hand_history.db")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--after", default=None, help="resume after this hand_id")
+    parser.add_argument("--hand", default=None, help="verify a single hand")
+    args = parser.parse_args()
+
+    repository = SQLiteHandHistoryRepository(args.db)
+    auditor = HandAuditor(repository, args.workers, args.batch_size)
+    if args.hand is not None:
+        reason = asyncio.run(auditor.verify(args.hand))
+        print(f"{args.hand}: {reason or 'ok'}")
+        raise SystemExit(1 if reason else 0)
+
+    def progress(report: AuditReport) -> None:
+        print(
+            f"\r{report.hands} hands, {report.hands_per_second:,.0f} hands/s, "
+            f"{len(report.mismatches)} mismatches",
+            end="",
+            flush=True,
+        )
+
+    report = asyncio.run(auditor.run(args.after, progress))
+    print()
+    for mismatch in report.mismatches:
+        print(f"{mismatch.hand_id}: {mismatch.reason}")
+    print(
+        f"verified {report.hands} hands in {report.seconds:.1f}s "
+        f"({report.hands_per_second:,.0f} hands/s), "
+        f"{len(report.mismatches)} mismatches"
+    )
+    raise SystemExit(1 if report.mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import secrets
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game.application.table_actor import TableActorRegistry
+from game.domain.entities import Game
+from game.domain.exceptions import PlayerInHandError
+from game.domain.poker.engine import PokerRulesEngine
+from game.domain.poker.enums import Action
+from game.domain.poker.value_objects import PlayerAction, PokerGameState
+from game.infrastructure.deck_service import DeckService
+from game.infrastructure.entropy_pool import EntropyPoolExhaustedError
+
+
+def parse_stakes(stakes: str) -> Tuple[int, int]:
+    """Small and big blind from stakes such as "50/100", in minor units"""
+    try:
+        small_blind, big_blind = (int(blind) for blind in stakes.split("/"))
+    except ValueError:
+        raise ValueError(f"Stakes must be small/big blinds, e.g. 50/100: {stakes!r}")
+    if not 0 < small_blind <= big_blind:
+        raise ValueError("Blinds must be positive and the small blind the smaller")
+    return small_blind, big_blind
+
+
+@dataclass
+class _Seating:
+    small_blind: int
+    big_blind: int
+    stacks: Dict[str, int] = field(default_factory=dict)  # chips between hands
+    button_seat: int = -1
+    dealt: Dict[str, str] = field(default_factory=dict)  # player -> hand_id in play
+
+
+class HandDealer:
+    """
+    Deals poker hands at every table with two or more seated players who can
+    cover the big blind. A hand is dealt next_hand_delay seconds after a
+    player sits down at an idle table or the previous hand ends, so players
+    joining together start in the same hand. Each player's chips are tracked
+    between hands, starting from their buy-in. The button moves to the next
+    occupied seat dealt into each hand, and decks come from deck_service,
+    which keeps each hand's seed until the hand is persisted.
+
+    Dealing, the action clock and leaving all run as TableActor handlers, in
+    mailbox order with the table's other changes. A player who doesn't act
+    within action_timeout seconds is checked, or folded if they can't check.
+
+    on_hand_boundary is called with the table id after every hand; when it
+    returns True no further hand is dealt there until resume() is called,
+    e.g. while the table moves to another worker. hand_off() and take_over()
+    carry its seats, stacks and button across such a move.
+    """
+
+    def __init__(
+        self,
+        table_actors: TableActorRegistry,
+        deck_service: DeckService,
+        next_hand_delay: float = 2.0,
+        action_timeout: float = 30.0,
+        on_hand_boundary: Optional[Callable[[str], bool]] = None,
+    ):
+        self.table_actors = table_actors
+        self.deck_service = deck_service
+        self.next_hand_delay = next_hand_delay
+        self.action_timeout = action_timeout
+        self.on_hand_boundary = on_hand_boundary
+        self._tables: Dict[str, _Seating] = {}
+
+    def sit_down(
+        self, table_id: str, player_id: str, buy_in: int, stakes: str
+    ) -> None:
+        """Deal player into the table's hands from the next one on"""
+        seating = self._tables.get(table_id)
+        if seating is None:
+            seating = self._tables[table_id] = _Seating(*parse_stakes(stakes))
+        seating.stacks[player_id] = buy_in
+        self._schedule_hand(table_id)
+
+    async def stand_up(self, table_id: str, player_id: str) -> int:
+        """
+        Take player off the table and return the chips they leave with.
+        Raises PlayerInHandError while they are still live in a hand.
+        """
+        return await self.table_actors.actor_for(table_id).update(
+            lambda game: self._stand_up(game, player_id)
+        )
+
+    def action_pending(self, table_id: str, state: PokerGameState) -> None:
+        """Start the clock on the player the hand is waiting for"""
+        self.table_actors.actor_for(table_id).schedule(
+            "action_clock",
+            self.action_timeout,
+            lambda game: self._act_for(game, state),
+        )
+
+    def hand_finished(
+        self, table_id: str, state: PokerGameState, payouts: Dict[str, int]
+    ) -> None:
+        """Credit the hand's payouts and queue the next hand"""
+        seating = self._tables.get(table_id)
+        if seating is not None:
+            for seat, player_id in enumerate(state.player_ids):
+                # Whoever stood up mid-hand was paid then, and may have sat
+                # down again since with a new buy-in
+                if seating.dealt.get(player_id) != state.hand_id:
+                    continue
+                del seating.dealt[player_id]
+                seating.stacks[player_id] = state.stacks[seat] + payouts.get(
+                    player_id, 0
+                )
+        actor = self.table_actors.actor_for(table_id)
+        actor.cancel_timer("action_clock")
+        if self.on_hand_boundary is None or not self.on_hand_boundary(table_id):
+            self._schedule_hand(table_id)
+
+    def resume(self, table_id: str) -> None:
+        """Deal again at a table held at a hand boundary"""
+        if table_id in self._tables:
+            self._schedule_hand(table_id)
+
+    async def hand_off(self, table_id: str) -> dict:
+        """
+        Unseat everyone at a table held between hands and return its seats,
+        stacks and button for take_over() on the worker it moves to. Players
+        keep their seats in the table repository and their reserved buy-ins.
+        """
+        return await self.table_actors.actor_for(table_id).update(self._hand_off)
+
+    async def take_over(self, table_id: str, handoff: dict) -> None:
+        """Seat a table from hand_off() and deal on from its button"""
+        if not handoff["seats"]:
+            return
+        await self.table_actors.actor_for(table_id, handoff["max_seats"]).update(
+            lambda game: self._take_over(game, handoff)
+        )
+        self._schedule_hand(table_id)
+
+    def forget_table(self, table_id: str) -> None:
+        """Drop a table that no longer runs here; its players have stood up"""
+        self._tables.pop(table_id, None)
+
+    def _schedule_hand(self, table_id: str) -> None:
+        self.table_actors.actor_for(table_id).schedule(
+            "next_hand", self.next_hand_delay, self._deal
+        )
+
+    def _deal(self, game: Game) -> None:
+        state = game.game_state
+        if state is not None and not state.is_complete:
+            return
+        seating = self._tables.get(game.table_id)
+        if seating is None:
+            return
+        seats = [
+            (seat, str(player_id))
+            for seat, player_id in sorted(game.seats.items())
+            if seating.stacks.get(str(player_id), 0) >= seating.big_blind
+        ]
+        if len(seats) < 2:
+            return
+        hand_id = f"{game.table_id}-{secrets.token_hex(8)}"
+        try:
+            _, deck = self.deck_service.deal_deck_for_hand(hand_id)
+        except EntropyPoolExhaustedError:
+            # The pool is refilling; try again shortly rather than stall the actor
+            self._schedule_hand(game.table_id)
+            return
+        button = _next_button(seats, seating.button_seat)
+        seating.button_seat = seats[button][0]
+        player_ids = [player_id for _, player_id in seats]
+        seating.dealt = dict.fromkeys(player_ids, hand_id)
+        game.game_state = PokerRulesEngine.start_hand(
+            hand_id,
+            player_ids,
+            [seating.stacks[player_id] for player_id in player_ids],
+            button,
+            seating.small_blind,
+            seating.big_blind,
+            deck,
+        )
+
+    def _act_for(self, game: Game, state: PokerGameState) -> None:
+        if game.game_state is not state or state.action_on < 0:
+            return  # someone acted in time
+        player_id = state.player_ids[state.action_on]
+        action = PlayerAction(Action.CHECK)
+        if not game.validate_action(player_id, action):
+            action = PlayerAction(Action.FOLD)
+        game.apply_action(player_id, action)
+
+    def _hand_off(self, game: Game) -> dict:
+        state = game.game_state
+        if isinstance(state, PokerGameState) and not state.is_complete:
+            raise PlayerInHandError(f"A hand is in play at {game.table_id}")
+        seating = self._tables.pop(game.table_id, None) or _Seating(0, 0)
+        handoff = {
+            "max_seats": game.max_seats,
+            "blinds": [seating.small_blind, seating.big_blind],
+            "button_seat": seating.button_seat,
+            "seats": {str(seat): str(player) for seat, player in game.seats.items()},
+            "stacks": seating.stacks,
+        }
+        for player_id in list(game.seats.values()):
+            game.remove_player(player_id)
+        return handoff
+
+    def _take_over(self, game: Game, handoff: dict) -> None:
+        for seat, player_id in handoff["seats"].items():
+            game.seat_player(player_id, int(seat))
+        # Anyone who joined here before the handoff arrived keeps their stack
+        seating = self._tables.setdefault(game.table_id, _Seating(*handoff["blinds"]))
+        seating.stacks.update(handoff["stacks"])
+        seating.button_seat = handoff["button_seat"]
+
+    def _stand_up(self, game: Game, player_id: str) -> int:
+        seating = self._tables.get(game.table_id)
+        state = game.game_state
+        chips: Optional[int] = None
+        if isinstance(state, PokerGameState) and not state.is_complete:
+            seat = state.seat_of(player_id)
+            if seat >= 0:
+                if not state.folded >> seat & 1:
+                    raise PlayerInHandError(
+                        f"Player {player_id} is in a hand; fold or wait for it to end"
+                    )
+                chips = state.stacks[seat]
+        game.remove_player(player_id)
+        if seating is None:
+            return 0 if chips is None else chips
+        seating.dealt.pop(player_id, None)
+        stack = seating.stacks.pop(player_id, 0)
+        return stack if chips is None else chips
+
+
+def _next_button(seats: List[Tuple[int, str]], button_seat: int) -> int:
+    """Index in seats of the first seat after button_seat, wrapping around"""
+    for index, (seat, _) in enumerate(seats):
+        if seat > button_seat:
+            return index
+    return 0
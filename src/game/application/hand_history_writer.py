@@ -0,0 +1,240 @@
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+from game.application.interfaces import IHandHistoryRepository
+from game.domain.poker.hand_history import (
+    CompletedHand,
+    decode_hand,
+    encode_hand,
+    read_varint,
+    write_varint,
+)
+
+
+class HandHistoryBacklogError(Exception):
+    pass
+
+
+@dataclass
+class HandHistoryMetrics:
+    submitted: int = 0
+    flushed: int = 0
+    batches: int = 0
+    failed_flushes: int = 0
+    replayed: int = 0  # hands recovered from the journal at start-up
+    spilled: int = 0  # hands set aside on disk while the queue was full
+    pending: int = 0
+    last_batch_size: int = 0
+    last_flush_seconds: float = 0.0
+
+
+class HandHistoryWriter:
+    """
+    Queues completed hands and writes them to the repository in batches, so a
+    table never waits on the database. submit() encodes the hand and appends
+    it to a local journal before queueing it; the journal is fsynced once per
+    flush cycle and emptied once everything in it has been saved. Hands still
+    in the journal at start-up are saved again, which the repository ignores
+    if they had already made it.
+
+    When max_pending hands are queued, submit() refuses more; callers spill()
+    them to an overflow file instead, and they are queued again once the
+    backlog has halved.
+    """
+
+    def __init__(
+        self,
+        repository: IHandHistoryRepository,
+        journal_path: str = "hand_history.journal",
+        batch_size: int = 500,
+        flush_interval: float = 0.25,
+        max_pending: int = 100_000,
+        retry_delay: float = 1.0,
+        compact_bytes: int = 1 << 24,
+    ):
+        self.repository = repository
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retry_delay = retry_delay
+        self.compact_bytes = compact_bytes
+        self.metrics = HandHistoryMetrics()
+        self._pending: Deque[Tuple[CompletedHand, bytes]] = deque()
+        self._journal_size = 0
+        self._fd: Optional[int] = None
+        self._overflow_path = journal_path + ".overflow"
+        self._overflow_fd: Optional[int] = None
+        self._spilled = 0  # hands in the overflow file
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Recover unflushed hands from the journal and start flushing"""
+        records, valid_size = _read_frames(self.journal_path)
+        self._pending.extend(records)
+        self.metrics.replayed = len(records)
+        self.metrics.pending = len(self._pending)
+        self._fd = os.open(
+            self.journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        os.ftruncate(self._fd, valid_size)
+        self._journal_size = valid_size
+        self._overflow_fd = os.open(
+            self._overflow_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        self._spilled = len(_read_frames(self._overflow_path)[0])
+        self._requeue_spilled()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush what is queued; anything that fails stays in the journal"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            pass
+        finally:
+            if self._fd is not None:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
+            if self._overflow_fd is not None:
+                os.fsync(self._overflow_fd)
+                os.close(self._overflow_fd)
+                self._overflow_fd = None
+
+    def submit(self, hand: CompletedHand) -> None:
+        """Queue a hand for saving without waiting for the database"""
+        if len(self._pending) >= self.max_pending:
+            raise HandHistoryBacklogError(
+                f"{len(self._pending)} hands are waiting to be saved"
+            )
+        self._enqueue(hand, _frame(hand))
+        self.metrics.submitted += 1
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def spill(self, hand: CompletedHand) -> None:
+        """
+        Set aside a hand submit() had no room for; it is written to the
+        overflow file, fsynced with the journal, and queued again later
+        """
+        os.write(self._overflow_fd, _frame(hand))
+        self._spilled += 1
+        self.metrics.spilled += 1
+
+    def _enqueue(self, hand: CompletedHand, frame: bytes) -> None:
+        os.write(self._fd, frame)
+        self._journal_size += len(frame)
+        self._pending.append((hand, frame))
+        self.metrics.pending = len(self._pending)
+
+    def _requeue_spilled(self) -> None:
+        """Move spilled hands into the journal and the queue, once there's room"""
+        if not self._spilled or len(self._pending) > self.max_pending // 2:
+            return
+        records, _ = _read_frames(self._overflow_path)
+        for hand, frame in records:
+            self._enqueue(hand, frame)
+        os.fsync(self._fd)
+        os.ftruncate(self._overflow_fd, 0)
+        self._spilled = 0
+
+    async def flush(self) -> None:
+        """Save everything queued so far"""
+        while self._pending:
+            await self._flush_batch()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Keep the batch queued and journaled, and try again later
+                await asyncio.sleep(self.retry_delay)
+
+    async def _flush_batch(self) -> None:
+        batch = [
+            self._pending[i][0] for i in range(min(self.batch_size, len(self._pending)))
+        ]
+        started = time.perf_counter()
+        await asyncio.to_thread(os.fsync, self._fd)
+        if self._spilled:
+            await asyncio.to_thread(os.fsync, self._overflow_fd)
+        try:
+            await self.repository.save_completed_hands(batch)
+        except Exception:
+            self.metrics.failed_flushes += 1
+            raise
+        for _ in batch:
+            self._pending.popleft()
+        self.metrics.flushed += len(batch)
+        self.metrics.batches += 1
+        self.metrics.pending = len(self._pending)
+        self.metrics.last_batch_size = len(batch)
+        self.metrics.last_flush_seconds = time.perf_counter() - started
+        if not self._pending:
+            os.ftruncate(self._fd, 0)
+            self._journal_size = 0
+        elif self._journal_size > self.compact_bytes:
+            self._compact_journal()
+        self._requeue_spilled()
+
+    def _compact_journal(self) -> None:
+        """Rewrite the journal with only the hands that are still queued"""
+        compact_path = self.journal_path + ".compact"
+        with open(compact_path, "wb") as out:
+            for _, frame in self._pending:
+                out.write(frame)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(compact_path, self.journal_path)
+        os.close(self._fd)
+        self._fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND)
+        self._journal_size = os.fstat(self._fd).st_size
+
+
+def _frame(hand: CompletedHand) -> bytes:
+    """A journal record: the encoded hand prefixed with its length"""
+    record = encode_hand(hand)
+    frame = bytearray()
+    write_varint(frame, len(record))
+    frame += record
+    return bytes(frame)
+
+
+def _read_frames(path: str) -> Tuple[List[Tuple[CompletedHand, bytes]], int]:
+    """Decode a journal up to a record torn by a crash mid-write"""
+    if not os.path.exists(path):
+        return [], 0
+    with open(path, "rb") as f:
+        data = f.read()
+    records = []
+    offset = 0
+    while offset < len(data):
+        try:
+            length, start = read_varint(data, offset)
+            if start + length > len(data):
+                break
+            hand = decode_hand(data[start : start + length])
+        except (IndexError, ValueError):
+            break
+        records.append((hand, data[offset : start + length]))
+        offset = start + length
+    return records, offset
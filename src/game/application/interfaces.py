@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional, Sequence
+
+from game.domain.poker.hand_history import CompletedHand
+
+
+class IHandHistoryRepository(ABC):
+    @abstractmethod
+    async def save_completed_hand(self, hand: CompletedHand) -> None:
+        """Persist completed hand for audit"""
+
+    @abstractmethod
+    async def save_completed_hands(self, hands: Sequence[CompletedHand]) -> None:
+        """Persist a batch of hands at once; saving a hand twice is a no-op"""
+
+    @abstractmethod
+    async def get_completed_hand(self, hand_id: str) -> Optional[CompletedHand]:
+        """Load a persisted hand"""
+
+    @abstractmethod
+    def iter_record_batches(
+        self, batch_size: int = 1000, after_hand_id: Optional[str] = None
+    ) -> AsyncIterator[List[bytes]]:
+        """Stream encoded hands in hand_id order, batch_size at a time"""
@@ -0,0 +1,381 @@
+import argparse
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from game.domain.entities import Game
+from game.domain.enums import GameType
+from game.domain.exceptions import ChipConservationError, InvalidActionError
+from game.domain.factories import GameFactory
+from game.domain.poker.engine import PokerRulesEngine, shuffle_deck
+from game.domain.poker.enums import Action
+from game.domain.poker.value_objects import PlayerAction, PokerGameState, RakeRule
+
+MAX_ACTIONS_PER_HAND = 1000  # far more than any legal hand can take
+MAX_REPORTED_VIOLATIONS = 100
+
+
+class Bot(ABC):
+    def act(self, state: PokerGameState, seat: int, rng: random.Random) -> PlayerAction:
+        """Pick one of the actions open to seat"""
+        return self.choose(state.available_actions(seat), rng)
+
+    @abstractmethod
+    def choose(self, options: List[dict], rng: random.Random) -> PlayerAction:
+        """
+        Pick one of options, as listed by PokerGameState.available_actions
+        and sent to players in their private view
+        """
+        pass
+
+
+class RandomBot(Bot):
+    """Mostly checks and calls, sometimes folds, bets or raises a random size"""
+
+    def choose(self, options: List[dict], rng: random.Random) -> PlayerAction:
+        roll = rng.random()
+        if roll < 0.1 and len(options) > 1 and options[1]["type"] != "check":
+            return PlayerAction(Action.FOLD)
+        if roll < 0.75 or len(options) < 3:
+            return _passive(options[1])
+        bet = options[2]
+        if rng.random() < 0.1:
+            amount = bet["max"]
+        else:
+            amount = rng.randint(bet["min"], bet["max"])
+        return PlayerAction(Action(bet["type"]), amount)
+
+
+class CallingStationBot(Bot):
+    """Never folds or raises"""
+
+    def choose(self, options: List[dict], rng: random.Random) -> PlayerAction:
+        return _passive(options[1])
+
+
+class AggressiveBot(Bot):
+    """Min-raises or shoves whenever it can, so hands end in all-ins"""
+
+    def choose(self, options: List[dict], rng: random.Random) -> PlayerAction:
+        if len(options) < 3:
+            return _passive(options[1])
+        bet = options[2]
+        amount = bet["max"] if rng.random() < 0.5 else bet["min"]
+        return PlayerAction(Action(bet["type"]), amount)
+
+
+def _passive(option: dict) -> PlayerAction:
+    return PlayerAction(Action(option["type"]), option.get("amount", 0))
+
+
+BOTS: Dict[str, type] = {
+    "random": RandomBot,
+    "calling": CallingStationBot,
+    "aggressive": AggressiveBot,
+}
+
+
+@dataclass
+class SimulationConfig:
+    tables: int = 50  # tables per chunk, played round-robin
+    players: int = 6
+    starting_stack: int = 10_000
+    small_blind: int = 50
+    big_blind: int = 100
+    bots: List[str] = field(default_factory=lambda: ["random"])
+    probe_rate: float = 0.05  # chance per action of also trying a random action
+    rake_rate: int = 0  # basis points
+    rake_cap: int = 0
+    seed: str = "self-play"
+
+
+@dataclass
+class Violation:
+    hand_id: str
+    reason: str
+
+
+@dataclass
+class SimulationReport:
+    hands: int = 0
+    actions: int = 0
+    probes: int = 0
+    chunks: int = 0
+    seconds: float = 0.0  # wall time for the whole run
+    cpu_seconds: float = 0.0  # summed over workers
+    violation_count: int = 0
+    violations: List[Violation] = field(default_factory=list)
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds else 0.0
+
+    @property
+    def actions_per_second(self) -> float:
+        return self.actions / self.seconds if self.seconds else 0.0
+
+    def merge(self, other: "SimulationReport") -> None:
+        self.hands += other.hands
+        self.actions += other.actions
+        self.probes += other.probes
+        self.chunks += other.chunks
+        self.cpu_seconds += other.cpu_seconds
+        self.violation_count += other.violation_count
+        room = MAX_REPORTED_VIOLATIONS - len(self.violations)
+        self.violations.extend(other.violations[:room])
+
+
+class _Table:
+    def __init__(self, table_id: str, config: SimulationConfig, rng: random.Random):
+        self.game: Game = GameFactory.create_game(
+            table_id, config.players, GameType.POKER
+        )
+        self.bots: Dict[str, Bot] = {}
+        for seat in range(config.players):
+            player_id = f"{table_id}-p{seat}"
+            self.game.seat_player(player_id)
+            self.bots[player_id] = BOTS[rng.choice(config.bots)]()
+        self.stacks = [config.starting_stack] * config.players
+        self.button = 0
+        self.hands = 0
+
+
+def play_chunk(config: SimulationConfig, chunk: int, hands: int) -> SimulationReport:
+    """Play hands across config.tables fresh tables; runs in a pool worker"""
+    started = time.process_time()
+    rng = random.Random(f"{config.seed}:{chunk}")
+    tables = [_Table(f"c{chunk}t{i}", config, rng) for i in range(config.tables)]
+    report = SimulationReport(chunks=1)
+    for number in range(hands):
+        _play_hand(tables[number % len(tables)], config, rng, report)
+    report.cpu_seconds = time.process_time() - started
+    return report
+
+
+def _play_hand(
+    table: _Table,
+    config: SimulationConfig,
+    rng: random.Random,
+    report: SimulationReport,
+) -> None:
+    game = table.game
+    player_ids = [game.seats[seat] for seat in sorted(game.seats)]
+    hand_id = f"{game.table_id}h{table.hands}"
+    seed = f"{config.seed}:{hand_id}"
+    chips_before = sum(table.stacks)
+    state = PokerRulesEngine.start_hand(
+        hand_id,
+        player_ids,
+        table.stacks,
+        table.button,
+        config.small_blind,
+        config.big_blind,
+        shuffle_deck(seed),
+    )
+    game.game_state = state
+    table.hands += 1
+    table.button = (table.button + 1) % len(player_ids)
+    report.hands += 1
+
+    def violation(reason: str) -> None:
+        report.violation_count += 1
+        if len(report.violations) < MAX_REPORTED_VIOLATIONS:
+            report.violations.append(Violation(hand_id, reason))
+
+    actions = 0
+    while not state.is_complete:
+        if actions >= MAX_ACTIONS_PER_HAND:
+            violation("hand did not finish")
+            break
+        seat = state.action_on
+        if not 0 <= seat < len(player_ids):
+            violation(f"no valid seat to act on {state.street.name}")
+            break
+        player_id = player_ids[seat]
+        if rng.random() < config.probe_rate:
+            report.probes += 1
+            reason = _probe(game, state, player_ids, rng)
+            if reason is not None:
+                violation(reason)
+        action = table.bots[player_id].act(state, seat, rng)
+        if not game.validate_action(player_id, action):
+            violation(f"bot chose an action validate_action rejects: {action!r}")
+            break
+        try:
+            state = game.apply_action(player_id, action)
+        except InvalidActionError as exc:
+            violation(f"validated {action!r} was rejected: {exc}")
+            break
+        actions += 1
+    report.actions += actions
+
+    payouts: Dict[str, int] = {}
+    rake = 0
+    if state.is_complete:
+        rake = RakeRule(config.rake_rate, config.rake_cap).amount_for(state)
+        try:
+            payouts = PokerRulesEngine.calculate_payouts(state, rake)
+        except ChipConservationError as exc:
+            violation(str(exc))
+        put_in = [
+            before - after for before, after in zip(table.stacks, state.stacks)
+        ]
+        for seat, player_id in enumerate(player_ids):
+            # Nobody can win more from a player than they matched themselves
+            covered = sum(min(chips, put_in[seat]) for chips in put_in)
+            if payouts.get(player_id, 0) > covered:
+                violation(f"{player_id} won {payouts[player_id]} of {covered} covered")
+    stacks = [
+        stack + payouts.get(player_id, 0)
+        for player_id, stack in zip(player_ids, state.stacks)
+    ]
+    if state.is_complete and sum(stacks) + rake != chips_before:
+        violation(
+            f"chips not conserved: {chips_before} in, {sum(stacks)} out, {rake} rake"
+        )
+    if any(stack < 0 for stack in stacks):
+        violation(f"negative stack: {stacks}")
+    # Busted players buy in again so every table keeps running
+    table.stacks = [
+        stack if stack >= config.big_blind else config.starting_stack
+        for stack in stacks
+    ]
+
+
+def _probe(
+    game: Game, state: PokerGameState, player_ids: List[str], rng: random.Random
+) -> Optional[str]:
+    """
+    Try a random, usually illegal, action on the immutable state and check
+    that validate_action and apply_action agree on it
+    """
+    player_id = rng.choice(player_ids)
+    seat = state.seat_of(player_id)
+    kind = rng.choice(list(Action))
+    amount = rng.randint(0, 2 * (state.stacks[seat] + state.bets[seat]) + 1)
+    action = PlayerAction(kind, amount if kind in (Action.BET, Action.RAISE) else 0)
+    valid = game.validate_action(player_id, action)
+    try:
+        PokerRulesEngine.apply_action(state, player_id, action)
+    except InvalidActionError:
+        if valid:
+            return f"validate_action accepted {action!r} that apply_action rejects"
+        return None
+    if not valid:
+        return f"validate_action rejected {action!r} that apply_action accepts"
+    return None
+
+
+def run(
+    config: SimulationConfig,
+    hands: int,
+    workers: Optional[int] = None,
+    chunk_hands: int = 20_000,
+    duration: Optional[float] = None,
+    on_progress=None,
+) -> SimulationReport:
+    """
+    Play hands (or keep playing for duration seconds) in a process pool, in
+    chunks of chunk_hands, and merge the workers' reports
+    """
+    workers = workers or os.cpu_count() or 1
+    report = SimulationReport()
+    started = time.perf_counter()
+    deadline = started + duration if duration is not None else None
+    next_chunk = 0
+    remaining = hands
+
+    def more() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return remaining > 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        while in_flight or more():
+            while more() and len(in_flight) < workers * 2:
+                size = chunk_hands
+                if deadline is None:
+                    size = min(chunk_hands, remaining)
+                in_flight.add(pool.submit(play_chunk, config, next_chunk, size))
+                next_chunk += 1
+                remaining -= size
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                report.merge(future.result())
+            report.seconds = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(report)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Play bots against each other through the rules engine"
+    )
+    parser.add_argument("--hands", type=int, default=1_000_000)
+    parser.add_argument("--duration", type=float, default=None, help="soak seconds")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-hands", type=int, default=20_000)
+    parser.add_argument("--tables", type=int, default=50)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--stack", type=int, default=10_000)
+    parser.add_argument("--blinds", default="50/100")
+    parser.add_argument(
+        "--bots", default="random", help=f"comma separated mix of {', '.join(BOTS)}"
+    )
+    parser.add_argument("--probe-rate", type=float, default=0.05)
+    parser.add_argument("--rake", type=int, default=0, help="basis points")
+    parser.add_argument("--rake-cap", type=int, default=0)
+    parser.add_argument("--seed", default="self-play")
+    args = parser.parse_args()
+
+    small_blind, big_blind = (int(blind) for blind in args.blinds.split("/"))
+    bots = args.bots.split(",")
+    unknown = [bot for bot in bots if bot not in BOTS]
+    if unknown:
+        parser.error(f"unknown bots: {', '.join(unknown)}")
+    config = SimulationConfig(
+        tables=args.tables,
+        players=args.players,
+        starting_stack=args.stack,
+        small_blind=small_blind,
+        big_blind=big_blind,
+        bots=bots,
+        probe_rate=args.probe_rate,
+        rake_rate=args.rake,
+        rake_cap=args.rake_cap,
+        seed=args.seed,
+    )
+
+    def progress(report: SimulationReport) -> None:
+        print(
+            f"\r{report.hands} hands, {report.hands_per_second:,.0f} hands/s, "
+            f"{report.actions_per_second:,.0f} actions/s, "
+            f"{report.violation_count} violations",
+            end="",
+            flush=True,
+        )
+
+    report = run(
+        config, args.hands, args.workers, args.chunk_hands, args.duration, progress
+    )
+    print()
+    for violation in report.violations:
+        print(f"{violation.hand_id}: {violation.reason}")
+    print(
+        f"played {report.hands} hands ({report.actions} actions, {report.probes} "
+        f"probes) in {report.seconds:.1f}s: {report.hands_per_second:,.0f} hands/s, "
+        f"{report.actions_per_second:,.0f} actions/s, "
+        f"{report.violation_count} violations"
+    )
+    raise SystemExit(1 if report.violation_count else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import json
+from typing import Dict, Optional
+
+from game.domain.interfaces import GameState
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def diff_public_views(previous: dict, current: dict) -> dict:
+    """
+    Fields of current that differ from previous. Seats are diffed per seat
+    index while the seat count is unchanged, otherwise sent whole.
+    """
+    delta = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if value == old:
+            continue
+        if key == "seats" and old is not None and len(old) == len(value):
+            delta[key] = {
+                str(index): {
+                    field: field_value
+                    for field, field_value in seat.items()
+                    if old[index].get(field) != field_value
+                }
+                for index, seat in enumerate(value)
+                if seat != old[index]
+            }
+        else:
+            delta[key] = value
+    return delta
+
+
+class BroadcastFrame:
+    """The public part of one state version, serialized once for all clients"""
+
+    __slots__ = ("version", "base_version", "public", "delta", "_snapshot")
+
+    def __init__(self, version: int, base_version: int, public: dict, delta: bytes):
+        self.version = version
+        self.base_version = base_version
+        self.public = public
+        self.delta = delta
+        self._snapshot: Optional[bytes] = None
+
+    @property
+    def snapshot(self) -> bytes:
+        if self._snapshot is None:
+            self._snapshot = _encode(self.public)
+        return self._snapshot
+
+
+class StateBroadcaster:
+    """
+    Turns each state transition at a table into per-client messages.
+
+    The public view is diffed against the previous version and serialized once
+    per transition; each player's message is that shared delta plus their
+    private fields, which are only resent when they change. Clients whose last
+    seen version is not the previous one get a full snapshot to resync.
+    """
+
+    def __init__(self):
+        self.version = 0  # per table, unlike PokerGameState.version
+        self.frame: Optional[BroadcastFrame] = None
+        self._state: Optional[GameState] = None
+        self._private_sent: Dict[str, dict] = {}
+
+    def publish(self, state: GameState) -> BroadcastFrame:
+        """Record a new state version and serialize its public delta"""
+        public = state.public_view()
+        previous = self.frame
+        self.version += 1
+        if previous is None:
+            self.frame = BroadcastFrame(self.version, 0, public, _encode(public))
+        else:
+            self.frame = BroadcastFrame(
+                self.version,
+                previous.version,
+                public,
+                _encode(diff_public_views(previous.public, public)),
+            )
+        self._state = state
+        return self.frame
+
+    def message_for(self, player_id: Optional[str], client_version: int) -> bytes:
+        """
+        Message bringing a client at client_version up to the latest version.
+        player_id is None for spectators, who only receive the public view.
+        """
+        frame = self.frame
+        if frame is None:
+            raise ValueError("No state has been published yet")
+        incremental = frame.base_version > 0 and client_version == frame.base_version
+        message = b"".join(
+            (
+                b'{"type":"',
+                b"delta" if incremental else b"snapshot",
+                b'","version":',
+                str(frame.version).encode(),
+                b',"public":',
+                frame.delta if incremental else frame.snapshot,
+            )
+        )
+        if player_id is not None:
+            private = self._state.private_view(player_id)
+            last_sent = self._private_sent.get(player_id)
+            if incremental and last_sent is not None:
+                patch = diff_public_views(last_sent, private)
+            else:
+                patch = private
+            self._private_sent[player_id] = private
+            if patch:
+                message += b',"private":' + _encode(patch)
+        return message + b"}"
+
+    def snapshot_for(self, player_id: Optional[str]) -> bytes:
+        """Full state for a client that is joining or has fallen behind"""
+        return self.message_for(player_id, client_version=-1)
+
+    def forget(self, player_id: str) -> None:
+        """Drop private tracking for a player who left the table"""
+        self._private_sent.pop(player_id, None)
@@ -0,0 +1,258 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+from game.domain.entities import Game
+from game.domain.enums import GameType
+from game.domain.exceptions import InvalidActionError
+from game.domain.factories import GameFactory
+from game.domain.interfaces import GameState
+from game.domain.value_objects import GameAction
+
+
+class MailboxFullError(Exception):
+    pass
+
+
+@dataclass
+class ActorMetrics:
+    processed: int = 0
+    actions: int = 0  # player actions applied
+    rejected: int = 0  # illegal actions turned away before the mailbox
+    failed: int = 0
+    read_batches: int = 0
+    reads_batched: int = 0
+    mailbox_depth: int = 0
+    max_mailbox_depth: int = 0
+
+
+class _Command:
+    __slots__ = ("handler", "read_only", "future")
+
+    def __init__(self, handler: Callable[[Game], Any], read_only: bool, future):
+        self.handler = handler
+        self.read_only = read_only
+        self.future = future
+
+
+class TableActor:
+    """
+    Owns one table's Game and applies joins, leaves, actions and timer events
+    strictly in arrival order from a mailbox. Handlers run to completion
+    without awaiting, so nothing else can touch the Game in the middle of a
+    change and no locks are needed. Consecutive read-only requests are
+    answered together in one pass.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        on_state: Optional[Callable[[str, GameState], None]] = None,
+        max_mailbox: int = 1024,
+    ):
+        self.game = game
+        self.on_state = on_state
+        self.max_mailbox = max_mailbox
+        self.metrics = ActorMetrics()
+        self._mailbox: Deque[_Command] = deque()
+        self._ready = asyncio.Event()
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def table_id(self) -> str:
+        return self.game.table_id
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._mailbox:
+            self._mailbox.popleft().future.cancel()
+
+    async def join(self, player_id: str, seat: Optional[int] = None) -> bool:
+        return await self._submit(lambda game: game.seat_player(player_id, seat))
+
+    async def leave(self, player_id: str) -> bool:
+        return await self._submit(lambda game: game.remove_player(player_id))
+
+    async def act(self, player_id: str, action: GameAction) -> GameState:
+        # Out of turn, duplicate and other illegal actions are checked against
+        # the current state's cached legal actions and never take a mailbox
+        # slot. Anything that passes is validated again in mailbox order.
+        if not self.game.validate_action(player_id, action):
+            self.metrics.rejected += 1
+            raise InvalidActionError(f"{action!r} is not a legal action now")
+        state = await self._submit(lambda game: game.apply_action(player_id, action))
+        self.metrics.actions += 1
+        return state
+
+    async def update(self, handler: Callable[[Game], Any]) -> Any:
+        """Run an arbitrary change against the Game in mailbox order"""
+        return await self._submit(handler)
+
+    async def read(self, query: Callable[[Game], Any]) -> Any:
+        """Run a query that must not change the Game"""
+        return await self._submit(query, read_only=True)
+
+    async def view(self, player_id: str) -> Optional[dict]:
+        return await self.read(
+            lambda game: (
+                game.view_state_for_player(player_id)
+                if game.game_state is not None
+                else None
+            )
+        )
+
+    def schedule(
+        self, name: str, delay: float, handler: Callable[[Game], Any]
+    ) -> None:
+        """
+        Post handler to the mailbox after delay seconds, e.g. an action clock.
+        Scheduling under a name that is already pending replaces that timer.
+        """
+        self.cancel_timer(name)
+        loop = asyncio.get_running_loop()
+        self._timers[name] = loop.call_later(delay, self._fire_timer, name, handler)
+
+    def cancel_timer(self, name: str) -> None:
+        handle = self._timers.pop(name, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _fire_timer(self, name: str, handler: Callable[[Game], Any]) -> None:
+        self._timers.pop(name, None)
+        # Nobody awaits a timer, so a full mailbox or a failure is dropped
+        try:
+            future = self._submit(handler)
+        except MailboxFullError:
+            self.metrics.failed += 1
+            return
+        future.add_done_callback(_consume_result)
+
+    def _submit(
+        self, handler: Callable[[Game], Any], read_only: bool = False
+    ) -> asyncio.Future:
+        if len(self._mailbox) >= self.max_mailbox:
+            raise MailboxFullError(f"Table {self.table_id} is not keeping up")
+        future = asyncio.get_running_loop().create_future()
+        self._mailbox.append(_Command(handler, read_only, future))
+        depth = len(self._mailbox)
+        self.metrics.mailbox_depth = depth
+        if depth > self.metrics.max_mailbox_depth:
+            self.metrics.max_mailbox_depth = depth
+        self._ready.set()
+        return future
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+            while self._mailbox:
+                command = self._mailbox.popleft()
+                if command.read_only:
+                    self._run_reads(command)
+                else:
+                    self._run_update(command)
+                self.metrics.mailbox_depth = len(self._mailbox)
+            self._ready.clear()
+            # Let other tables run between mailbox drains
+            await asyncio.sleep(0)
+
+    def _run_update(self, command: _Command) -> None:
+        state = self.game.game_state
+        self._execute(command)
+        if self.on_state is not None and self.game.game_state is not state:
+            try:
+                self.on_state(self.table_id, self.game.game_state)
+            except Exception:
+                # The change is applied; a failing listener must not stop the table
+                self.metrics.failed += 1
+
+    def _run_reads(self, command: _Command) -> None:
+        batch = 1
+        self._execute(command)
+        while self._mailbox and self._mailbox[0].read_only:
+            self._execute(self._mailbox.popleft())
+            batch += 1
+        self.metrics.read_batches += 1
+        self.metrics.reads_batched += batch
+
+    def _execute(self, command: _Command) -> None:
+        if command.future.cancelled():
+            return
+        try:
+            result = command.handler(self.game)
+        except Exception as exc:
+            self.metrics.failed += 1
+            command.future.set_exception(exc)
+        else:
+            self.metrics.processed += 1
+            command.future.set_result(result)
+
+
+def _consume_result(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class TableActorRegistry:
+    """Actors for every table served by this worker, started on first use"""
+
+    def __init__(
+        self,
+        game_factory: GameFactory,
+        on_state: Optional[Callable[[str, GameState], None]] = None,
+        max_seats: int = 9,
+        game_type: GameType = GameType.POKER,
+        **actor_options,
+    ):
+        self.game_factory = game_factory
+        self.on_state = on_state
+        self.max_seats = max_seats
+        self.game_type = game_type
+        self.actor_options = actor_options
+        self._actors: Dict[str, TableActor] = {}
+
+    def actor_for(self, table_id: str, max_seats: Optional[int] = None) -> TableActor:
+        actor = self._actors.get(table_id)
+        if actor is None:
+            game = self.game_factory.create_game(
+                table_id, max_seats or self.max_seats, self.game_type
+            )
+            actor = TableActor(game, self.on_state, **self.actor_options)
+            actor.start()
+            self._actors[table_id] = actor
+        return actor
+
+    def __contains__(self, table_id: object) -> bool:
+        return table_id in self._actors
+
+    def get(self, table_id: str) -> Optional[TableActor]:
+        """The table's actor if it is running here, without starting one"""
+        return self._actors.get(table_id)
+
+    async def remove(self, table_id: str) -> None:
+        """Stop a table's actor; its Game is discarded"""
+        actor = self._actors.pop(table_id, None)
+        if actor is not None:
+            await actor.stop()
+
+    def metrics(self) -> Dict[str, ActorMetrics]:
+        return {table_id: actor.metrics for table_id, actor in self._actors.items()}
+
+    async def close(self) -> None:
+        for actor in self._actors.values():
+            await actor.stop()
+        self._actors.clear()
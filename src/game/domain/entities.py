@@ -1,31 +1,75 @@
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Optional
 
-from game.domain.exceptions import NoSeatsAvaliableError, PlayerNotFoundError
+from game.domain.exceptions import (
+    InvalidActionError,
+    NoSeatsAvaliableError,
+    PlayerNotFoundError,
+)
 from game.domain.interfaces import GameEngine, GameState
 from game.domain.value_objects import GameAction
+from shared.metrics import REGISTRY
 from shared.types import PlayerId
 
+_APPLY_SECONDS = REGISTRY.histogram(
+    "poker_game_apply_action_seconds", "Time to apply one player action"
+)
+_VALIDATE_SECONDS = REGISTRY.histogram(
+    "poker_game_validate_action_seconds", "Time to validate one player action"
+)
+
 
 class Game:
+    """
+    A table's seating and current game state. Not safe for concurrent use;
+    a TableActor owns each Game and applies every change in order.
+    """
+
     table_id: str
+    max_seats: int
     seats: Dict[int, PlayerId]  # seat_num -> player_id
     current_turn_seat: int
 
-    game_state: GameState
+    game_state: Optional[GameState]
     game_engine: GameEngine
 
+    def __init__(
+        self,
+        table_id: str,
+        max_seats: int,
+        game_engine: GameEngine,
+        game_state: Optional[GameState] = None,
+    ):
+        self.table_id = table_id
+        self.max_seats = max_seats
+        self.seats = {}
+        self.current_turn_seat = -1
+        self.game_engine = game_engine
+        self.game_state = game_state
+
     def validate_action(self, player_id: PlayerId, action: GameAction) -> bool:
         """Validate if action is legal"""
-        return self.game_engine.validate_action(self.game_state, player_id, action)
+        if self.game_state is None:
+            return False
+        started = time.perf_counter()
+        valid = self.game_engine.validate_action(self.game_state, player_id, action)
+        _VALIDATE_SECONDS.observe(time.perf_counter() - started)
+        return valid
 
     def apply_action(self, player_id: PlayerId, action: GameAction) -> GameState:
         """Apply action to game state and return new state"""
-        self.game_state = self.game_engine.apply_action(
-            self.game_state, player_id, action
-        )
+        if self.game_state is None:
+            raise InvalidActionError("No hand is in progress")
+        started = time.perf_counter()
+        try:
+            self.game_state = self.game_engine.apply_action(
+                self.game_state, player_id, action
+            )
+        finally:
+            _APPLY_SECONDS.observe(time.perf_counter() - started)
         return self.game_state
 
-    def view_state_for_player(self, player_id: PlayerId) -> GameState:
+    def view_state_for_player(self, player_id: PlayerId) -> dict:
         """Return a view of the game state for the given player"""
         return self.game_state.view_for_player(player_id)
 
@@ -36,10 +80,15 @@ class Game:
                 return False
         return True
 
-    def seat_player(self, player_id: PlayerId) -> bool:
-        """Add player to table if space available"""
+    def seat_player(self, player_id: PlayerId, seat: Optional[int] = None) -> bool:
+        """Add player to table if space available, at seat if one is given"""
         if self.is_full():
             raise NoSeatsAvaliableError("Game has no open seats")
+        if seat is not None:
+            if not 0 <= seat < self.max_seats or seat in self.seats:
+                raise NoSeatsAvaliableError(f"Seat {seat} is not open")
+            self.seats[seat] = player_id
+            return True
         for seat in range(self.max_seats):
             if seat not in self.seats:
                 self.seats[seat] = player_id
@@ -0,0 +1,18 @@
+class NoSeatsAvaliableError(Exception):
+    pass
+
+
+class PlayerNotFoundError(Exception):
+    pass
+
+
+class InvalidActionError(Exception):
+    pass
+
+
+class PlayerInHandError(Exception):
+    pass
+
+
+class ChipConservationError(Exception):
+    pass
@@ -1,10 +1,13 @@
 from game.domain.entities import Game
 from game.domain.enums import GameType
+from game.domain.poker.engine import PokerRulesEngine
 
 
 class GameFactory:
     """Factory to create new game instances."""
 
     @staticmethod
-    def create_game(self, max_seats: int, game_type: GameType) -> Game:
-        pass
+    def create_game(table_id: str, max_seats: int, game_type: GameType) -> Game:
+        if game_type is GameType.POKER:
+            return Game(table_id, max_seats, PokerRulesEngine())
+        raise ValueError(f"Unsupported game type: {game_type}")
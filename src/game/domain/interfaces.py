@@ -4,10 +4,18 @@ from game.domain.value_objects import GameAction
 
 
 class GameState(ABC):
-    def view_for_player(self, player_id: str) -> "GameState":
-        """Return a view of the game state for the given player"""
+    def public_view(self) -> dict:
+        """Return the part of the state every seat and spectator may see"""
+        pass
+
+    def private_view(self, player_id: str) -> dict:
+        """Return the fields only the given player may see"""
         pass
 
+    def view_for_player(self, player_id: str) -> dict:
+        """Return a view of the game state for the given player"""
+        return {**self.public_view(), **self.private_view(player_id)}
+
 
 class GameEngine(ABC):
     def validate_action(
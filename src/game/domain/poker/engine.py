@@ -1,33 +1,421 @@
-from typing import Dict, List
-from game.domain.interfaces import IGameEngine
-from game.domain.poker.enums import Action
-from game.domain.poker.value_objects import PokerGameState
-from game.infrastructure.randomness_provider import IRandomnessProvider
+from hashlib import shake_256
+from typing import Dict, List, Optional, Sequence, Tuple
+from game.domain.exceptions import ChipConservationError, InvalidActionError
+from game.domain.interfaces import GameEngine
+from game.domain.poker.enums import Action, BettingRound
+from game.domain.poker.hand_evaluator import evaluate_batch
+from game.domain.poker.value_objects import (
+    ActionLogEntry,
+    LegalActions,
+    PlayerAction,
+    PokerGameState,
+    Pot,
+)
 
 
-class PokerRulesEngine(IGameEngine):
+class PokerRulesEngine(GameEngine):
     @staticmethod
-    def validate_action(state: PokerGameState, player_id: str, action: Action) -> bool:
-        """Validate if action is legal"""
+    def start_hand(
+        hand_id: str,
+        player_ids: Sequence[str],
+        stacks: Sequence[int],
+        button: int,
+        small_blind: int,
+        big_blind: int,
+        deck: bytes,
+    ) -> PokerGameState:
+        """Deal hole cards, post blinds and return the opening state"""
+        seats = len(player_ids)
+        if seats < 2:
+            raise ValueError("A hand needs at least two players")
+        hole_cards = bytes(
+            card for seat in range(seats) for card in (deck[seat], deck[seats + seat])
+        )
+        small = button if seats == 2 else (button + 1) % seats
+        big = (small + 1) % seats
+        stacks = list(stacks)
+        bets = [0] * seats
+        all_in = 0
+        for seat, blind in ((small, small_blind), (big, big_blind)):
+            posted = min(blind, stacks[seat])
+            stacks[seat] -= posted
+            bets[seat] = posted
+            if stacks[seat] == 0:
+                all_in |= 1 << seat
+
+        state = PokerGameState(
+            hand_id=hand_id,
+            player_ids=tuple(player_ids),
+            button=button,
+            small_blind=small_blind,
+            big_blind=big_blind,
+            deck=deck,
+            deck_position=2 * seats,
+            hole_cards=hole_cards,
+            board=b"",
+            street=BettingRound.PREFLOP,
+            stacks=tuple(stacks),
+            bets=tuple(bets),
+            pot=0,
+            pots=(),
+            folded=0,
+            all_in=all_in,
+            acted=0,
+            action_on=-1,
+            current_bet=max(bets),
+            min_raise=big_blind,
+            legal_actions=None,
+            log=None,
+            version=0,
+            parent=None,
+        )
+        state.action_on = _next_to_act(
+            seats, big, 0, all_in, 0, state.bets, state.current_bet
+        )
+        if state.action_on < 0:
+            _finish_street(state)
+        state.legal_actions = _legal_actions(state)
+        return state
+
+    @staticmethod
+    def validate_action(
+        state: PokerGameState, player_id: str, action: PlayerAction
+    ) -> bool:
+        """Validate if action is legal, against the state's cached legal actions"""
+        legal = state.legal_actions
+        return (
+            legal is not None
+            and state.player_ids[legal.seat] == player_id
+            and legal.allows(action)
+        )
 
     @staticmethod
     def determine_winners(state: PokerGameState) -> List[str]:
-        """Determine winner(s) of hand"""
+        """Player(s) holding the best hand still live"""
+        live = ((1 << len(state.player_ids)) - 1) & ~state.folded
+        ranked = _ranked_hands(state, live)
+        best = ranked[0][0]
+        return [
+            state.player_ids[seat]
+            for strength, seat in sorted(ranked, key=lambda ranking: ranking[1])
+            if strength == best
+        ]
+
+    @staticmethod
+    def calculate_payouts(state: PokerGameState, rake: int = 0) -> Dict[str, int]:
+        """
+        Award every pot of a finished hand to the best live hand eligible for
+        it, after taking rake chips from the main pot first. Split pots leave
+        their odd chips one each to the winners closest left of the button.
+        Raises ChipConservationError unless the payouts and rake add up to
+        the chips put in.
+        """
+        seats = len(state.player_ids)
+        live = ((1 << seats) - 1) & ~state.folded
+        ranked = _ranked_hands(state, live)
+        won: Dict[int, int] = {}
+        uncut = rake
+        for pot in state.pots:
+            cut = min(uncut, pot.amount)
+            uncut -= cut
+            amount = pot.amount - cut
+            eligible = pot.eligible & live or live
+            winners = 0
+            best = None
+            for strength, seat in ranked:
+                if eligible >> seat & 1:
+                    if best is None:
+                        best = strength
+                    elif strength != best:
+                        break
+                    winners |= 1 << seat
+            if not winners & (winners - 1):
+                seat = winners.bit_length() - 1
+                won[seat] = won.get(seat, 0) + amount
+                continue
+            # Odd-chip order: first left of the button, the button last
+            winning_seats = [
+                seat
+                for seat in (
+                    (state.button + step) % seats for step in range(1, seats + 1)
+                )
+                if winners >> seat & 1
+            ]
+            share, odd_chips = divmod(amount, len(winning_seats))
+            for i, seat in enumerate(winning_seats):
+                won[seat] = won.get(seat, 0) + share + (1 if i < odd_chips else 0)
+
+        paid = sum(won.values())
+        if uncut or any(state.bets) or paid + rake != state.pot:
+            raise ChipConservationError(
+                f"Hand {state.hand_id} pays {paid} plus {rake} rake "
+                f"out of a {state.pot} pot"
+            )
+        return {
+            state.player_ids[seat]: amount
+            for seat, amount in sorted(won.items())
+            if amount
+        }
 
     @staticmethod
-    def calculate_payouts(pot: int, winners: List[str]) -> Dict[str, int]:
-        """Calculate pot distribution"""
+    def refunds(state: PokerGameState) -> Dict[str, int]:
+        """What each player put into a hand, to hand back if it is voided"""
+        first = state
+        while first.parent is not None:
+            first = first.parent
+        return {
+            player_id: first.stacks[seat] + first.bets[seat] - state.stacks[seat]
+            for seat, player_id in enumerate(state.player_ids)
+            if first.stacks[seat] + first.bets[seat] > state.stacks[seat]
+        }
 
     @staticmethod
     def apply_action(
-        state: PokerGameState, player_id: str, action: Action
+        state: PokerGameState, player_id: str, action: PlayerAction
     ) -> PokerGameState:
         """Apply action to hand state and return new state"""
+        seat = _check_action(state, player_id, action)
+        bit = 1 << seat
+        stacks = state.stacks
+        bets = state.bets
+        folded = state.folded
+        all_in = state.all_in
+        acted = state.acted | bit
+        current_bet = state.current_bet
+        min_raise = state.min_raise
+
+        kind = action.action
+        if kind is Action.FOLD:
+            folded |= bit
+        elif kind is not Action.CHECK:
+            if kind is Action.CALL:
+                target = min(current_bet, bets[seat] + stacks[seat])
+            else:
+                target = action.amount
+                if target - current_bet >= min_raise:
+                    # A full raise reopens the action for everyone else
+                    min_raise = target - current_bet
+                    acted = bit
+                current_bet = target
+            stack = stacks[seat] - (target - bets[seat])
+            stacks = stacks[:seat] + (stack,) + stacks[seat + 1 :]
+            bets = bets[:seat] + (target,) + bets[seat + 1 :]
+            if stack == 0:
+                all_in |= bit
+
+        seats = len(state.player_ids)
+        live = ((1 << seats) - 1) & ~folded
+        next_seat = -1
+        if live & (live - 1):
+            next_seat = _next_to_act(
+                seats, seat, folded, all_in, acted, bets, current_bet
+            )
+        new_state = state.evolve(
+            stacks=stacks,
+            bets=bets,
+            folded=folded,
+            all_in=all_in,
+            acted=acted,
+            current_bet=current_bet,
+            min_raise=min_raise,
+            action_on=next_seat,
+            log=ActionLogEntry(seat, action, state.street, state.log),
+        )
+        if next_seat < 0:
+            _finish_street(new_state)
+        new_state.legal_actions = _legal_actions(new_state)
+        return new_state
+
+
+def _legal_actions(state: PokerGameState) -> Optional[LegalActions]:
+    """The legal actions of the seat on the clock of a new state"""
+    seat = state.action_on
+    if seat < 0:
+        return None
+    current_bet = state.current_bet
+    stack = state.stacks[seat]
+    all_in_to = state.bets[seat] + stack
+    raise_kind = None
+    if all_in_to > current_bet and not state.acted >> seat & 1:
+        raise_kind = Action.BET if current_bet == 0 else Action.RAISE
+    return LegalActions(
+        seat,
+        min(current_bet - state.bets[seat], stack),
+        raise_kind,
+        min(current_bet + state.min_raise, all_in_to),
+        all_in_to,
+    )
+
+
+def _check_action(state: PokerGameState, player_id: str, action: PlayerAction) -> int:
+    """Return the acting seat or raise InvalidActionError"""
+    legal = state.legal_actions
+    if (
+        legal is not None
+        and state.player_ids[legal.seat] == player_id
+        and legal.allows(action)
+    ):
+        return legal.seat
+    # Only rejected actions get here, to find out why
+    if state.is_complete:
+        raise InvalidActionError("Hand is complete")
+    seat = state.seat_of(player_id)
+    if seat < 0 or seat != state.action_on:
+        raise InvalidActionError("It is not this player's turn")
+
+    kind = action.action
+    to_call = state.current_bet - state.bets[seat]
+    if kind is Action.CHECK and to_call > 0:
+        raise InvalidActionError("Cannot check facing a bet")
+    if kind is Action.CALL and to_call == 0:
+        raise InvalidActionError("Nothing to call")
+    if kind is Action.BET and state.current_bet > 0:
+        raise InvalidActionError("Cannot bet facing a bet, raise instead")
+    if kind is Action.RAISE and state.current_bet == 0:
+        raise InvalidActionError("Nothing to raise, bet instead")
+    if kind is Action.BET or kind is Action.RAISE:
+        all_in_to = state.bets[seat] + state.stacks[seat]
+        if action.amount > all_in_to:
+            raise InvalidActionError("Not enough chips")
+        if action.amount <= state.current_bet:
+            raise InvalidActionError("Raise must exceed the current bet")
+        if (
+            action.amount - state.current_bet < state.min_raise
+            and action.amount != all_in_to
+        ):
+            raise InvalidActionError("Raise is below the minimum")
+        if state.acted >> seat & 1:
+            raise InvalidActionError("Betting was not reopened by a full raise")
+    raise InvalidActionError(f"{action!r} is not allowed")
+
+
+def _next_to_act(
+    seats: int,
+    after: int,
+    folded: int,
+    all_in: int,
+    acted: int,
+    bets: Tuple[int, ...],
+    current_bet: int,
+) -> int:
+    """Return the next seat after `after` that still has to act, or -1"""
+    blocked = folded | all_in
+    can_act = bin(((1 << seats) - 1) & ~blocked).count("1")
+    for step in range(1, seats + 1):
+        seat = (after + step) % seats
+        if blocked >> seat & 1:
+            continue
+        if bets[seat] < current_bet:
+            return seat
+        # A lone player with chips behind has nobody left to bet against
+        if not acted >> seat & 1 and can_act > 1:
+            return seat
+    return -1
+
+
+def _finish_street(state: PokerGameState) -> None:
+    """
+    Close the betting round on a state that has not been published yet:
+    return any uncalled bet, collect bets into the pot and deal the next street,
+    running the board out when no further betting is possible.
+    """
+    seats = len(state.player_ids)
+    stacks = list(state.stacks)
+    bets = list(state.bets)
+    top = max(range(seats), key=bets.__getitem__)
+    matched = max(bet for seat, bet in enumerate(bets) if seat != top)
+    if bets[top] > matched:
+        stacks[top] += bets[top] - matched
+        bets[top] = matched
+        state.all_in &= ~(1 << top)
+
+    _collect_bets(state, bets)
+    state.stacks = tuple(stacks)
+    state.bets = (0,) * seats
+    state.current_bet = 0
+    state.min_raise = state.big_blind
+    state.acted = 0
+    state.action_on = -1
+
+    live = ((1 << seats) - 1) & ~state.folded
+    if not live & (live - 1):
+        state.street = BettingRound.SHOWDOWN
+        return
+    while state.street < BettingRound.RIVER:
+        count = 3 if state.street is BettingRound.PREFLOP else 1
+        start = state.deck_position + 1  # burn one card
+        state.board += state.deck[start : start + count]
+        state.deck_position = start + count
+        state.street = BettingRound(state.street + 1)
+        state.action_on = _next_to_act(
+            seats, state.button, state.folded, state.all_in, 0, state.bets, 0
+        )
+        if state.action_on >= 0:
+            return
+    state.street = BettingRound.SHOWDOWN
+
+
+def _collect_bets(state: PokerGameState, bets: List[int]) -> None:
+    """
+    Move the street's matched bets into the pots. A live player all in for
+    less than the others caps the pot at their bet, and chips above it open a
+    side pot for the players who put them in. Only pots whose eligible seats
+    change are added, so most streets just top up the last pot.
+    """
+    seats = len(bets)
+    live = ((1 << seats) - 1) & ~state.folded
+    capped = live & state.all_in
+    levels = sorted(
+        {bets[seat] for seat in range(seats) if capped >> seat & 1 and bets[seat]}
+    )
+    top = max(bets)
+    if not levels or levels[-1] < top:
+        levels.append(top)
+    pots = list(state.pots)
+    below = 0
+    for level in levels:
+        amount = sum(min(bet, level) - min(bet, below) for bet in bets)
+        below = level
+        if not amount:
+            continue
+        eligible = 0
+        for seat in range(seats):
+            if live >> seat & 1 and bets[seat] >= level:
+                eligible |= 1 << seat
+        if pots and pots[-1].eligible & live == eligible:
+            pots[-1] = Pot(pots[-1].amount + amount, eligible)
+        else:
+            pots.append(Pot(amount, eligible))
+    state.pots = tuple(pots)
+    state.pot += sum(bets)
+
+
+def _ranked_hands(state: PokerGameState, live: int) -> List[Tuple[int, int]]:
+    """(strength, seat) of every live seat, best first, from one evaluation"""
+    seats = [seat for seat in range(len(state.player_ids)) if live >> seat & 1]
+    if len(seats) == 1:
+        return [(0, seats[0])]
+    hole_cards = state.hole_cards
+    strengths = evaluate_batch(
+        state.board, [hole_cards[2 * seat : 2 * seat + 2] for seat in seats]
+    )
+    return sorted(zip(strengths, seats), reverse=True)
+
 
+_UNSHUFFLED_DECK = bytes(range(52))
+_DRAW_BYTES = 8
 
-class DeckService:
-    def __init__(self, randomness: IRandomnessProvider):
-        pass
 
-    async def create_shuffled_deck(self, seed: str) -> List[str]:
-        """Create deterministically shuffled deck"""
+def shuffle_deck(seed: str) -> bytes:
+    """
+    Fisher-Yates shuffle of the 52 packed cards driven by a SHAKE-256 stream of
+    the seed, so the same seed always reproduces the same deck.
+    """
+    stream = shake_256(seed.encode("utf-8")).digest(51 * _DRAW_BYTES)
+    deck = bytearray(_UNSHUFFLED_DECK)
+    offset = 0
+    for i in range(51, 0, -1):
+        j = int.from_bytes(stream[offset : offset + _DRAW_BYTES], "big") % (i + 1)
+        offset += _DRAW_BYTES
+        deck[i], deck[j] = deck[j], deck[i]
+    return bytes(deck)
@@ -1,2 +1,32 @@
+from game.domain.poker.engine import PokerRulesEngine
+from game.domain.poker.value_objects import PlayerAction, PokerGameState
+
+
 class HandState:
-    pass
+    """
+    The live hand at a table. Holds the current PokerGameState version;
+    earlier versions stay reachable through parent for undo and audit.
+    """
+
+    def __init__(self, state: PokerGameState):
+        self.state = state
+
+    @property
+    def hand_id(self) -> str:
+        return self.state.hand_id
+
+    def apply_action(self, player_id: str, action: PlayerAction) -> PokerGameState:
+        """Apply and validate player action"""
+        self.state = PokerRulesEngine.apply_action(self.state, player_id, action)
+        return self.state
+
+    def undo(self) -> PokerGameState:
+        """Step back to the previous version of the hand"""
+        if self.state.parent is None:
+            raise ValueError("Nothing to undo")
+        self.state = self.state.parent
+        return self.state
+
+    def is_complete(self) -> bool:
+        """Check if hand is complete"""
+        return self.state.is_complete
@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+from typing import Dict, Optional
+
+import numpy as np
+
+from game.domain.poker.hand_evaluator import (
+    FLUSH_TABLE,
+    RANK_KEYS,
+    RANK_TABLE,
+    SUIT_BITS,
+)
+from game.domain.poker.value_objects import PokerGameState
+
+# NumPy copies of the evaluator tables. The rank table is stored as sorted
+# key/value arrays so a whole batch of keys resolves with one searchsorted.
+_RANK_KEYS = np.array(RANK_KEYS, dtype=np.int64)
+_SUIT_BITS = np.array(SUIT_BITS, dtype=np.uint64)
+_TABLE_KEYS = np.array(sorted(RANK_TABLE), dtype=np.int64)
+_TABLE_VALUES = np.array([RANK_TABLE[key] for key in _TABLE_KEYS], dtype=np.int64)
+_FLUSH_TABLE = np.array(FLUSH_TABLE, dtype=np.int64)
+_LANE_MASK = np.uint64(0x1FFF)
+_LANE_SHIFTS = tuple(np.uint64(shift) for shift in (0, 16, 32, 48))
+
+
+@dataclass
+class PlayerEquity:
+    win: float
+    tie: float
+
+    @property
+    def equity(self) -> float:
+        return self.win + self.tie
+
+
+@dataclass
+class EquityResult:
+    players: Dict[str, PlayerEquity]
+    runouts: int
+    exact: bool
+
+
+class EquityService:
+    """
+    All-in equity for any number of players with a partial board.
+
+    Runouts are enumerated exactly when there are at most exact_threshold of
+    them, otherwise sampled; either way each batch of boards is scored for all
+    players with array operations rather than one evaluator call per board.
+    """
+
+    def __init__(
+        self,
+        exact_threshold: int = 20_000,
+        samples: int = 10_000,
+        batch_size: int = 65_536,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        self.exact_threshold = exact_threshold
+        self.samples = samples
+        self.batch_size = batch_size
+        self.rng = rng or np.random.default_rng()
+
+    def calculate_for_state(
+        self, state: PokerGameState, dead_cards: bytes = b""
+    ) -> EquityResult:
+        """Equity of every live player in a hand state"""
+        return self.calculate(state.player_cards, state.community_cards, dead_cards)
+
+    def calculate(
+        self,
+        player_cards: Dict[str, bytes],
+        board: bytes = b"",
+        dead_cards: bytes = b"",
+    ) -> EquityResult:
+        """Win/tie equity for each player's packed hole cards"""
+        if len(player_cards) < 2:
+            raise ValueError("Equity needs at least two players")
+        known = b"".join(player_cards.values()) + board + dead_cards
+        if len(set(known)) != len(known):
+            raise ValueError("Duplicate cards in equity request")
+        if len(board) > 5:
+            raise ValueError("Board cannot have more than five cards")
+        if any(len(cards) != 2 for cards in player_cards.values()):
+            raise ValueError("Each player needs exactly two hole cards")
+
+        player_ids = list(player_cards)
+        missing = 5 - len(board)
+        dead = set(known)
+        remaining = np.array(
+            [card for card in range(52) if card not in dead], dtype=np.int64
+        )
+        hole = np.array([list(cards) for cards in player_cards.values()], dtype=np.int64)
+        board_cards = np.frombuffer(board, dtype=np.uint8).astype(np.int64)
+        base_keys = _RANK_KEYS[hole].sum(axis=1) + _RANK_KEYS[board_cards].sum()
+        base_bits = _SUIT_BITS[hole].sum(axis=1) + _SUIT_BITS[board_cards].sum()
+
+        wins = np.zeros(len(player_ids))
+        ties = np.zeros(len(player_ids))
+        total = comb(len(remaining), missing)
+        exact = total <= self.exact_threshold
+        if missing == 0:
+            runouts = np.zeros((1, 0), dtype=np.int64)
+            self._score(runouts, base_keys, base_bits, wins, ties)
+        elif exact:
+            combos = np.fromiter(
+                combinations(range(len(remaining)), missing),
+                dtype=np.dtype((np.int64, missing)),
+                count=total,
+            )
+            for start in range(0, total, self.batch_size):
+                runouts = remaining[combos[start : start + self.batch_size]]
+                self._score(runouts, base_keys, base_bits, wins, ties)
+        else:
+            total = self.samples
+            for start in range(0, total, self.batch_size):
+                count = min(self.batch_size, total - start)
+                picks = np.argpartition(
+                    self.rng.random((count, len(remaining))), missing, axis=1
+                )[:, :missing]
+                self._score(remaining[picks], base_keys, base_bits, wins, ties)
+
+        return EquityResult(
+            players={
+                player_id: PlayerEquity(
+                    win=float(wins[i] / total), tie=float(ties[i] / total)
+                )
+                for i, player_id in enumerate(player_ids)
+            },
+            runouts=total,
+            exact=exact,
+        )
+
+    @staticmethod
+    def _score(
+        runouts: np.ndarray,
+        base_keys: np.ndarray,
+        base_bits: np.ndarray,
+        wins: np.ndarray,
+        ties: np.ndarray,
+    ) -> None:
+        # (players, boards) matrices of rank keys and suit masks
+        keys = base_keys[:, None] + _RANK_KEYS[runouts].sum(axis=1)[None, :]
+        bits = base_bits[:, None] + _SUIT_BITS[runouts].sum(axis=1)[None, :]
+
+        values = _TABLE_VALUES[np.searchsorted(_TABLE_KEYS, keys)]
+        for shift in _LANE_SHIFTS:
+            np.maximum(values, _FLUSH_TABLE[(bits >> shift) & _LANE_MASK], out=values)
+
+        is_best = values == values.max(axis=0)
+        winners = is_best.sum(axis=0)
+        wins += (is_best & (winners == 1)).sum(axis=1)
+        ties += np.where(winners > 1, is_best / winners, 0.0).sum(axis=1)
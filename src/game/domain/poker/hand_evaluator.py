@@ -0,0 +1,165 @@
+from itertools import combinations_with_replacement
+from typing import Dict, List, Sequence
+
+from game.domain.poker.enums import HandCategory
+
+# Cards are scored as packed Card indices 0-51 (see game.domain.value_objects).
+# A hand value is a single int where a higher value always wins: category << 20
+# followed by up to five 4-bit tie-break ranks.
+
+_CATEGORY_SHIFT = 20
+_WHEEL = (1 << 12) | 0b1111
+
+
+def hand_category(value: int) -> HandCategory:
+    """Return the category of an evaluated hand value"""
+    return HandCategory(value >> _CATEGORY_SHIFT)
+
+
+def _pack(category: HandCategory, ranks: Sequence[int]) -> int:
+    value = category
+    for i in range(5):
+        value = (value << 4) | (ranks[i] if i < len(ranks) else 0)
+    return value
+
+
+def _straight_high(mask: int) -> int:
+    """Return the high rank of the best straight in a rank mask, or -1"""
+    for high in range(12, 3, -1):
+        run = 0b11111 << (high - 4)
+        if mask & run == run:
+            return high
+    if mask & _WHEEL == _WHEEL:
+        return 3
+    return -1
+
+
+def _flush_value(mask: int) -> int:
+    high = _straight_high(mask)
+    if high >= 0:
+        return _pack(HandCategory.STRAIGHT_FLUSH, (high,))
+    ranks = [r for r in range(12, -1, -1) if mask >> r & 1]
+    return _pack(HandCategory.FLUSH, ranks[:5])
+
+
+def _rank_pattern_value(counts: List[int]) -> int:
+    """Score the best non-flush five card hand for a multiset of ranks"""
+    by_count: Dict[int, List[int]] = {1: [], 2: [], 3: [], 4: []}
+    mask = 0
+    for rank in range(12, -1, -1):
+        if counts[rank]:
+            by_count[counts[rank]].append(rank)
+            mask |= 1 << rank
+    present = [r for r in range(12, -1, -1) if counts[r]]
+
+    if by_count[4]:
+        quad = by_count[4][0]
+        return _pack(
+            HandCategory.FOUR_OF_A_KIND, (quad, next(r for r in present if r != quad))
+        )
+    if by_count[3]:
+        trips = by_count[3][0]
+        pairs = sorted(by_count[3][1:] + by_count[2], reverse=True)
+        if pairs:
+            return _pack(HandCategory.FULL_HOUSE, (trips, pairs[0]))
+    high = _straight_high(mask)
+    if high >= 0:
+        return _pack(HandCategory.STRAIGHT, (high,))
+    if by_count[3]:
+        trips = by_count[3][0]
+        return _pack(
+            HandCategory.THREE_OF_A_KIND,
+            [trips] + [r for r in present if r != trips][:2],
+        )
+    if len(by_count[2]) >= 2:
+        high_pair, low_pair = by_count[2][:2]
+        kicker = next(r for r in present if r not in (high_pair, low_pair))
+        return _pack(HandCategory.TWO_PAIR, (high_pair, low_pair, kicker))
+    if by_count[2]:
+        pair = by_count[2][0]
+        return _pack(
+            HandCategory.PAIR, [pair] + [r for r in present if r != pair][:3]
+        )
+    return _pack(HandCategory.HIGH_CARD, present[:5])
+
+
+def _build_rank_table() -> Dict[int, int]:
+    table = {}
+    for size in (5, 6, 7):
+        for ranks in combinations_with_replacement(range(13), size):
+            counts = [0] * 13
+            for rank in ranks:
+                counts[rank] += 1
+            if max(counts) > 4:
+                continue
+            table[sum(RANK_KEYS[rank * 4] for rank in ranks)] = _rank_pattern_value(
+                counts
+            )
+    return table
+
+
+def _build_flush_table() -> List[int]:
+    return [
+        _flush_value(mask) if bin(mask).count("1") >= 5 else 0
+        for mask in range(1 << 13)
+    ]
+
+
+# Per-card contributions. Rank keys are base-5 digits so the sum of up to seven
+# cards uniquely identifies the rank multiset; suit bits place each card's rank
+# in a 16-bit lane per suit so a flush can be read straight out of the mask.
+RANK_KEYS = [5 ** (card >> 2) for card in range(52)]
+SUIT_BITS = [1 << ((card & 3) * 16 + (card >> 2)) for card in range(52)]
+
+RANK_TABLE = _build_rank_table()
+FLUSH_TABLE = _build_flush_table()
+
+
+def evaluate(cards: Sequence[int]) -> int:
+    """Score a 5, 6 or 7 card hand; higher values are stronger hands"""
+    key = 0
+    bits = 0
+    for card in cards:
+        key += RANK_KEYS[card]
+        bits |= SUIT_BITS[card]
+    return _best(RANK_TABLE[key], bits)
+
+
+def evaluate_batch(board: Sequence[int], hands: Sequence[Sequence[int]]) -> List[int]:
+    """Score every hand against a shared board in one call"""
+    board_key = 0
+    board_bits = 0
+    for card in board:
+        board_key += RANK_KEYS[card]
+        board_bits |= SUIT_BITS[card]
+
+    rank_key = RANK_KEYS
+    suit_bits = SUIT_BITS
+    rank_table = RANK_TABLE
+    values = []
+    for hand in hands:
+        key = board_key
+        bits = board_bits
+        for card in hand:
+            key += rank_key[card]
+            bits |= suit_bits[card]
+        values.append(_best(rank_table[key], bits))
+    return values
+
+
+def _best(value: int, bits: int) -> int:
+    # With seven cards or fewer a flush rules out quads and full houses, so the
+    # stronger of the flush and rank-pattern scores is always the hand value.
+    flush = FLUSH_TABLE[bits & 0x1FFF]
+    if flush > value:
+        value = flush
+    flush = FLUSH_TABLE[(bits >> 16) & 0x1FFF]
+    if flush > value:
+        value = flush
+    flush = FLUSH_TABLE[(bits >> 32) & 0x1FFF]
+    if flush > value:
+        value = flush
+    flush = FLUSH_TABLE[bits >> 48]
+    if flush > value:
+        value = flush
+    return value
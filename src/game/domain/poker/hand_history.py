@@ -0,0 +1,238 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from game.domain.poker.enums import Action, BettingRound
+from game.domain.poker.value_objects import ActionLogEntry, PlayerAction, PokerGameState
+
+# Action codes in the binary log; the index is the stored value
+_ACTIONS = (Action.FOLD, Action.CHECK, Action.CALL, Action.BET, Action.RAISE)
+_ACTION_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+_FORMAT_VERSION = 1
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass
+class PlayerHandInfo:
+    player_id: str
+    seat: int
+    starting_stack: int
+    hole_cards: bytes
+
+
+@dataclass
+class CompletedHand:
+    """Persisted after hand completion"""
+
+    hand_id: str
+    table_id: str
+    players: List[PlayerHandInfo]
+    all_actions: bytes  # varint encoded action log, see encode_actions
+    community_cards: bytes
+    winners: List[str]
+    pot_distribution: Dict[str, int]
+    rake: int
+    shuffle_seed: str
+    completed_at: datetime
+    button: int = 0
+    small_blind: int = 0
+    big_blind: int = 0
+    deck: bytes = b""
+
+    @classmethod
+    def from_state(
+        cls,
+        table_id: str,
+        state: PokerGameState,
+        pot_distribution: Dict[str, int],
+        shuffle_seed: str = "",
+        rake: int = 0,
+        completed_at: Optional[datetime] = None,
+    ) -> "CompletedHand":
+        first = state
+        while first.parent is not None:
+            first = first.parent
+        return cls(
+            hand_id=state.hand_id,
+            table_id=table_id,
+            players=[
+                PlayerHandInfo(
+                    player_id=player_id,
+                    seat=seat,
+                    # Blinds are already posted in the opening state
+                    starting_stack=first.stacks[seat] + first.bets[seat],
+                    hole_cards=state.cards_for_seat(seat),
+                )
+                for seat, player_id in enumerate(state.player_ids)
+            ],
+            all_actions=encode_actions(state.log),
+            community_cards=state.board,
+            winners=[
+                player_id for player_id, amount in pot_distribution.items() if amount
+            ],
+            pot_distribution=pot_distribution,
+            rake=rake,
+            shuffle_seed=shuffle_seed,
+            completed_at=completed_at or datetime.now(timezone.utc),
+            button=state.button,
+            small_blind=state.small_blind,
+            big_blind=state.big_blind,
+            deck=state.deck,
+        )
+
+    def actions(self) -> List[Tuple[int, BettingRound, PlayerAction]]:
+        return decode_actions(self.all_actions)
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """Append a non-negative int as LEB128: 7 bits per byte, high bit = more"""
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Read a varint at offset; returns (value, next offset)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _write_bytes(out: bytearray, value: bytes) -> None:
+    write_varint(out, len(value))
+    out += value
+
+
+def _read_bytes(data: bytes, offset: int) -> Tuple[bytes, int]:
+    length, offset = read_varint(data, offset)
+    return bytes(data[offset : offset + length]), offset + length
+
+
+def _write_str(out: bytearray, value: str) -> None:
+    _write_bytes(out, value.encode("utf-8"))
+
+
+def _read_str(data: bytes, offset: int) -> Tuple[str, int]:
+    value, offset = _read_bytes(data, offset)
+    return value.decode("utf-8"), offset
+
+
+def encode_actions(log: Optional[ActionLogEntry]) -> bytes:
+    """
+    Pack an action log as (seat, street << 3 | action, amount) varint triples.
+    Nearly every action fits in three or four bytes.
+    """
+    out = bytearray()
+    if log is None:
+        return bytes(out)
+    for entry in log.entries():
+        write_varint(out, entry.seat)
+        write_varint(out, entry.street << 3 | _ACTION_CODES[entry.action.action])
+        write_varint(out, entry.action.amount)
+    return bytes(out)
+
+
+def decode_actions(data: bytes) -> List[Tuple[int, BettingRound, PlayerAction]]:
+    actions = []
+    offset = 0
+    while offset < len(data):
+        seat, offset = read_varint(data, offset)
+        code, offset = read_varint(data, offset)
+        amount, offset = read_varint(data, offset)
+        actions.append(
+            (seat, BettingRound(code >> 3), PlayerAction(_ACTIONS[code & 7], amount))
+        )
+    return actions
+
+
+def encode_hand(hand: CompletedHand) -> bytes:
+    """Serialize a completed hand into one compact binary record"""
+    out = bytearray((_FORMAT_VERSION,))
+    _write_str(out, hand.hand_id)
+    _write_str(out, hand.table_id)
+    write_varint(out, (hand.completed_at - _EPOCH) // _MICROSECOND)
+    write_varint(out, hand.button)
+    write_varint(out, hand.small_blind)
+    write_varint(out, hand.big_blind)
+    write_varint(out, hand.rake)
+    _write_str(out, hand.shuffle_seed)
+    _write_bytes(out, hand.deck)
+    _write_bytes(out, hand.community_cards)
+    write_varint(out, len(hand.players))
+    for player in hand.players:
+        _write_str(out, player.player_id)
+        write_varint(out, player.seat)
+        write_varint(out, player.starting_stack)
+        _write_bytes(out, player.hole_cards)
+    write_varint(out, len(hand.pot_distribution))
+    for player_id, amount in hand.pot_distribution.items():
+        _write_str(out, player_id)
+        write_varint(out, amount)
+    write_varint(out, len(hand.winners))
+    for player_id in hand.winners:
+        _write_str(out, player_id)
+    _write_bytes(out, hand.all_actions)
+    return bytes(out)
+
+
+def decode_hand(data: bytes) -> CompletedHand:
+    if data[0] != _FORMAT_VERSION:
+        raise ValueError(f"Unknown hand record format {data[0]}")
+    offset = 1
+    hand_id, offset = _read_str(data, offset)
+    table_id, offset = _read_str(data, offset)
+    micros, offset = read_varint(data, offset)
+    button, offset = read_varint(data, offset)
+    small_blind, offset = read_varint(data, offset)
+    big_blind, offset = read_varint(data, offset)
+    rake, offset = read_varint(data, offset)
+    shuffle_seed, offset = _read_str(data, offset)
+    deck, offset = _read_bytes(data, offset)
+    community_cards, offset = _read_bytes(data, offset)
+
+    count, offset = read_varint(data, offset)
+    players = []
+    for _ in range(count):
+        player_id, offset = _read_str(data, offset)
+        seat, offset = read_varint(data, offset)
+        starting_stack, offset = read_varint(data, offset)
+        hole_cards, offset = _read_bytes(data, offset)
+        players.append(PlayerHandInfo(player_id, seat, starting_stack, hole_cards))
+
+    count, offset = read_varint(data, offset)
+    pot_distribution = {}
+    for _ in range(count):
+        player_id, offset = _read_str(data, offset)
+        pot_distribution[player_id], offset = read_varint(data, offset)
+
+    count, offset = read_varint(data, offset)
+    winners = []
+    for _ in range(count):
+        player_id, offset = _read_str(data, offset)
+        winners.append(player_id)
+
+    all_actions, offset = _read_bytes(data, offset)
+    return CompletedHand(
+        hand_id=hand_id,
+        table_id=table_id,
+        players=players,
+        all_actions=all_actions,
+        community_cards=community_cards,
+        winners=winners,
+        pot_distribution=pot_distribution,
+        rake=rake,
+        shuffle_seed=shuffle_seed,
+        completed_at=_EPOCH + micros * _MICROSECOND,
+        button=button,
+        small_blind=small_blind,
+        big_blind=big_blind,
+        deck=deck,
+    )
@@ -1,6 +1,309 @@
-from game.domain.poker.domain.enums import Suit, Rank
-from game.domain.value_objects import GameState
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from game.domain.interfaces import GameState
+from game.domain.poker.enums import Action, BettingRound
+from game.domain.value_objects import GameAction, cards_to_wire
+
+
+class PlayerAction(GameAction):
+    """A player's move; amount is the street total to bet or raise to"""
+
+    __slots__ = ("action", "amount")
+
+    def __init__(self, action: Action, amount: int = 0):
+        self.action = action
+        self.amount = amount
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, PlayerAction)
+            and self.action is other.action
+            and self.amount == other.amount
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.action, self.amount))
+
+    def __repr__(self) -> str:
+        return f"PlayerAction({self.action.value}, {self.amount})"
+
+
+class ActionLogEntry:
+    """
+    Node of the append-only action log. Each entry points at the one before
+    it, so appending is O(1) and every older log remains a valid prefix.
+    """
+
+    __slots__ = ("seat", "action", "street", "previous", "length")
+
+    def __init__(
+        self,
+        seat: int,
+        action: PlayerAction,
+        street: BettingRound,
+        previous: Optional["ActionLogEntry"],
+    ):
+        self.seat = seat
+        self.action = action
+        self.street = street
+        self.previous = previous
+        self.length = 1 if previous is None else previous.length + 1
+
+    def __iter__(self) -> Iterator["ActionLogEntry"]:
+        """Iterate from the first action to this one"""
+        return iter(self.entries())
+
+    def entries(self) -> List["ActionLogEntry"]:
+        entries = []
+        entry = self
+        while entry is not None:
+            entries.append(entry)
+            entry = entry.previous
+        entries.reverse()
+        return entries
+
+
+class Pot:
+    """
+    Chips collected from finished streets. eligible is the bitmask of seats
+    that put in enough to win it; seats that fold later drop out at showdown.
+    """
+
+    __slots__ = ("amount", "eligible")
+
+    def __init__(self, amount: int, eligible: int):
+        self.amount = amount
+        self.eligible = eligible
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Pot)
+            and self.amount == other.amount
+            and self.eligible == other.eligible
+        )
+
+    def __repr__(self) -> str:
+        return f"Pot({self.amount}, {self.eligible:#b})"
+
+
+class RakeRule:
+    """
+    The house's cut of a hand: rate in basis points of the pot, at most cap
+    chips (0 for no cap), and nothing from hands that end before the flop
+    """
+
+    __slots__ = ("rate", "cap")
+
+    def __init__(self, rate: int = 0, cap: int = 0):
+        if not 0 <= rate <= 10_000:
+            raise ValueError("Rake rate must be 0 to 10000 basis points")
+        if cap < 0:
+            raise ValueError("Rake cap must not be negative")
+        self.rate = rate
+        self.cap = cap
+
+    def amount_for(self, state: "PokerGameState") -> int:
+        if not state.board:
+            return 0
+        rake = state.pot * self.rate // 10_000
+        return min(rake, self.cap) if self.cap else rake
+
+
+class LegalActions:
+    """
+    What the seat on the clock may do, worked out once per transition. call
+    is what a call puts in, 0 when the seat can check instead. raise_kind is
+    BET or RAISE, or None when the seat may not raise, and a bet or raise
+    must go to a street total from min_to to max_to.
+    """
+
+    __slots__ = ("seat", "call", "raise_kind", "min_to", "max_to", "_wire")
+
+    def __init__(
+        self,
+        seat: int,
+        call: int,
+        raise_kind: Optional[Action],
+        min_to: int,
+        max_to: int,
+    ):
+        self.seat = seat
+        self.call = call
+        self.raise_kind = raise_kind
+        self.min_to = min_to
+        self.max_to = max_to
+        self._wire: Optional[List[dict]] = None
+
+    def allows(self, action: PlayerAction) -> bool:
+        kind = action.action
+        if kind is Action.FOLD:
+            return True
+        if kind is Action.CHECK:
+            return not self.call
+        if kind is Action.CALL:
+            return self.call > 0
+        return kind is self.raise_kind and self.min_to <= action.amount <= self.max_to
+
+    def to_wire(self) -> List[dict]:
+        """The actions as sent to the player; built once and shared, read only"""
+        if self._wire is None:
+            actions = [{"type": Action.FOLD.value}]
+            if self.call:
+                actions.append({"type": Action.CALL.value, "amount": self.call})
+            else:
+                actions.append({"type": Action.CHECK.value})
+            if self.raise_kind is not None:
+                actions.append(
+                    {
+                        "type": self.raise_kind.value,
+                        "min": self.min_to,
+                        "max": self.max_to,
+                    }
+                )
+            self._wire = actions
+        return self._wire
 
 
 class PokerGameState(GameState):
-    pass
+    """
+    Immutable snapshot of a hand. Transitions build a new state that shares
+    everything that did not change (deck, hole cards, action log prefix) with
+    the previous one, which stays valid and is kept as parent for undo and
+    audit. Per-seat values are tuples indexed by position in player_ids and
+    per-seat flags are bitmasks.
+    """
+
+    __slots__ = (
+        "hand_id",
+        "player_ids",
+        "button",
+        "small_blind",
+        "big_blind",
+        "deck",
+        "deck_position",
+        "hole_cards",
+        "board",
+        "street",
+        "stacks",
+        "bets",
+        "pot",
+        "pots",
+        "folded",
+        "all_in",
+        "acted",
+        "action_on",
+        "current_bet",
+        "min_raise",
+        "legal_actions",
+        "log",
+        "version",
+        "parent",
+    )
+
+    hand_id: str
+    player_ids: Tuple[str, ...]
+    button: int
+    small_blind: int
+    big_blind: int
+    deck: bytes
+    deck_position: int  # next undealt card in deck
+    hole_cards: bytes  # two packed cards per seat
+    board: bytes
+    street: BettingRound
+    stacks: Tuple[int, ...]  # chips behind
+    bets: Tuple[int, ...]  # chips committed on the current street
+    pot: int  # chips collected from finished streets
+    pots: Tuple[Pot, ...]  # the same chips as main pot then side pots
+    folded: int
+    all_in: int
+    acted: int  # seats that acted since the street began or was last raised
+    action_on: int  # seat to act, -1 once betting is over
+    current_bet: int
+    min_raise: int
+    legal_actions: Optional[LegalActions]  # of the seat on the clock, if any
+    log: Optional[ActionLogEntry]
+    version: int
+    parent: Optional["PokerGameState"]
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    def evolve(self, **changes) -> "PokerGameState":
+        """Return a new version with the given fields replaced"""
+        state = object.__new__(PokerGameState)
+        for name in self.__slots__:
+            setattr(state, name, changes[name] if name in changes else getattr(self, name))
+        state.version = self.version + 1
+        state.parent = self
+        return state
+
+    @property
+    def is_complete(self) -> bool:
+        return self.street is BettingRound.SHOWDOWN
+
+    def seat_of(self, player_id: str) -> int:
+        try:
+            return self.player_ids.index(player_id)
+        except ValueError:
+            return -1
+
+    def cards_for_seat(self, seat: int) -> bytes:
+        return self.hole_cards[2 * seat : 2 * seat + 2]
+
+    def live_seats(self) -> List[int]:
+        return [
+            seat for seat in range(len(self.player_ids)) if not self.folded >> seat & 1
+        ]
+
+    @property
+    def player_cards(self) -> Dict[str, bytes]:
+        """Hole cards of players still in the hand"""
+        return {
+            self.player_ids[seat]: self.cards_for_seat(seat)
+            for seat in self.live_seats()
+        }
+
+    @property
+    def community_cards(self) -> bytes:
+        return self.board
+
+    def available_actions(self, seat: int) -> List[dict]:
+        """Actions open to a seat, with call and raise bounds"""
+        legal = self.legal_actions
+        if legal is None or seat != legal.seat:
+            return []
+        return legal.to_wire()
+
+    def public_view(self) -> dict:
+        return {
+            "hand_id": self.hand_id,
+            "street": self.street.name.lower(),
+            "board": cards_to_wire(self.board),
+            "pot": self.pot,
+            "pots": [pot.amount for pot in self.pots],
+            "button": self.button,
+            "action_on": (
+                self.player_ids[self.action_on] if self.action_on >= 0 else None
+            ),
+            "current_bet": self.current_bet,
+            "seats": [
+                {
+                    "player_id": player_id,
+                    "stack": self.stacks[seat],
+                    "bet": self.bets[seat],
+                    "folded": bool(self.folded >> seat & 1),
+                    "all_in": bool(self.all_in >> seat & 1),
+                }
+                for seat, player_id in enumerate(self.player_ids)
+            ],
+        }
+
+    def private_view(self, player_id: str) -> dict:
+        seat = self.seat_of(player_id)
+        if seat < 0:
+            return {"my_cards": None, "available_actions": []}
+        return {
+            "my_cards": cards_to_wire(self.cards_for_seat(seat)),
+            "available_actions": self.available_actions(seat),
+        }
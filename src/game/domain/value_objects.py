@@ -1,4 +1,5 @@
 from abc import ABC
+from typing import Iterable, List
 
 from game.domain.enums import Suit, Rank
 
@@ -7,6 +8,92 @@ class GameAction(ABC):
     pass
 
 
-class Card:
-    rank: Rank
-    suit: Suit
+RANKS = (
+    Rank.TWO,
+    Rank.THREE,
+    Rank.FOUR,
+    Rank.FIVE,
+    Rank.SIX,
+    Rank.SEVEN,
+    Rank.EIGHT,
+    Rank.NINE,
+    Rank.TEN,
+    Rank.JACK,
+    Rank.QUEEN,
+    Rank.KING,
+    Rank.ACE,
+)
+SUITS = (Suit.HEARTS, Suit.DIAMONDS, Suit.CLUBS, Suit.SPADES)
+
+
+class Card(int):
+    """
+    A playing card packed into a single int: rank index * 4 + suit index.
+
+    Rank index 0 is TWO and 12 is ACE, so decks, hole cards and boards can be
+    stored as bytes and 52-bit masks. The 52 instances are interned in CARDS.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, rank: Rank, suit: Suit) -> "Card":
+        return CARDS[_RANK_INDEX[rank] * 4 + _SUIT_INDEX[suit]]
+
+    @classmethod
+    def from_wire(cls, value: str) -> "Card":
+        """Parse the wire format, e.g. "AH" or "10S" """
+        try:
+            return _WIRE_TO_CARD[value]
+        except KeyError:
+            raise ValueError(f"Invalid card {value!r}")
+
+    @property
+    def rank(self) -> Rank:
+        return RANKS[self >> 2]
+
+    @property
+    def suit(self) -> Suit:
+        return SUITS[self & 3]
+
+    def to_wire(self) -> str:
+        return _CARD_TO_WIRE[self]
+
+    def __str__(self) -> str:
+        return _CARD_TO_WIRE[self]
+
+    def __repr__(self) -> str:
+        return f"Card({_CARD_TO_WIRE[self]})"
+
+
+_RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+_SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
+CARDS = tuple(int.__new__(Card, index) for index in range(52))
+_CARD_TO_WIRE = tuple(
+    RANKS[index >> 2].value + SUITS[index & 3].value for index in range(52)
+)
+_WIRE_TO_CARD = {wire: CARDS[index] for index, wire in enumerate(_CARD_TO_WIRE)}
+
+
+def cards_to_wire(cards: Iterable[int]) -> List[str]:
+    """Encode packed cards (bytes, ints or Cards) as wire strings"""
+    return [_CARD_TO_WIRE[card] for card in cards]
+
+
+def cards_from_wire(values: Iterable[str]) -> bytes:
+    """Decode wire strings into a packed byte string of card indices"""
+    return bytes(Card.from_wire(value) for value in values)
+
+
+def cards_to_mask(cards: Iterable[int]) -> int:
+    """Pack cards into a 52-bit mask"""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+
+def mask_to_cards(mask: int) -> List[Card]:
+    """Unpack a 52-bit mask into cards in index order"""
+    return [CARDS[index] for index in range(52) if mask >> index & 1]
@@ -0,0 +1,32 @@
+from typing import Dict, Tuple
+
+from game.domain.poker.engine import shuffle_deck
+from game.infrastructure.entropy_pool import EntropyPool
+
+_SEED_BYTES = 32
+
+
+class DeckService:
+    """
+    Seeds and shuffles the deck of every hand from the prefetched entropy
+    pool, so dealing never waits on the randomness provider. Seeds are kept
+    per hand until the hand is persisted with its seed for audit.
+    """
+
+    def __init__(self, entropy: EntropyPool):
+        self.entropy = entropy
+        self.hand_seeds: Dict[str, str] = {}  # hand_id -> seed, until persisted
+
+    def generate_seed(self) -> str:
+        """Draw a fresh shuffle seed from the prefetched entropy pool"""
+        return self.entropy.take(_SEED_BYTES).hex()
+
+    def deal_deck_for_hand(self, hand_id: str) -> Tuple[str, bytes]:
+        """Seed, record and shuffle the deck for a new hand"""
+        seed = self.generate_seed()
+        self.hand_seeds[hand_id] = seed
+        return seed, shuffle_deck(seed)
+
+    def release_seed(self, hand_id: str) -> str:
+        """Hand the recorded seed over once the hand is being persisted"""
+        return self.hand_seeds.pop(hand_id, "")
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from game.infrastructure.randomness_provider import IRandomnessProvider
+
+
+class EntropyPoolExhaustedError(Exception):
+    pass
+
+
+@dataclass
+class EntropyPoolMetrics:
+    refills: int = 0
+    bytes_fetched: int = 0
+    bytes_served: int = 0
+    stalls: int = 0  # takes that found the pool short
+    stall_seconds: float = 0.0
+    last_refill_seconds: float = 0.0
+    refill_errors: int = 0
+
+
+class EntropyPool:
+    """
+    Prefetches random bytes from a provider so callers can draw entropy
+    synchronously. A background task tops the pool back up to pool_size in
+    block_size requests whenever it drops below low_water.
+    """
+
+    def __init__(
+        self,
+        provider: IRandomnessProvider,
+        pool_size: int = 1 << 16,
+        low_water: int = 1 << 14,
+        block_size: int = 1 << 14,
+    ):
+        if not 0 <= low_water < pool_size:
+            raise ValueError("low_water must be smaller than pool_size")
+        self.provider = provider
+        self.pool_size = pool_size
+        self.low_water = low_water
+        self.block_size = block_size
+        self.metrics = EntropyPoolMetrics()
+        self._buffer = bytearray()
+        self._offset = 0
+        self._refill_needed = asyncio.Event()
+        self._refilled = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> int:
+        return len(self._buffer) - self._offset
+
+    async def start(self) -> None:
+        """Fill the pool and start the background refill task"""
+        await self._refill()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def take(self, n: int) -> bytes:
+        """Draw n bytes without awaiting; raises if the pool is short"""
+        if n > self.pool_size:
+            raise ValueError(f"Can't take {n} bytes from a {self.pool_size} byte pool")
+        if self.available < n:
+            self.metrics.stalls += 1
+            self._refill_needed.set()
+            raise EntropyPoolExhaustedError(
+                f"Entropy pool has {self.available} bytes, {n} requested"
+            )
+        return self._draw(n)
+
+    async def take_async(self, n: int) -> bytes:
+        """
+        Draw n bytes, waiting for a refill if the pool is short; more than
+        pool_size bytes are drawn a pool at a time
+        """
+        if n > self.pool_size:
+            chunks = []
+            while n > 0:
+                chunk = min(n, self.pool_size)
+                chunks.append(await self.take_async(chunk))
+                n -= chunk
+            return b"".join(chunks)
+        if self.available >= n:
+            return self._draw(n)
+        self.metrics.stalls += 1
+        started = time.perf_counter()
+        while self.available < n:
+            self._refilled.clear()
+            self._refill_needed.set()
+            await self._refilled.wait()
+        self.metrics.stall_seconds += time.perf_counter() - started
+        return self._draw(n)
+
+    def _draw(self, n: int) -> bytes:
+        start = self._offset
+        self._offset += n
+        self.metrics.bytes_served += n
+        if self.available < self.low_water:
+            self._refill_needed.set()
+        return bytes(self._buffer[start : self._offset])
+
+    async def _run(self) -> None:
+        while True:
+            await self._refill_needed.wait()
+            self._refill_needed.clear()
+            try:
+                await self._refill()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.metrics.refill_errors += 1
+                await asyncio.sleep(1)
+                self._refill_needed.set()
+
+    async def _refill(self) -> None:
+        if self.available >= self.pool_size:
+            return
+        started = time.perf_counter()
+        while self.available < self.pool_size:
+            block = await self.provider.get_random_bytes(
+                min(self.block_size, self.pool_size - self.available)
+            )
+            # Drop consumed bytes so the buffer never grows past pool_size
+            del self._buffer[: self._offset]
+            self._offset = 0
+            self._buffer += block
+            self.metrics.bytes_fetched += len(block)
+            self._refilled.set()
+        self.metrics.refills += 1
+        self.metrics.last_refill_seconds = time.perf_counter() - started
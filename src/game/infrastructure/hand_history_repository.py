@@ -0,0 +1,156 @@
+import asyncio
+import sqlite3
+import threading
+from typing import AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import text
+
+from game.application.interfaces import IHandHistoryRepository
+from game.domain.poker.hand_history import CompletedHand, decode_hand, encode_hand
+from shared.metrics import REPOSITORY_SECONDS, timed
+
+
+class SQLiteHandHistoryRepository(IHandHistoryRepository):
+    """
+    Stand-in for the Postgres repository in tests and single-host setups.
+    Hands are stored as encoded blobs; each batch is one transaction.
+    """
+
+    def __init__(self, file_path: str = "hand_history.db"):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS hand_history ("
+                " hand_id TEXT PRIMARY KEY,"
+                " table_id TEXT NOT NULL,"
+                " completed_at TEXT NOT NULL,"
+                " record BLOB NOT NULL)"
+            )
+
+    async def save_completed_hand(self, hand: CompletedHand) -> None:
+        await self.save_completed_hands([hand])
+
+    @timed(REPOSITORY_SECONDS, "sqlite_hand_history", "save_completed_hands")
+    async def save_completed_hands(self, hands: Sequence[CompletedHand]) -> None:
+        rows = [
+            (hand.hand_id, hand.table_id, hand.completed_at.isoformat(), encode_hand(hand))
+            for hand in hands
+        ]
+        await asyncio.to_thread(self._insert, rows)
+
+    @timed(REPOSITORY_SECONDS, "sqlite_hand_history", "get_completed_hand")
+    async def get_completed_hand(self, hand_id: str) -> Optional[CompletedHand]:
+        row = await asyncio.to_thread(self._select, hand_id)
+        return None if row is None else decode_hand(row[0])
+
+    async def iter_record_batches(
+        self, batch_size: int = 1000, after_hand_id: Optional[str] = None
+    ) -> AsyncIterator[List[bytes]]:
+        after = after_hand_id or ""
+        while True:
+            rows = await asyncio.to_thread(self._select_after, after, batch_size)
+            if not rows:
+                return
+            yield [row[1] for row in rows]
+            after = rows[-1][0]
+
+    def _select_after(self, after: str, limit: int):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT hand_id, record FROM hand_history"
+                " WHERE hand_id > ? ORDER BY hand_id LIMIT ?",
+                (after, limit),
+            ).fetchall()
+
+    def _insert(self, rows) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO hand_history VALUES (?, ?, ?, ?)", rows
+            )
+
+    def _select(self, hand_id: str):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT record FROM hand_history WHERE hand_id = ?", (hand_id,)
+            ).fetchone()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class PostgresHandHistoryRepository(IHandHistoryRepository):
+    """
+    Hands are stored as encoded bytea records rather than JSONB rows; a batch
+    is a single multi-row insert.
+    """
+
+    CREATE_TABLE = """
+        CREATE TABLE IF NOT EXISTS hand_history (
+            hand_id TEXT PRIMARY KEY,
+            table_id TEXT NOT NULL,
+            completed_at TIMESTAMPTZ NOT NULL,
+            record BYTEA NOT NULL
+        )
+    """
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def save_completed_hand(self, hand: CompletedHand) -> None:
+        await self.save_completed_hands([hand])
+
+    @timed(REPOSITORY_SECONDS, "postgres_hand_history", "save_completed_hands")
+    async def save_completed_hands(self, hands: Sequence[CompletedHand]) -> None:
+        rows = [
+            {
+                "hand_id": hand.hand_id,
+                "table_id": hand.table_id,
+                "completed_at": hand.completed_at,
+                "record": encode_hand(hand),
+            }
+            for hand in hands
+        ]
+        async with self.session_factory() as session:
+            await session.execute(
+                text(
+                    "INSERT INTO hand_history (hand_id, table_id, completed_at, record)"
+                    " VALUES (:hand_id, :table_id, :completed_at, :record)"
+                    " ON CONFLICT (hand_id) DO NOTHING"
+                ),
+                rows,
+            )
+            await session.commit()
+
+    @timed(REPOSITORY_SECONDS, "postgres_hand_history", "get_completed_hand")
+    async def get_completed_hand(self, hand_id: str) -> Optional[CompletedHand]:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                text("SELECT record FROM hand_history WHERE hand_id = :hand_id"),
+                {"hand_id": hand_id},
+            )
+            row = result.first()
+        return None if row is None else decode_hand(bytes(row[0]))
+
+    async def iter_record_batches(
+        self, batch_size: int = 1000, after_hand_id: Optional[str] = None
+    ) -> AsyncIterator[List[bytes]]:
+        # Keyset pagination on the primary key, so every page is an index seek
+        after = after_hand_id or ""
+        while True:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    text(
+                        "SELECT hand_id, record FROM hand_history"
+                        " WHERE hand_id > :after ORDER BY hand_id LIMIT :limit"
+                    ),
+                    {"after": after, "limit": batch_size},
+                )
+                rows = result.all()
+            if not rows:
+                return
+            yield [bytes(row[1]) for row in rows]
+            after = rows[-1][0]
@@ -1,3 +1,5 @@
+import asyncio
+import os
 from abc import ABC
 
 
@@ -9,9 +11,28 @@ class IRandomnessProvider(ABC):
 
 class LocalRandomnessProvider(IRandomnessProvider):
     async def get_random_bytes(self, n: int) -> bytes:
-        pass
+        return os.urandom(n)
 
 
 class RandomDotOrgProvider(IRandomnessProvider):
     async def get_random_bytes(self, n: int) -> bytes:
         pass
+
+
+class SimulatedRemoteRandomnessProvider(IRandomnessProvider):
+    """
+    Local stand-in for a remote provider such as random.org: every request
+    pays a simulated network round trip before returning os.urandom bytes.
+    """
+
+    def __init__(self, latency_seconds: float = 0.2, max_bytes: int = 1 << 16):
+        self.latency_seconds = latency_seconds
+        self.max_bytes = max_bytes
+        self.requests = 0
+
+    async def get_random_bytes(self, n: int) -> bytes:
+        if n > self.max_bytes:
+            raise ValueError(f"Cannot request more than {self.max_bytes} bytes")
+        self.requests += 1
+        await asyncio.sleep(self.latency_seconds)
+        return os.urandom(n)
@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import secrets
+
+from game.application.self_play import BOTS
+from loadtest.client import LoadConfig, LoadStats
+from loadtest.runner import format_report, local_server, run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Ramp simulated players against the API and report latencies"
+    )
+    parser.add_argument("--url", default=None, help="server to test")
+    parser.add_argument(
+        "--port", type=int, default=8765, help="port for the local server"
+    )
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--players-per-table", type=int, default=6)
+    parser.add_argument("--ramp", type=float, default=60.0, help="seconds")
+    parser.add_argument("--duration", type=float, default=120.0, help="seconds")
+    parser.add_argument("--think", default="0.5-3.0", help="seconds, min-max")
+    parser.add_argument("--stakes", default="50/100")
+    parser.add_argument("--buy-in", type=int, default=10_000)
+    parser.add_argument(
+        "--bots", default="random", help=f"comma separated mix of {', '.join(BOTS)}"
+    )
+    parser.add_argument(
+        "--no-auth",
+        action="store_true",
+        help="skip register and login, whose bcrypt cost dominates a ramp",
+    )
+    parser.add_argument("--max-connections", type=int, default=500)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--run-id", default=None, help="prefix for players and tables")
+    args = parser.parse_args()
+
+    low, high = (float(seconds) for seconds in args.think.split("-"))
+    bots = args.bots.split(",")
+    unknown = [bot for bot in bots if bot not in BOTS]
+    if unknown:
+        parser.error(f"unknown bots: {', '.join(unknown)}")
+    config = LoadConfig(
+        clients=args.clients,
+        players_per_table=args.players_per_table,
+        ramp_seconds=args.ramp,
+        duration=args.duration,
+        think_time=(low, high),
+        stakes=args.stakes,
+        buy_in=args.buy_in,
+        bots=bots,
+        authenticate=not args.no_auth,
+        run_id=args.run_id or f"load-{secrets.token_hex(3)}",
+    )
+
+    def progress(stats: LoadStats, elapsed: float) -> None:
+        actions = len(stats.latencies.get("action", ()))
+        print(
+            f"{elapsed:6.0f}s  {stats.seated} seated, {stats.connected} connected, "
+            f"{actions} actions, {100 * stats.error_rate():.2f}% errors",
+            flush=True,
+        )
+
+    if args.url is None:
+        with local_server(args.port) as url:
+            config.url = url
+            stats = asyncio.run(run(config, args.max_connections, progress))
+    else:
+        config.url = args.url.rstrip("/")
+        stats = asyncio.run(run(config, args.max_connections, progress))
+    print(format_report(stats))
+    raise SystemExit(1 if stats.error_rate() > args.max_error_rate else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+import websockets
+
+from game.application.self_play import BOTS, Bot
+from game.domain.poker.enums import Action
+from game.domain.poker.value_objects import PlayerAction
+
+
+@dataclass
+class LoadConfig:
+    url: str = "http://127.0.0.1:8000"
+    clients: int = 1000
+    players_per_table: int = 6
+    ramp_seconds: float = 60.0  # clients start evenly spread over this
+    duration: float = 120.0  # seconds of play once the ramp is over
+    think_time: tuple = (0.5, 3.0)  # seconds before each action, uniform
+    stakes: str = "50/100"
+    buy_in: int = 10_000
+    bots: List[str] = field(default_factory=lambda: ["random"])
+    authenticate: bool = True  # register and log in through the player API
+    password: str = "load-test-password"
+    run_id: str = "load"
+    request_timeout: float = 30.0
+    max_retries: int = 5  # per request answered with 429 or 503
+    seed: str = "load-test"
+
+    def table_id(self, client: int) -> str:
+        return f"{self.run_id}-t{client // self.players_per_table}"
+
+    @property
+    def tables(self) -> int:
+        return -(-self.clients // self.players_per_table)
+
+
+class LoadStats:
+    """
+    Latencies and outcomes per operation, e.g. "register", "join", "action",
+    shared by every client in the process
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Counter] = {}
+        self.throttled: Counter = Counter()  # 429s and 503s that were retried
+        self.connected = 0
+        self.peak_connected = 0
+        self.seated = 0
+        self.hands_dealt = 0  # summed over players
+        # Steady state: from the end of the ramp until clients are stopped
+        self.window_started: Optional[float] = None
+        self.window_seconds = 0.0
+        self.window_actions = 0
+
+    def record(self, operation: str, seconds: float) -> None:
+        self.latencies.setdefault(operation, []).append(seconds)
+        if operation == "action" and self.window_started is not None:
+            self.window_actions += 1
+
+    def error(self, operation: str, reason: str) -> None:
+        self.errors.setdefault(operation, Counter())[reason] += 1
+
+    def attempts(self, operation: str) -> int:
+        return len(self.latencies.get(operation, ())) + self.failures(operation)
+
+    def failures(self, operation: str) -> int:
+        return sum(self.errors.get(operation, Counter()).values())
+
+    def error_rate(self, operation: Optional[str] = None) -> float:
+        if operation is None:
+            operations = set(self.latencies) | set(self.errors)
+        else:
+            operations = {operation}
+        attempts = sum(self.attempts(name) for name in operations)
+        failed = sum(self.failures(name) for name in operations)
+        return failed / attempts if attempts else 0.0
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    rank = max(int(round(fraction * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"{status} {detail}")
+        self.status = status
+
+
+class PlayerClient:
+    """
+    One simulated player: registers and logs in, funds a wallet, takes a seat
+    and then plays every hand it is dealt over the table's WebSocket, waiting
+    a think time before each action, until stop is set. Then it folds when
+    next on the clock and leaves the table.
+
+    The player API doesn't return player ids, so the username doubles as the
+    player id for the wallet, the seat and the WebSocket.
+    """
+
+    def __init__(
+        self,
+        number: int,
+        config: LoadConfig,
+        http: httpx.AsyncClient,
+        stats: LoadStats,
+        stop: asyncio.Event,
+    ):
+        self.number = number
+        self.config = config
+        self.http = http
+        self.stats = stats
+        self.stop = stop
+        self.username = f"{config.run_id}-p{number}"
+        self.table_id = config.table_id(number)
+        self.rng = random.Random(f"{config.seed}:{number}")
+        self.bot: Bot = BOTS[self.rng.choice(config.bots)]()
+        self.private: dict = {}
+        self.hand_id: Optional[str] = None
+        self.leaving = False
+
+    async def run(self) -> None:
+        try:
+            if self.config.authenticate:
+                await self._request(
+                    "register",
+                    "POST",
+                    "/api/v1/player/register",
+                    json={
+                        "username": self.username,
+                        "password": self.config.password,
+                        "email": f"{self.username}@example.com",
+                    },
+                    ok=(200, 400),  # 400: registered by an earlier run
+                )
+                await self._request(
+                    "login",
+                    "POST",
+                    "/api/v1/player/login",
+                    json={"username": self.username, "password": self.config.password},
+                )
+            await self._request("wallet", "POST", f"/api/v1/wallet/{self.username}")
+            await self._request(
+                "deposit",
+                "POST",
+                f"/api/v1/wallet/{self.username}/transactions",
+                json={"amount": self.config.buy_in, "reason": "load test deposit"},
+            )
+            await self._request(
+                "join",
+                "POST",
+                f"/api/v1/table/{self.table_id}/join",
+                json={"player_id": self.username, "buy_in": self.config.buy_in},
+            )
+        except _HttpError:
+            return  # already counted
+        self.stats.seated += 1
+        play = asyncio.create_task(self._play())
+        stop = asyncio.create_task(self.stop.wait())
+        await asyncio.wait({play, stop}, return_when=asyncio.FIRST_COMPLETED)
+        stop.cancel()
+        # Keep the socket open, folding at the first chance, until the
+        # table lets go
+        self.leaving = True
+        await self._leave()
+        play.cancel()
+        self.stats.seated -= 1
+
+    async def _play(self) -> None:
+        url = self.config.url.replace("http", "ws", 1)
+        started = time.perf_counter()
+        try:
+            socket = await websockets.connect(
+                f"{url}/ws/tables/{self.table_id}?player_id={self.username}",
+                open_timeout=self.config.request_timeout,
+                max_queue=None,
+            )
+        except Exception as exc:
+            self.stats.error("connect", type(exc).__name__)
+            return
+        self.stats.record("connect", time.perf_counter() - started)
+        self.stats.connected += 1
+        self.stats.peak_connected = max(self.stats.peak_connected, self.stats.connected)
+        try:
+            async with socket:
+                while True:
+                    self._apply(json.loads(await socket.recv()))
+                    while self.private.get("available_actions"):
+                        await self._act(socket)
+        except websockets.ConnectionClosed as exc:
+            if not self.leaving:
+                code = exc.rcvd.code if exc.rcvd else "without close frame"
+                self.stats.error("socket", f"closed {code}")
+        finally:
+            self.stats.connected -= 1
+
+    async def _act(self, socket) -> None:
+        if self.leaving:
+            action = PlayerAction(Action.FOLD)
+        else:
+            low, high = self.config.think_time
+            await asyncio.sleep(self.rng.uniform(low, high))
+            action = self.bot.choose(self.private["available_actions"], self.rng)
+        started = time.perf_counter()
+        await socket.send(_action_message(action))
+        # Only the player on the clock can act, so the next message is the
+        # result of this action, or an error
+        message = json.loads(await socket.recv())
+        elapsed = time.perf_counter() - started
+        if message.get("type") == "error":
+            self.stats.error("action", message.get("message", "error")[:60])
+        else:
+            self.stats.record("action", elapsed)
+        self._apply(message)
+
+    def _apply(self, message: dict) -> None:
+        kind = message.get("type")
+        if kind == "snapshot":
+            self.private = dict(message.get("private") or {})
+        elif kind == "delta":
+            self.private.update(message.get("private") or {})
+        else:
+            return
+        hand_id = (message.get("public") or {}).get("hand_id")
+        if hand_id is not None and hand_id != self.hand_id:
+            self.hand_id = hand_id
+            self.stats.hands_dealt += 1
+
+    async def _leave(self) -> None:
+        # Players still live in a hand are told to wait until they aren't
+        for _ in range(120):
+            try:
+                await self._request(
+                    "leave",
+                    "POST",
+                    f"/api/v1/table/{self.table_id}/leave",
+                    json={"player_id": self.username},
+                    expected=(409,),
+                )
+                return
+            except _HttpError as exc:
+                if exc.status != 409:
+                    return
+            await asyncio.sleep(0.5)
+
+    async def _request(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        ok=(200, 201),
+        expected=(),
+        **kwargs,
+    ) -> httpx.Response:
+        for attempt in range(self.config.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = await self.http.request(method, path, **kwargs)
+            except httpx.HTTPError as exc:
+                self.stats.error(operation, type(exc).__name__)
+                raise _HttpError(0, str(exc))
+            elapsed = time.perf_counter() - started
+            if response.status_code in (429, 503) and attempt < self.config.max_retries:
+                self.stats.throttled[operation] += 1
+                delay = float(response.headers.get("Retry-After", 1))
+                await asyncio.sleep(delay * (1 + self.rng.random()))
+                continue
+            if response.status_code in ok:
+                self.stats.record(operation, elapsed)
+                return response
+            if response.status_code not in expected:
+                self.stats.error(operation, str(response.status_code))
+            raise _HttpError(response.status_code, response.text[:200])
+
+
+def _action_message(action: PlayerAction) -> str:
+    return json.dumps(
+        {"type": "action", "action": action.action.value, "amount": action.amount}
+    )
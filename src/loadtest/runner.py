@@ -0,0 +1,170 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+import httpx
+
+from game.application.hand_dealer import parse_stakes
+from loadtest.client import LoadConfig, LoadStats, PlayerClient, percentile
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPERATIONS = ("register", "login", "wallet", "deposit", "join", "connect", "action")
+
+
+@contextmanager
+def local_server(port: int, startup_timeout: float = 30.0) -> Iterator[str]:
+    """
+    Run the API under uvicorn in a scratch directory, so its player, wallet
+    and hand history files start empty, and yield its URL
+    """
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as workdir:
+        path = os.pathsep.join(filter(None, (SRC_DIR, os.environ.get("PYTHONPATH"))))
+        env = dict(os.environ, PYTHONPATH=path, GAME_WORKER_URL=url)
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "api.api:app",
+                "--port",
+                str(port),
+                "--log-level",
+                "warning",
+            ],
+            cwd=workdir,
+            env=env,
+        )
+        try:
+            _wait_until_healthy(url, server, startup_timeout)
+            yield url
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+
+def _wait_until_healthy(url: str, server: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with {server.returncode}")
+        try:
+            if httpx.get(f"{url}/api/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become healthy in {timeout}s")
+
+
+async def run(
+    config: LoadConfig,
+    max_connections: int = 500,
+    on_progress: Optional[Callable[[LoadStats, float], None]] = None,
+    progress_interval: float = 5.0,
+) -> LoadStats:
+    """
+    Open the tables, start config.clients players evenly over the ramp, let
+    them play for config.duration seconds and have them leave
+    """
+    stats = LoadStats()
+    stop = asyncio.Event()
+    limits = httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_connections
+    )
+    async with httpx.AsyncClient(
+        base_url=config.url, timeout=config.request_timeout, limits=limits
+    ) as http:
+        await _open_tables(config, http)
+        started = time.perf_counter()
+        clients: List[asyncio.Task] = []
+        progress = asyncio.create_task(
+            _report_progress(stats, started, on_progress, progress_interval)
+        )
+        for number in range(config.clients):
+            delay = started + number * config.ramp_seconds / config.clients
+            await asyncio.sleep(max(delay - time.perf_counter(), 0))
+            client = PlayerClient(number, config, http, stats, stop)
+            clients.append(asyncio.create_task(client.run()))
+        await asyncio.sleep(max(started + config.ramp_seconds - time.perf_counter(), 0))
+        stats.window_started = time.perf_counter()
+        await asyncio.sleep(config.duration)
+        stats.window_seconds = time.perf_counter() - stats.window_started
+        stats.window_started = None
+        stop.set()
+        await asyncio.gather(*clients, return_exceptions=True)
+        progress.cancel()
+    return stats
+
+
+async def _open_tables(config: LoadConfig, http: httpx.AsyncClient) -> None:
+    _, big_blind = parse_stakes(config.stakes)
+    for table in range(config.tables):
+        table_id = config.table_id(table * config.players_per_table)
+        response = await http.post(
+            "/api/v1/table",
+            json={
+                "table_id": table_id,
+                "name": f"Load test {table}",
+                "stakes": config.stakes,
+                "max_seats": config.players_per_table,
+                "min_buy_in": big_blind,
+                "max_buy_in": max(config.buy_in, big_blind),
+            },
+        )
+        # Tables left over from an earlier run against the same server are reused
+        if response.status_code != 409:
+            response.raise_for_status()
+
+
+async def _report_progress(
+    stats: LoadStats,
+    started: float,
+    on_progress: Optional[Callable[[LoadStats, float], None]],
+    interval: float,
+) -> None:
+    if on_progress is None:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        on_progress(stats, time.perf_counter() - started)
+
+
+def format_report(stats: LoadStats) -> str:
+    lines = [
+        f"{'operation':<10} {'ok':>8} {'errors':>7} {'error %':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'throttled':>9}"
+    ]
+    operations = [op for op in OPERATIONS if stats.attempts(op)]
+    operations += sorted(
+        op for op in set(stats.latencies) | set(stats.errors) if op not in OPERATIONS
+    )
+    for operation in operations:
+        latencies = sorted(stats.latencies.get(operation, ()))
+        lines.append(
+            f"{operation:<10} {len(latencies):>8} {stats.failures(operation):>7} "
+            f"{100 * stats.error_rate(operation):>7.2f}% "
+            f"{1000 * percentile(latencies, 0.50):>9.1f} "
+            f"{1000 * percentile(latencies, 0.95):>9.1f} "
+            f"{1000 * percentile(latencies, 0.99):>9.1f} "
+            f"{stats.throttled[operation]:>9}"
+        )
+    for operation, reasons in sorted(stats.errors.items()):
+        for reason, count in reasons.most_common(5):
+            lines.append(f"  {operation} error {reason}: {count}")
+    window = stats.window_seconds
+    lines.append(
+        f"steady state: {stats.window_actions / window if window else 0:,.1f} "
+        f"actions/s over {window:.0f}s, {stats.hands_dealt} hands dealt to players, "
+        f"{100 * stats.error_rate():.2f}% of all requests failed, "
+        f"{stats.peak_connected} sockets open at peak"
+    )
+    return "\n".join(lines)
@@ -18,9 +18,9 @@ class IPlayerService(ABC):
     """
 
     @abstractmethod
-    def register(self, username: str, password: str) -> Player:
+    async def register(self, username: str, password: str) -> Player:
         pass
 
     @abstractmethod
-    def login(self, username: str, password: str) -> Player:
+    async def login(self, username: str, password: str) -> Player:
         pass
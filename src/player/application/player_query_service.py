@@ -1,6 +1,6 @@
-import json
-import os
+from typing import Optional
 from player.application.interfaces import IPlayerQueryService
+from player.infrastructure.player_store import PlayerLogStore, open_player_store
 
 
 class FileSystemPlayerQueryService(IPlayerQueryService):
@@ -8,22 +8,20 @@ class FileSystemPlayerQueryService(IPlayerQueryService):
     Implementation of PlayerQueryService for file system storage.
     """
 
-    def __init__(self, file_path="players.json"):
+    def __init__(
+        self, file_path="players.json", store: Optional[PlayerLogStore] = None
+    ):
         self.file_path = file_path
-        if not os.path.exists(file_path):
-            with open(file_path, "w") as f:
-                f.write("[]")
+        self.store = store if store is not None else open_player_store(file_path)
 
     def get_player(self, player_id: int):
         """
         Retrieve player information by player ID.
         """
-        with open(self.file_path, "r") as f:
-            players = json.load(f)
-            for player in players:
-                if player["player_id"] == player_id:
-                    return player
-        raise ValueError(f"Player with ID {player_id} not found.")
+        player = self.store.get(str(player_id))
+        if player is None:
+            raise ValueError(f"Player with ID {player_id} not found.")
+        return player
 
 
 class PostgressPlayerQueryService(IPlayerQueryService):
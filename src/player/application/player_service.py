@@ -1,21 +1,22 @@
+import asyncio
 from typing import Optional
 from uuid import uuid4
 from player.application.interfaces import IPlayerService
 from player.domain.entities import Player
-from player.infrastructure.hashing_service import HashingService
-from player.infrastructure.player_repository import (
-    FileSystemPlayerRepository,
-    IPlayerRepository,
-)
+from player.infrastructure.hashing_service import HashingExecutor
+from player.infrastructure.player_repository import IPlayerRepository
 
 
 class PlayerService(IPlayerService):
-    def __init__(self):
-        self.player_repository: IPlayerRepository = FileSystemPlayerRepository(
-            "players.json"
-        )
+    def __init__(
+        self,
+        player_repository: IPlayerRepository,
+        hashing_executor: HashingExecutor,
+    ):
+        self.player_repository = player_repository
+        self.hashing_executor = hashing_executor
 
-    def register(self, username: str, password: str) -> Player:
+    async def register(self, username: str, password: str) -> Player:
         """
         Create a new player with the provided data.
         """
@@ -30,17 +31,22 @@ class PlayerService(IPlayerService):
         player = Player(
             player_id=uuid4(),
             username=username,
-            password_hash=HashingService.hash(password),
+            password_hash=await self.hashing_executor.hash(password),
         )
-        return self.player_repository.create_player(player)
+        # The store returns once the record is fsynced; waiting in a thread
+        # keeps the event loop free and lets concurrent registrations share
+        # one group commit
+        return await asyncio.to_thread(self.player_repository.create_player, player)
 
-    def login(self, username: str, password: str) -> Optional[Player]:
+    async def login(self, username: str, password: str) -> Optional[Player]:
         """
         Authenticate a player with the provided username and password.
         """
         try:
             player = self.player_repository.get_player_by_username(username)
-            if player and HashingService.verify(player.password_hash, password):
+            if player and await self.hashing_executor.verify(
+                player.password_hash, password
+            ):
                 return player
         except ValueError:
             raise ValueError("Invalid username or password")
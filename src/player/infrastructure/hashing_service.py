@@ -1,5 +1,23 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
 import bcrypt
 
+from shared.metrics import REGISTRY
+
+_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "poker_hashing_queue_wait_seconds",
+    "Time a hash or verify waited for a free hashing worker",
+)
+_LATENCY_SECONDS = REGISTRY.histogram(
+    "poker_hashing_latency_seconds",
+    "Time from submitting a hash or verify to its result",
+)
+
 
 class HashingService:
     """
@@ -26,3 +44,86 @@ class HashingService:
         return bcrypt.checkpw(
             provided_password.encode("utf-8"), stored_hash.encode("utf-8")
         )
+
+
+class HashingQueueFullError(Exception):
+    pass
+
+
+def _timed_hash(password: str) -> Tuple[str, float]:
+    started = time.perf_counter()
+    return HashingService.hash(password), time.perf_counter() - started
+
+
+def _timed_verify(stored_hash: str, provided_password: str) -> Tuple[bool, float]:
+    started = time.perf_counter()
+    result = HashingService.verify(stored_hash, provided_password)
+    return result, time.perf_counter() - started
+
+
+@dataclass
+class HashingMetrics:
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0
+    queue_depth: int = 0  # submitted but not yet finished
+    total_queue_wait_seconds: float = 0.0
+    total_latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+
+
+class HashingExecutor:
+    """
+    Runs bcrypt in a process pool so hashing never blocks the event loop.
+
+    At most max_pending operations may be queued or running; beyond that new
+    requests are rejected with HashingQueueFullError instead of queueing.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.metrics = HashingMetrics()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_timed_hash, password)
+
+    async def verify(self, stored_hash: str, provided_password: str) -> bool:
+        return await self._submit(_timed_verify, stored_hash, provided_password)
+
+    def start(self) -> None:
+        """Spawn the worker processes up front instead of on first use"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            for _ in range(self.max_workers):
+                self._pool.submit(os.getpid)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def _submit(self, fn, *args):
+        if self.metrics.queue_depth >= self.max_pending:
+            self.metrics.rejected += 1
+            raise HashingQueueFullError("Hashing queue is full")
+        self.start()
+        self.metrics.submitted += 1
+        self.metrics.queue_depth += 1
+        started = time.perf_counter()
+        try:
+            result, run_seconds = await asyncio.get_running_loop().run_in_executor(
+                self._pool, fn, *args
+            )
+        finally:
+            self.metrics.queue_depth -= 1
+        latency = time.perf_counter() - started
+        queue_wait = max(latency - run_seconds, 0.0)
+        _LATENCY_SECONDS.observe(latency)
+        _QUEUE_WAIT_SECONDS.observe(queue_wait)
+        self.metrics.completed += 1
+        self.metrics.total_latency_seconds += latency
+        self.metrics.total_queue_wait_seconds += queue_wait
+        self.metrics.max_latency_seconds = max(self.metrics.max_latency_seconds, latency)
+        return result
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-import json
-import os
+from typing import Optional
 from player.domain.entities import Player
+from player.infrastructure.player_store import PlayerLogStore, open_player_store
+from shared.metrics import REPOSITORY_SECONDS, timed
 from shared.types import PlayerId
 
 
@@ -48,56 +49,41 @@ class IPlayerRepository(ABC):
 
 class FileSystemPlayerRepository(IPlayerRepository):
     """
-    File system implementation of the player repository.
+    File system implementation of the player repository, backed by an
+    append-only player log with in-memory indexes.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, store: Optional[PlayerLogStore] = None):
         self.file_path = file_path
-        if not os.path.exists(file_path):
-            with open(file_path, "w") as f:
-                f.write("[]")
+        self.store = store if store is not None else open_player_store(file_path)
 
+    @timed(REPOSITORY_SECONDS, "player_log", "get_player_by_id")
     def get_player_by_id(self, player_id: PlayerId) -> Player:
-        with open(self.file_path, "r") as f:
-            players = json.load(f)
-            for player in players:
-                if player["player_id"] == player_id:
-                    player["player_id"] = str(player["player_id"])  # Ensure UUID is a string
-                    return Player(**player)
-        raise ValueError(f"Player with ID {player_id} not found.")
+        player = self.store.get(str(player_id))
+        if player is None:
+            raise ValueError(f"Player with ID {player_id} not found.")
+        return Player(**player)
 
+    @timed(REPOSITORY_SECONDS, "player_log", "get_player_by_username")
     def get_player_by_username(self, username: str) -> Player:
-        with open(self.file_path, "r") as f:
-            players = json.load(f)
-            for player in players:
-                if player["username"] == username:
-                    return Player(**player)
-        raise ValueError(f"Player with username {username} not found.")
+        player = self.store.get_by_username(username)
+        if player is None:
+            raise ValueError(f"Player with username {username} not found.")
+        return Player(**player)
 
-    def create_player(self, player: Player) -> None:
-        player.player_id = str(player.player_id)  # Ensure UUID is a string
-        with open(self.file_path, "r+") as f:
-            players = json.load(f)
-            players.append(player.model_dump())
-            f.seek(0)
-            json.dump(players, f)
+    @timed(REPOSITORY_SECONDS, "player_log", "create_player")
+    def create_player(self, player: Player) -> Player:
+        self.store.insert(player.model_dump(mode="json"))
         return player
 
-    def update_player(self, player: Player) -> None:
-        with open(self.file_path, "r+") as f:
-            players = json.load(f)
-            for i, p in enumerate(players):
-                if p["player_id"] == player.player_id:
-                    players[i] = player.model_dump()
-                    f.seek(0)
-                    json.dump(players, f)
-        raise ValueError(f"Player with ID {player.player_id} not found.")
+    @timed(REPOSITORY_SECONDS, "player_log", "update_player")
+    def update_player(self, player: Player) -> Player:
+        if self.store.get(str(player.player_id)) is None:
+            raise ValueError(f"Player with ID {player.player_id} not found.")
+        self.store.put(player.model_dump(mode="json"))
+        return player
 
+    @timed(REPOSITORY_SECONDS, "player_log", "delete_player")
     def delete_player(self, player_id: PlayerId):
-        with open(self.file_path, "r+") as f:
-            players = json.load(f)
-            players = [p for p in players if p["player_id"] != player_id]
-            f.seek(0)
-            f.truncate()
-            json.dump(players, f)
-        raise ValueError(f"Player with ID {player_id} not found.")
+        if not self.store.delete(str(player_id)):
+            raise ValueError(f"Player with ID {player_id} not found.")
@@ -0,0 +1,265 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class PlayerLogCorruptError(Exception):
+    pass
+
+
+class PlayerLogStore:
+    """
+    Append-only JSON-lines log of player records with in-memory hash indexes.
+
+    Each line is a {"op": "put" | "del", ...} record. The indexes map player_id
+    to the (offset, length) of its latest record and username to player_id, so
+    lookups are one pread and writes are one append. Appends are made durable by
+    a background group commit that fsyncs every fsync_interval seconds, and
+    superseded records are dropped by background compaction.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        fsync_interval: float = 0.005,
+        compact_ratio: float = 0.5,
+        compact_min_records: int = 10_000,
+    ):
+        self.file_path = file_path
+        self.fsync_interval = fsync_interval
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+
+        self._lock = threading.Lock()  # guards the fd, file size and indexes
+        self._sync_cond = threading.Condition()
+        self._compact_lock = threading.Lock()
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._usernames: Dict[str, str] = {}  # username -> player_id
+        self._username_of: Dict[str, str] = {}  # player_id -> username
+        self._records = 0
+        self._written = 0
+        self._synced = 0
+        self._closed = False
+
+        self._migrate_legacy_file()
+        self._fd = os.open(file_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size = self._load()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def get(self, player_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._offsets.get(player_id)
+            if entry is None:
+                return None
+            data = os.pread(self._fd, entry[1], entry[0])
+        return json.loads(data)["player"]
+
+    def get_by_username(self, username: str) -> Optional[dict]:
+        player_id = self._usernames.get(username)
+        return None if player_id is None else self.get(player_id)
+
+    def put(self, player: dict) -> None:
+        """Insert or replace a player record; returns once it is durable"""
+        self._put(player, unique_username=False)
+
+    def insert(self, player: dict) -> None:
+        """Insert a player, atomically rejecting a username that is taken"""
+        self._put(player, unique_username=True)
+
+    def _put(self, player: dict, unique_username: bool) -> None:
+        line = self._encode({"op": "put", "player": player})
+        with self._lock:
+            owner = self._usernames.get(player["username"])
+            if owner is not None and (unique_username or owner != player["player_id"]):
+                raise ValueError("Username already exists.")
+            self._index_put(player, self._size, len(line))
+            sequence = self._append(line)
+        self._wait_durable(sequence)
+
+    def delete(self, player_id: str) -> bool:
+        with self._lock:
+            if player_id not in self._offsets:
+                return False
+            self._index_delete(player_id)
+            sequence = self._append(self._encode({"op": "del", "player_id": player_id}))
+        self._wait_durable(sequence)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def close(self) -> None:
+        with self._sync_cond:
+            self._closed = True
+            self._sync_cond.notify_all()
+        self._flusher.join()
+        with self._lock:
+            os.fsync(self._fd)
+            os.close(self._fd)
+
+    @staticmethod
+    def _encode(record: dict) -> bytes:
+        return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def _append(self, line: bytes) -> int:
+        # Caller holds self._lock
+        os.write(self._fd, line)
+        self._size += len(line)
+        self._records += 1
+        self._written += 1
+        if (
+            self._records >= self.compact_min_records
+            and len(self._offsets) < self._records * (1 - self.compact_ratio)
+            and not self._compact_lock.locked()
+        ):
+            threading.Thread(target=self.compact, daemon=True).start()
+        return self._written
+
+    def _wait_durable(self, sequence: int) -> None:
+        with self._sync_cond:
+            self._sync_cond.notify_all()
+            while self._synced < sequence and not self._closed:
+                self._sync_cond.wait()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._sync_cond:
+                while self._synced >= self._written and not self._closed:
+                    self._sync_cond.wait()
+                if self._closed:
+                    return
+            # Let concurrent writers pile into the same fsync
+            time.sleep(self.fsync_interval)
+            with self._sync_cond:
+                target = self._written
+                os.fsync(self._fd)
+                self._synced = target
+                self._sync_cond.notify_all()
+
+    def _load(self) -> int:
+        """
+        Rebuild the indexes from the log, dropping a final record torn by a
+        crash mid-append; any other unreadable record raises
+        """
+        offset = 0
+        with open(self.file_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Only the last line can lack its newline
+                    os.ftruncate(self._fd, offset)
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    raise PlayerLogCorruptError(
+                        f"{self.file_path}: unreadable record at byte {offset}"
+                    ) from exc
+                self._index_record(record, offset, len(line))
+                offset += len(line)
+        return offset
+
+    def _index_record(self, record: dict, offset: int, length: int) -> None:
+        self._records += 1
+        if record["op"] == "put":
+            self._index_put(record["player"], offset, length)
+        else:
+            self._index_delete(record["player_id"])
+
+    def _index_put(self, player: dict, offset: int, length: int) -> None:
+        player_id = player["player_id"]
+        previous = self._username_of.get(player_id)
+        if previous is not None:
+            del self._usernames[previous]
+        self._offsets[player_id] = (offset, length)
+        self._usernames[player["username"]] = player_id
+        self._username_of[player_id] = player["username"]
+
+    def _index_delete(self, player_id: str) -> None:
+        if self._offsets.pop(player_id, None) is not None:
+            del self._usernames[self._username_of.pop(player_id)]
+
+    def compact(self) -> None:
+        """Rewrite the log with only the latest record for each live player"""
+        with self._compact_lock:
+            with self._lock:
+                snapshot = dict(self._offsets)
+                snapshot_end = self._size
+            compact_path = self.file_path + ".compact"
+            offsets: Dict[str, Tuple[int, int]] = {}
+            position = 0
+            with open(compact_path, "wb") as out:
+                for player_id, (offset, length) in snapshot.items():
+                    out.write(os.pread(self._fd, length, offset))
+                    offsets[player_id] = (position, length)
+                    position += length
+                out.flush()
+                os.fsync(out.fileno())
+
+            with self._lock, self._sync_cond:
+                # Carry over anything appended while the snapshot was copied
+                tail = os.pread(self._fd, self._size - snapshot_end, snapshot_end)
+                with open(compact_path, "ab") as out:
+                    out.write(tail)
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(compact_path, self.file_path)
+                _fsync_directory(self.file_path)
+                os.close(self._fd)
+                self._fd = os.open(self.file_path, os.O_RDWR | os.O_APPEND)
+
+                self._offsets = offsets
+                self._records = len(offsets) + tail.count(b"\n")
+                for line in tail.splitlines(keepends=True):
+                    record = json.loads(line)
+                    if record["op"] == "put":
+                        offsets[record["player"]["player_id"]] = (position, len(line))
+                    else:
+                        offsets.pop(record["player_id"], None)
+                    position += len(line)
+                self._size = position
+                self._synced = self._written
+                self._sync_cond.notify_all()
+
+    def _migrate_legacy_file(self) -> None:
+        """Convert a players.json array from before the log format in place"""
+        if not os.path.exists(self.file_path):
+            return
+        with open(self.file_path, "rb") as f:
+            head = f.read(64).lstrip()
+            if not head.startswith(b"["):
+                return
+            f.seek(0)
+            players = json.load(f)
+        migrated_path = self.file_path + ".migrate"
+        with open(migrated_path, "wb") as out:
+            for player in players:
+                player["player_id"] = str(player["player_id"])
+                out.write(self._encode({"op": "put", "player": player}))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(migrated_path, self.file_path)
+        _fsync_directory(self.file_path)
+
+
+def _fsync_directory(file_path: str) -> None:
+    fd = os.open(os.path.dirname(os.path.abspath(file_path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+_stores: Dict[str, PlayerLogStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_player_store(file_path: str) -> PlayerLogStore:
+    """Return the process-wide store for a file so every reader shares one index"""
+    key = os.path.abspath(file_path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = PlayerLogStore(file_path)
+        return _stores[key]
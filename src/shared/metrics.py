@@ -0,0 +1,293 @@
+import asyncio
+import dataclasses
+import functools
+import math
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds, from 10µs to 10s in roughly 1-2.5-5 steps
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """
+    A named metric, split by label values. Children are created on first use
+    and kept, so hot paths should look theirs up once and hold on to it.
+    Everything here runs on the event loop thread; nothing is locked.
+    """
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values) -> Any:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def remove(self, *values) -> None:
+        self._children.pop(tuple(str(value) for value in values), None)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {_escape_help(self.documentation)}"
+        yield f"# TYPE {self.name} {self.type}"
+        for key, child in self._children.items():
+            yield from self._render_child(dict(zip(self.labelnames, key)), child)
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _render_child(self, labels: Dict[str, str], child) -> Iterable[str]:
+        yield f"{self.name}{_format_labels(labels)} {_format_value(child.value)}"
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _render_child(self, labels: Dict[str, str], child) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), child.counts):
+            cumulative += count
+            bucket = _format_labels({**labels, "le": _format_value(bound)})
+            yield f"{self.name}_bucket{bucket} {cumulative}"
+        suffix = _format_labels(labels)
+        yield f"{self.name}_sum{suffix} {_format_value(child.sum)}"
+        yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    Metrics published on /api/metrics. Modules create theirs at import time;
+    collectors build metrics from state that already lives elsewhere, such as
+    the components' own metrics dataclasses, when the registry is rendered.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        histogram = self._metrics.get(name)
+        if histogram is None:
+            histogram = Histogram(name, documentation, labelnames, buckets)
+            self._metrics[name] = histogram
+        return histogram
+
+    def register_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            for metric in collector():
+                lines.extend(metric.render())
+        lines.append("")
+        return "\n".join(lines)
+
+    def _get(self, cls, name: str, documentation: str, labelnames) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, labelnames)
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+REPOSITORY_SECONDS = REGISTRY.histogram(
+    "poker_repository_seconds",
+    "Time spent in storage calls, by repository and operation",
+    ("repository", "operation"),
+)
+
+
+def timed(histogram: Histogram, *label_values) -> Callable:
+    """Decorator observing how long each call to a function or coroutine takes"""
+    child = histogram.labels(*label_values)
+
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def timed_coroutine(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    child.observe(time.perf_counter() - started)
+
+            return timed_coroutine
+
+        @functools.wraps(fn)
+        def timed_function(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+
+        return timed_function
+
+    return decorate
+
+
+def stats_metrics(
+    prefix: str,
+    stats: Any,
+    label: Optional[str] = None,
+    counters: Iterable[str] = (),
+) -> List[Metric]:
+    """
+    Gauges, or counters for the fields named in counters, built from a
+    metrics dataclass or from a dict of them keyed by the value of label
+    """
+    if label is None:
+        stats = {(): stats}
+        labelnames: Tuple[str, ...] = ()
+    else:
+        stats = {(key,): value for key, value in stats.items()}
+        labelnames = (label,)
+    counters = set(counters)
+    metrics: Dict[str, Metric] = {}
+    for key, value in stats.items():
+        for field in dataclasses.fields(value):
+            metric = metrics.get(field.name)
+            if metric is None:
+                documentation = field.name.replace("_", " ")
+                if field.name in counters:
+                    name, cls = f"{prefix}_{field.name}_total", Counter
+                else:
+                    name, cls = f"{prefix}_{field.name}", Gauge
+                metric = metrics[field.name] = cls(name, documentation, labelnames)
+            metric.labels(*key).value = getattr(value, field.name)
+    return list(metrics.values())
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label(value)}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,81 @@
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for a running process. A background thread wakes
+    every interval seconds and records the Python stack of the target thread
+    (by default the one that started it, i.e. the event loop), so the
+    profiled code runs unmodified and the cost is one stack walk per sample.
+    Results are collapsed stacks, one "frame;frame;frame count" line per
+    distinct stack, as read by flamegraph.pl and speedscope.
+
+    Off unless PROFILER_ENABLED is set; only one profile runs at a time.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._target: Optional[int] = None
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.environ.get("PROFILER_ENABLED", "").lower() in ("1", "true", "yes")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, thread_id: Optional[int] = None) -> None:
+        if self._thread is not None:
+            raise ProfilerBusyError("A profile is already running")
+        self._target = thread_id if thread_id is not None else threading.get_ident()
+        self._stacks.clear()
+        self.samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed stacks"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self._stacks.most_common()
+        )
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < self.max_depth:
+                code = frame.f_code
+                names.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                    f":{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            names.reverse()
+            self._stacks[";".join(names)] += 1
+            self.samples += 1
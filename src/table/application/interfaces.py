@@ -0,0 +1,57 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+
+from shared.types import PlayerId, TableId
+from table.domain.entities import TableConfig
+
+
+@dataclass
+class TableInfo:
+    id: str
+    name: str
+    stakes: str
+    current_players: int
+    max_players: int
+    min_buy_in: int
+    max_buy_in: int
+    game_type: str = "poker"
+
+    @classmethod
+    def from_config(cls, config: TableConfig, current_players: int = 0) -> "TableInfo":
+        return cls(
+            id=str(config.id),
+            name=config.name,
+            stakes=config.stakes,
+            current_players=current_players,
+            max_players=config.max_seats,
+            min_buy_in=config.min_buy_in,
+            max_buy_in=config.max_buy_in,
+            game_type=config.game_type.value,
+        )
+
+
+class ITableService(ABC):
+    @abstractmethod
+    async def list_tables(self) -> List[TableInfo]:
+        pass
+
+    @abstractmethod
+    async def get_table(self, table_id: TableId) -> TableInfo:
+        pass
+
+    @abstractmethod
+    async def create_table(self, config: TableConfig) -> TableInfo:
+        pass
+
+    @abstractmethod
+    async def join_table(
+        self, table_id: TableId, player_id: PlayerId, buy_in: int
+    ) -> bool:
+        pass
+
+    @abstractmethod
+    async def leave_table(
+        self, table_id: TableId, player_id: PlayerId, final_stack: Optional[int] = None
+    ) -> bool:
+        pass
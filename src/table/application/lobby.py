@@ -0,0 +1,126 @@
+import asyncio
+import json
+import secrets
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+from table.application.interfaces import TableInfo
+
+_SNAPSHOT = b'{"type":"lobby_snapshot","version":%d,"tables":[%s]}'
+_DELTA = b'{"type":"lobby_delta","version":%d,"tables":[%s],"removed":%s}'
+
+
+@dataclass
+class LobbyMetrics:
+    tables: int = 0
+    deltas: int = 0
+    snapshots_built: int = 0
+    snapshot_bytes: int = 0
+
+
+class LobbyView:
+    """
+    The lobby's table list, kept up to date as tables are created and seats
+    change instead of being rebuilt for every request. Each table is encoded
+    to JSON once per change, and the full snapshot is joined from those
+    fragments at most once per version, so polling clients with a current
+    ETag cost a string comparison.
+
+    Changes made in the same event loop iteration are published together as
+    one delta and one version bump; listeners get the encoded delta.
+    """
+
+    def __init__(self):
+        # Distinguishes versions of this process from those of a restarted one
+        self.epoch = secrets.token_hex(4)
+        self.version = 0
+        self.metrics = LobbyMetrics()
+        self._tables: Dict[str, TableInfo] = {}
+        self._fragments: Dict[str, bytes] = {}
+        self._dirty: Set[str] = set()
+        self._snapshot: Optional[bytes] = None
+        self._listeners: List[Callable[[bytes], None]] = []
+        self._flush_scheduled = False
+
+    @property
+    def etag(self) -> str:
+        self.flush()
+        return f'"{self.epoch}-{self.version}"'
+
+    def subscribe(self, listener: Callable[[bytes], None]) -> None:
+        """Call listener with every encoded delta"""
+        self._listeners.append(listener)
+
+    def tables(self) -> List[TableInfo]:
+        return list(self._tables.values())
+
+    def get(self, table_id: str) -> Optional[TableInfo]:
+        return self._tables.get(table_id)
+
+    def upsert(self, info: TableInfo) -> None:
+        self._tables[info.id] = info
+        self._changed(info.id)
+
+    def remove(self, table_id: str) -> None:
+        if self._tables.pop(table_id, None) is not None:
+            self._changed(table_id)
+
+    def set_players(self, table_id: str, current_players: int) -> None:
+        info = self._tables.get(table_id)
+        if info is None or info.current_players == current_players:
+            return
+        info.current_players = current_players
+        self._changed(table_id)
+
+    def snapshot(self) -> bytes:
+        """The whole lobby as a lobby_snapshot message"""
+        self.flush()
+        if self._snapshot is None:
+            self._snapshot = _SNAPSHOT % (
+                self.version,
+                b",".join(self._fragments.values()),
+            )
+            self.metrics.snapshots_built += 1
+            self.metrics.snapshot_bytes = len(self._snapshot)
+        return self._snapshot
+
+    def flush(self) -> None:
+        """Publish pending changes as one delta"""
+        self._flush_scheduled = False
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        updated = []
+        removed = []
+        for table_id in dirty:
+            info = self._tables.get(table_id)
+            if info is None:
+                self._fragments.pop(table_id, None)
+                removed.append(table_id)
+            else:
+                fragment = json.dumps(asdict(info), separators=(",", ":")).encode()
+                self._fragments[table_id] = fragment
+                updated.append(fragment)
+        self.version += 1
+        self._snapshot = None
+        self.metrics.tables = len(self._tables)
+        self.metrics.deltas += 1
+        delta = _DELTA % (
+            self.version,
+            b",".join(updated),
+            json.dumps(removed).encode(),
+        )
+        for listener in self._listeners:
+            listener(delta)
+
+    def _changed(self, table_id: str) -> None:
+        self._dirty.add(table_id)
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_scheduled = True
+        loop.call_soon(self.flush)
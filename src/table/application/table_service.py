@@ -1,25 +1,191 @@
-from game.application.game_service import GameService
+from typing import List, Optional
+
+from game.application.hand_dealer import HandDealer, parse_stakes
+from game.application.table_actor import TableActorRegistry
+from game.domain.exceptions import NoSeatsAvaliableError, PlayerNotFoundError
 from shared.types import TableId, PlayerId
-from table.domain.exceptions import NoOpenSeatsAtTableError
+from table.application.interfaces import ITableService, TableInfo
+from table.application.lobby import LobbyView
+from table.domain.entities import TableConfig
+from table.domain.exceptions import (
+    NoOpenSeatsAtTableError,
+    PlayerNotAtTableError,
+    TableNotFoundError,
+)
+from table.infrastructure.table_respository import TableRepository
+from wallet.application.interfaces import IWalletService
+from wallet.infrastructure.wallet_ledger import LedgerSyncError
 
 
-class TableService:
-    def __init__(self, game_service: GameService):
-        self.game_service = game_service
+class TableService(ITableService):
+    """
+    Table configs live in the repository; the lobby view mirrors them along
+    with seat counts, and is updated here as tables are created and players
+    join and leave, and by watch_lobby() or load_lobby() for changes other
+    workers make. Seated players are handed to the dealer, which deals them
+    into hands and keeps their chip counts.
+    """
 
-    def join_table(self, table_id: TableId, player_id: PlayerId) -> bool:
-        """Add player to table if space available"""
-        # check balance
-        # reserve chips
+    def __init__(
+        self,
+        table_actors: TableActorRegistry,
+        wallet_service: IWalletService,
+        table_repository: TableRepository,
+        lobby: LobbyView,
+        dealer: HandDealer,
+    ):
+        self.table_actors = table_actors
+        self.wallet_service = wallet_service
+        self.table_repository = table_repository
+        self.lobby = lobby
+        self.dealer = dealer
+
+    async def load_lobby(self) -> None:
+        """Bring the whole lobby in line with the repository"""
+        tables = await self._table_infos(await self.table_repository.list())
+        known = {info.id for info in tables}
+        for info in self.lobby.tables():
+            if info.id not in known:
+                self.lobby.remove(info.id)
+        for info in tables:
+            self._show(info)
+
+    async def watch_lobby(self) -> bool:
+        """
+        Keep the lobby up to date with changes from other workers; returns
+        False if the repository can't report them and load_lobby() has to be
+        polled instead
+        """
+        return await self.table_repository.watch(self.refresh_table)
+
+    async def refresh_table(self, table_id: str) -> Optional[TableInfo]:
+        """Bring one table's lobby entry in line with the repository"""
+        config = await self.table_repository.get_by_id(table_id)
+        if config is None:
+            self.lobby.remove(table_id)
+            return None
+        info = TableInfo.from_config(
+            config, await self.table_repository.seated(table_id)
+        )
+        self._show(info)
+        return info
+
+    async def list_tables(self) -> List[TableInfo]:
+        return self.lobby.tables()
+
+    async def find_tables(
+        self, filters: dict, limit: Optional[int] = None
+    ) -> List[TableInfo]:
+        """Tables matching filters, see InMemoryTableRepository.list"""
+        return await self._table_infos(
+            await self.table_repository.list(filters, limit)
+        )
+
+    async def get_table(self, table_id: TableId) -> TableInfo:
+        info = self.lobby.get(str(table_id)) or await self.refresh_table(
+            str(table_id)
+        )
+        if info is None:
+            raise TableNotFoundError(f"No table {table_id}")
+        return info
+
+    async def players_at(self, table_id: TableId) -> List[str]:
+        """
+        Seated players in seat order, from the table's game if it runs here
+        and otherwise from the repository's seat map
+        """
+        actor = self.table_actors.get(str(table_id))
+        if actor is not None:
+            seats = await actor.read(lambda game: dict(game.seats))
+        else:
+            seats = await self.table_repository.seat_map(table_id)
+        return [str(player_id) for _, player_id in sorted(seats.items())]
+
+    async def create_table(self, config: TableConfig) -> TableInfo:
+        if not 0 < config.min_buy_in <= config.max_buy_in:
+            raise ValueError("Buy-in range must be positive and ordered")
+        if config.max_seats < 2:
+            raise ValueError("A table needs at least two seats")
+        parse_stakes(config.stakes)
+        await self.table_repository.create(config)
+        seated = await self.table_repository.seated(config.id)
+        info = TableInfo.from_config(config, seated)
+        self.lobby.upsert(info)
+        return info
 
+    async def join_table(
+        self, table_id: TableId, player_id: PlayerId, buy_in: int
+    ) -> bool:
+        """Add player to table if space available"""
+        config = await self.table_repository.get_by_id(table_id)
+        if config is None:
+            raise TableNotFoundError(f"No table {table_id}")
+        if not config.min_buy_in <= buy_in <= config.max_buy_in:
+            raise ValueError(
+                f"Buy-in must be between {config.min_buy_in} and {config.max_buy_in}"
+            )
+        parse_stakes(config.stakes)
+        # Raises InsufficientFundsError before anything else is touched
+        await self.wallet_service.create_reservation(player_id, str(table_id), buy_in)
         try:
-            self.game_service.seat_player(player_id)
-        except NoOpenSeatsAtTableError:
-            # release chips
+            seat = await self.table_repository.claim_seat(table_id, player_id)
+        except Exception:
+            await self.wallet_service.release_reservation(player_id, str(table_id))
             raise
-        return True
+        try:
+            joined = await self.table_actors.actor_for(
+                str(table_id), config.max_seats
+            ).join(player_id, seat)
+        except NoSeatsAvaliableError as exc:
+            await self._undo_join(table_id, player_id)
+            raise NoOpenSeatsAtTableError(str(exc)) from exc
+        except Exception:
+            await self._undo_join(table_id, player_id)
+            raise
+        self.dealer.sit_down(str(table_id), player_id, buy_in, config.stakes)
+        await self._seats_changed(table_id)
+        return joined
 
-    def leave_table(self, table_id: TableId, player_id: PlayerId) -> bool:
-        """Remove player from table"""
-        self.game_service.remove_player(player_id)
+    async def leave_table(
+        self, table_id: TableId, player_id: PlayerId, final_stack: Optional[int] = None
+    ) -> bool:
+        """
+        Remove player from table and settle their buy-in against the chips
+        they leave with, or against final_stack if one is given. Raises
+        PlayerInHandError while the player is still live in a hand.
+        """
+        try:
+            chips = await self.dealer.stand_up(str(table_id), player_id)
+        except PlayerNotFoundError as exc:
+            raise PlayerNotAtTableError(str(exc)) from exc
+        await self.table_repository.release_seat(table_id, player_id)
+        await self._seats_changed(table_id)
+        try:
+            await self.wallet_service.settle_reservation(
+                player_id, str(table_id), chips if final_stack is None else final_stack
+            )
+        except LedgerSyncError:
+            pass  # settled; the ledger keeps retrying the fsync
         return True
+
+    async def _table_infos(self, configs: List[TableConfig]) -> List[TableInfo]:
+        counts = await self.table_repository.seat_counts(
+            [config.id for config in configs]
+        )
+        return [
+            TableInfo.from_config(config, seated)
+            for config, seated in zip(configs, counts)
+        ]
+
+    def _show(self, info: TableInfo) -> None:
+        if self.lobby.get(info.id) != info:
+            self.lobby.upsert(info)
+
+    async def _undo_join(self, table_id: TableId, player_id: PlayerId) -> None:
+        await self.table_repository.release_seat(table_id, player_id)
+        await self.wallet_service.release_reservation(player_id, str(table_id))
+
+    async def _seats_changed(self, table_id: TableId) -> None:
+        self.lobby.set_players(
+            str(table_id), await self.table_repository.seated(table_id)
+        )
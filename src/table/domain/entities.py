@@ -1,7 +1,10 @@
-class TableId:
-    pass
+from dataclasses import dataclass
 
+from game.domain.enums import GameType
+from shared.types import TableId
 
+
+@dataclass
 class TableConfig:
     id: TableId
     name: str
@@ -9,3 +12,4 @@ class TableConfig:
     max_seats: int
     min_buy_in: int
     max_buy_in: int
+    game_type: GameType = GameType.POKER
@@ -8,3 +8,7 @@ class NoOpenSeatsAtTableError(Exception):
 
 class PlayerNotAtTableError(Exception):
     pass
+
+
+class TableAlreadyExistsError(Exception):
+    pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class ITableRegistry(ABC):
+    """For distributed deployment - tracks table locations"""
+
+    @abstractmethod
+    async def get_server_for_table(self, table_id: str) -> Optional[str]:
+        """Returns game server URL hosting this table"""
+
+    @abstractmethod
+    async def assign_table_to_server(self, table_id: str) -> str:
+        """Assigns table to least loaded server"""
@@ -0,0 +1,597 @@
+import bisect
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from hashlib import blake2b
+from typing import Dict, List, Optional, Set, Tuple
+
+from table.domain.interfaces import ITableRegistry
+
+
+class NoGameWorkersError(Exception):
+    pass
+
+
+@dataclass
+class WorkerInfo:
+    worker_id: str
+    url: str
+    weight: int = 1  # relative capacity, e.g. cores given to the worker
+    load: float = 0.0  # tables served by the worker
+
+
+@dataclass
+class TableMigration:
+    table_id: str
+    source: str
+    target: str
+
+
+class IRegistryStore(ABC):
+    """
+    Backing store for table assignments, worker state and planned migrations.
+    Every method is atomic, so workers sharing a store can call them
+    concurrently.
+    """
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def get_assignment(self, table_id: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def claim_assignment(self, table_id: str, worker_id: str) -> str:
+        """
+        Assign an unassigned table to worker_id and add one to its load.
+        Returns the worker the table is assigned to, which is someone else's
+        if another worker claimed it first.
+        """
+        pass
+
+    @abstractmethod
+    async def release_assignment(
+        self, table_id: str, worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Unassign a table, if worker_id holds it or worker_id is None, and
+        drop any migration planned for it. Returns whether it was released.
+        """
+        pass
+
+    @abstractmethod
+    async def tables_for_worker(self, worker_id: str) -> List[str]:
+        pass
+
+    @abstractmethod
+    async def get_workers(self) -> Dict[str, WorkerInfo]:
+        pass
+
+    @abstractmethod
+    async def put_worker(self, worker: WorkerInfo) -> None:
+        pass
+
+    @abstractmethod
+    async def remove_worker(self, worker_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def add_load(self, worker_id: str, change: float) -> None:
+        """Change a registered worker's load, never taking it below zero"""
+        pass
+
+    @abstractmethod
+    async def set_load(self, worker_id: str, load: float) -> None:
+        pass
+
+    @abstractmethod
+    async def put_migration(self, migration: TableMigration) -> bool:
+        """Plan a migration unless one is already planned for the table"""
+        pass
+
+    @abstractmethod
+    async def get_migrations(self) -> List[TableMigration]:
+        pass
+
+    @abstractmethod
+    async def delete_migration(self, table_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def apply_migration(
+        self, migration: TableMigration, handoff: Optional[dict] = None
+    ) -> bool:
+        """
+        Move the table to migration.target if the migration is still planned
+        and the table is still assigned to migration.source, moving one unit
+        of load with it and leaving handoff for the target. The plan is
+        dropped either way.
+        """
+        pass
+
+    @abstractmethod
+    async def take_handoff(self, table_id: str) -> Optional[dict]:
+        """Remove and return the handoff left for a table, if any"""
+        pass
+
+    @abstractmethod
+    async def handoff_tables(self) -> List[str]:
+        pass
+
+
+class InMemoryRegistryStore(IRegistryStore):
+    """In-process store for a single worker and for tests"""
+
+    def __init__(self):
+        self._assignments: Dict[str, str] = {}
+        self._tables: Dict[str, Set[str]] = {}
+        self._workers: Dict[str, WorkerInfo] = {}
+        self._migrations: Dict[str, TableMigration] = {}
+        self._handoffs: Dict[str, dict] = {}
+
+    async def get_assignment(self, table_id: str) -> Optional[str]:
+        return self._assignments.get(table_id)
+
+    async def claim_assignment(self, table_id: str, worker_id: str) -> str:
+        if table_id not in self._assignments:
+            self._assign(table_id, worker_id)
+            await self.add_load(worker_id, 1)
+        return self._assignments[table_id]
+
+    async def release_assignment(
+        self, table_id: str, worker_id: Optional[str] = None
+    ) -> bool:
+        owner = self._assignments.get(table_id)
+        if owner is None or worker_id not in (None, owner):
+            return False
+        del self._assignments[table_id]
+        self._tables[owner].discard(table_id)
+        self._migrations.pop(table_id, None)
+        await self.add_load(owner, -1)
+        return True
+
+    async def tables_for_worker(self, worker_id: str) -> List[str]:
+        return list(self._tables.get(worker_id, ()))
+
+    async def get_workers(self) -> Dict[str, WorkerInfo]:
+        return {
+            worker_id: replace(worker) for worker_id, worker in self._workers.items()
+        }
+
+    async def put_worker(self, worker: WorkerInfo) -> None:
+        self._workers[worker.worker_id] = replace(worker)
+
+    async def remove_worker(self, worker_id: str) -> None:
+        self._workers.pop(worker_id, None)
+
+    async def add_load(self, worker_id: str, change: float) -> None:
+        worker = self._workers.get(worker_id)
+        if worker is not None:
+            worker.load = max(worker.load + change, 0.0)
+
+    async def set_load(self, worker_id: str, load: float) -> None:
+        worker = self._workers.get(worker_id)
+        if worker is not None:
+            worker.load = max(load, 0.0)
+
+    async def put_migration(self, migration: TableMigration) -> bool:
+        if migration.table_id in self._migrations:
+            return False
+        self._migrations[migration.table_id] = migration
+        return True
+
+    async def get_migrations(self) -> List[TableMigration]:
+        return list(self._migrations.values())
+
+    async def delete_migration(self, table_id: str) -> None:
+        self._migrations.pop(table_id, None)
+
+    async def apply_migration(
+        self, migration: TableMigration, handoff: Optional[dict] = None
+    ) -> bool:
+        planned = self._migrations.pop(migration.table_id, None)
+        if planned != migration:
+            return False
+        if self._assignments.get(migration.table_id) != migration.source:
+            return False
+        self._tables[migration.source].discard(migration.table_id)
+        self._assign(migration.table_id, migration.target)
+        await self.add_load(migration.source, -1)
+        await self.add_load(migration.target, 1)
+        if handoff is not None:
+            self._handoffs[migration.table_id] = handoff
+        return True
+
+    async def take_handoff(self, table_id: str) -> Optional[dict]:
+        return self._handoffs.pop(table_id, None)
+
+    async def handoff_tables(self) -> List[str]:
+        return list(self._handoffs)
+
+    def _assign(self, table_id: str, worker_id: str) -> None:
+        self._assignments[table_id] = worker_id
+        self._tables.setdefault(worker_id, set()).add(table_id)
+
+
+# KEYS: assignments, loads. ARGV: table, worker. Returns the table's owner.
+_CLAIM_ASSIGNMENT = """
+local owner = redis.call('HGET', KEYS[1], ARGV[1])
+if owner then return owner end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+local load = tonumber(redis.call('HGET', KEYS[2], ARGV[2]))
+if load then redis.call('HSET', KEYS[2], ARGV[2], load + 1) end
+return ARGV[2]
+"""
+
+# KEYS: assignments, loads, migrations. ARGV: table, worker or "" for any.
+_RELEASE_ASSIGNMENT = """
+local owner = redis.call('HGET', KEYS[1], ARGV[1])
+if not owner or (ARGV[2] ~= '' and owner ~= ARGV[2]) then return 0 end
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+local load = tonumber(redis.call('HGET', KEYS[2], owner))
+if load then redis.call('HSET', KEYS[2], owner, math.max(load - 1, 0)) end
+return 1
+"""
+
+# KEYS: loads. ARGV: worker, change.
+_ADD_LOAD = """
+local load = tonumber(redis.call('HGET', KEYS[1], ARGV[1]))
+if load then
+  redis.call('HSET', KEYS[1], ARGV[1], math.max(load + tonumber(ARGV[2]), 0))
+end
+"""
+
+# KEYS: loads. ARGV: worker, load. Only for registered workers.
+_SET_LOAD = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+  redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+"""
+
+# KEYS: assignments, loads, migrations, handoffs. ARGV: table, source, target,
+# the plan as stored in migrations, the handoff or "" for none.
+_APPLY_MIGRATION = """
+local planned = redis.call('HGET', KEYS[3], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+if planned ~= ARGV[4] then return 0 end
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+for i, change in ipairs({{ARGV[2], -1}, {ARGV[3], 1}}) do
+  local load = tonumber(redis.call('HGET', KEYS[2], change[1]))
+  if load then
+    redis.call('HSET', KEYS[2], change[1], math.max(load + change[2], 0))
+  end
+end
+if ARGV[5] ~= '' then redis.call('HSET', KEYS[4], ARGV[1], ARGV[5]) end
+return 1
+"""
+
+
+class RedisRegistryStore(IRegistryStore):
+    """
+    Registry state in Redis, shared by every game worker: hashes of table ->
+    worker assignments, worker id -> url and weight, worker id -> load, and
+    table id -> planned migration and handoff. Changes that read before they
+    write are Lua scripts. tables_for_worker() scans the assignments, which only
+    rebalancing and removing a worker do.
+
+    Expects a redis.asyncio client created with decode_responses=True.
+    """
+
+    def __init__(self, redis, key_prefix: str = "poker:{registry}:"):
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self._assignments = key_prefix + "assignments"
+        self._workers = key_prefix + "workers"
+        self._loads = key_prefix + "loads"
+        self._migrations = key_prefix + "migrations"
+        self._handoffs = key_prefix + "handoffs"
+        self._claim = redis.register_script(_CLAIM_ASSIGNMENT)
+        self._release = redis.register_script(_RELEASE_ASSIGNMENT)
+        self._add_load = redis.register_script(_ADD_LOAD)
+        self._set_load = redis.register_script(_SET_LOAD)
+        self._apply = redis.register_script(_APPLY_MIGRATION)
+
+    @classmethod
+    def from_url(cls, url: str, **options) -> "RedisRegistryStore":
+        from redis.asyncio import Redis
+
+        return cls(Redis.from_url(url, decode_responses=True), **options)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    async def get_assignment(self, table_id: str) -> Optional[str]:
+        return await self.redis.hget(self._assignments, table_id)
+
+    async def claim_assignment(self, table_id: str, worker_id: str) -> str:
+        return await self._claim(
+            keys=[self._assignments, self._loads], args=[table_id, worker_id]
+        )
+
+    async def release_assignment(
+        self, table_id: str, worker_id: Optional[str] = None
+    ) -> bool:
+        released = await self._release(
+            keys=[self._assignments, self._loads, self._migrations],
+            args=[table_id, worker_id or ""],
+        )
+        return bool(released)
+
+    async def tables_for_worker(self, worker_id: str) -> List[str]:
+        assignments = await self.redis.hgetall(self._assignments)
+        return [
+            table_id for table_id, owner in assignments.items() if owner == worker_id
+        ]
+
+    async def get_workers(self) -> Dict[str, WorkerInfo]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            workers, loads = await pipe.hgetall(self._workers).hgetall(
+                self._loads
+            ).execute()
+        found = {}
+        for worker_id, fields in workers.items():
+            url, weight = json.loads(fields)
+            found[worker_id] = WorkerInfo(
+                worker_id, url, weight, float(loads.get(worker_id, 0))
+            )
+        return found
+
+    async def put_worker(self, worker: WorkerInfo) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.hset(
+                self._workers, worker.worker_id, json.dumps([worker.url, worker.weight])
+            ).hset(self._loads, worker.worker_id, worker.load).execute()
+
+    async def remove_worker(self, worker_id: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.hdel(self._workers, worker_id).hdel(
+                self._loads, worker_id
+            ).execute()
+
+    async def add_load(self, worker_id: str, change: float) -> None:
+        await self._add_load(keys=[self._loads], args=[worker_id, change])
+
+    async def set_load(self, worker_id: str, load: float) -> None:
+        await self._set_load(keys=[self._loads], args=[worker_id, max(load, 0.0)])
+
+    async def put_migration(self, migration: TableMigration) -> bool:
+        return bool(
+            await self.redis.hsetnx(
+                self._migrations, migration.table_id, _plan(migration)
+            )
+        )
+
+    async def get_migrations(self) -> List[TableMigration]:
+        plans = await self.redis.hgetall(self._migrations)
+        return [
+            TableMigration(table_id, *json.loads(plan))
+            for table_id, plan in plans.items()
+        ]
+
+    async def delete_migration(self, table_id: str) -> None:
+        await self.redis.hdel(self._migrations, table_id)
+
+    async def apply_migration(
+        self, migration: TableMigration, handoff: Optional[dict] = None
+    ) -> bool:
+        applied = await self._apply(
+            keys=[self._assignments, self._loads, self._migrations, self._handoffs],
+            args=[
+                migration.table_id,
+                migration.source,
+                migration.target,
+                _plan(migration),
+                "" if handoff is None else json.dumps(handoff),
+            ],
+        )
+        return bool(applied)
+
+    async def take_handoff(self, table_id: str) -> Optional[dict]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            handoff, _ = await pipe.hget(self._handoffs, table_id).hdel(
+                self._handoffs, table_id
+            ).execute()
+        return None if handoff is None else json.loads(handoff)
+
+    async def handoff_tables(self) -> List[str]:
+        return await self.redis.hkeys(self._handoffs)
+
+
+def _plan(migration: TableMigration) -> str:
+    return json.dumps([migration.source, migration.target])
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ConsistentHashTableRegistry(ITableRegistry):
+    """
+    Places tables on game workers with consistent hashing and bounded loads.
+
+    Each worker owns vnodes_per_weight * weight points on a hash ring. A new
+    table goes to the first worker clockwise from its hash whose load per unit
+    of weight stays within (1 + load_slack) of the average, so adding or
+    removing a worker only moves the tables it owned while hot workers are
+    skipped. rebalance() plans migrations off overloaded workers; they are
+    applied by on_hand_boundary() so a table never moves mid-hand.
+
+    Load is counted in tables: assigning a table adds one to its worker,
+    releasing or migrating it away takes one off, and report_load() resets a
+    worker's count to the tables it actually serves.
+
+    All state lives in the store, so every worker sharing it sees the same
+    assignments and planned migrations; the ring is rebuilt whenever the
+    store's workers differ from the ones it was built from.
+    """
+
+    def __init__(
+        self,
+        store: IRegistryStore,
+        vnodes_per_weight: int = 64,
+        load_slack: float = 0.25,
+    ):
+        self.store = store
+        self.vnodes_per_weight = vnodes_per_weight
+        self.load_slack = load_slack
+        self._ring: List[Tuple[int, str]] = []
+        self._ring_workers: List[Tuple[str, int]] = []
+
+    async def register_worker(self, worker: WorkerInfo) -> None:
+        await self.store.put_worker(worker)
+
+    async def remove_worker(self, worker_id: str) -> List[str]:
+        """Remove a worker and reassign its tables; returns the moved tables"""
+        tables = await self.store.tables_for_worker(worker_id)
+        await self.store.remove_worker(worker_id)
+        for migration in await self.store.get_migrations():
+            if worker_id in (migration.source, migration.target):
+                await self.store.delete_migration(migration.table_id)
+        remaining = await self.store.get_workers()
+        for table_id in tables:
+            await self.store.release_assignment(table_id, worker_id)
+            if remaining:
+                await self.assign_table_to_server(table_id)
+        return tables
+
+    async def report_load(self, worker_id: str, load: float) -> None:
+        await self.store.set_load(worker_id, load)
+
+    async def get_server_for_table(self, table_id: str) -> Optional[str]:
+        worker_id = await self.store.get_assignment(table_id)
+        if worker_id is None:
+            return None
+        worker = (await self.store.get_workers()).get(worker_id)
+        return worker.url if worker is not None else None
+
+    async def assign_table_to_server(self, table_id: str) -> str:
+        current = await self.get_server_for_table(table_id)
+        if current is not None:
+            return current
+        workers = await self.store.get_workers()
+        worker = self._place(table_id, workers)
+        owner = await self.store.claim_assignment(table_id, worker.worker_id)
+        if owner == worker.worker_id:
+            return worker.url
+        # Another worker placed it first
+        url = await self.get_server_for_table(table_id)
+        if url is None:
+            raise NoGameWorkersError(f"Table {table_id} is on a removed worker")
+        return url
+
+    async def release_table(
+        self, table_id: str, worker_id: Optional[str] = None
+    ) -> None:
+        """
+        Forget a table that no longer runs anywhere. With worker_id, only if
+        the table is still assigned to that worker rather than moved on.
+        """
+        await self.store.release_assignment(table_id, worker_id)
+
+    async def migrations_from(self, worker_id: str) -> List[TableMigration]:
+        """Moves planned off a worker, not yet applied"""
+        return [
+            migration
+            for migration in await self.store.get_migrations()
+            if migration.source == worker_id
+        ]
+
+    async def rebalance(self) -> List[TableMigration]:
+        """Plan moves of tables off workers loaded beyond the slack"""
+        # Plan on the copies get_workers() returns, counting moves already
+        # planned: loads only change in the store as moves are applied
+        workers = await self.store.get_workers()
+        if len(workers) < 2:
+            return []
+        pending = set()
+        for migration in await self.store.get_migrations():
+            pending.add(migration.table_id)
+            for worker_id, change in ((migration.source, -1), (migration.target, 1)):
+                if worker_id in workers:
+                    workers[worker_id].load += change
+        limit = self._load_limit(workers)
+        planned = []
+        for worker in workers.values():
+            tables = await self.store.tables_for_worker(worker.worker_id)
+            for table_id in sorted(tables):
+                if worker.load / worker.weight <= limit:
+                    break
+                if table_id in pending:
+                    continue
+                target = self._place(table_id, workers, exclude=worker.worker_id)
+                migration = TableMigration(table_id, worker.worker_id, target.worker_id)
+                if not await self.store.put_migration(migration):
+                    continue  # another worker planned it just now
+                planned.append(migration)
+                worker.load -= 1
+                target.load += 1
+        return planned
+
+    async def on_hand_boundary(
+        self, migration: TableMigration, handoff: Optional[dict] = None
+    ) -> bool:
+        """
+        Apply a planned migration once its table is between hands, leaving
+        handoff for the worker it moves to. Returns False if it was dropped
+        meanwhile, e.g. because the table was released or a worker removed.
+        """
+        return await self.store.apply_migration(migration, handoff)
+
+    async def take_handoff(self, table_id: str) -> Optional[dict]:
+        """The handoff a migration left for a table, once"""
+        return await self.store.take_handoff(table_id)
+
+    async def handed_off_to(self, worker_id: str) -> List[str]:
+        """Tables moved to a worker that hasn't taken their handoff yet"""
+        return [
+            table_id
+            for table_id in await self.store.handoff_tables()
+            if await self.store.get_assignment(table_id) == worker_id
+        ]
+
+    def _load_limit(self, workers: Dict[str, WorkerInfo]) -> float:
+        total_load = sum(worker.load for worker in workers.values()) + 1
+        total_weight = sum(worker.weight for worker in workers.values())
+        return (1 + self.load_slack) * total_load / total_weight
+
+    def _place(
+        self,
+        table_id: str,
+        workers: Dict[str, WorkerInfo],
+        exclude: Optional[str] = None,
+    ) -> WorkerInfo:
+        candidates = {
+            worker_id: worker
+            for worker_id, worker in workers.items()
+            if worker_id != exclude
+        }
+        if not candidates:
+            raise NoGameWorkersError("No game workers are registered")
+        ring = self._ring_for(workers)
+        limit = self._load_limit(workers)
+        start = bisect.bisect(ring, (_hash(table_id), ""))
+        seen = set()
+        for step in range(len(ring)):
+            worker_id = ring[(start + step) % len(ring)][1]
+            if worker_id in seen or worker_id not in candidates:
+                continue
+            seen.add(worker_id)
+            worker = candidates[worker_id]
+            if (worker.load + 1) / worker.weight <= limit:
+                return worker
+        # Every worker is at the limit; fall back to the least loaded
+        return min(candidates.values(), key=lambda w: w.load / w.weight)
+
+    def _ring_for(self, workers: Dict[str, WorkerInfo]) -> List[Tuple[int, str]]:
+        key = sorted((worker.worker_id, worker.weight) for worker in workers.values())
+        if key != self._ring_workers:
+            self._ring_workers = key
+            self._ring = sorted(
+                (_hash(f"{worker_id}#{i}"), worker_id)
+                for worker_id, weight in key
+                for i in range(self.vnodes_per_weight * weight)
+            )
+        return self._ring
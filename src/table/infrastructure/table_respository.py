@@ -1,30 +1,715 @@
-from abc import ABC
+import asyncio
+import bisect
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import replace
+from itertools import chain
+from operator import itemgetter
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from game.domain.enums import GameType
+from shared.metrics import REPOSITORY_SECONDS, timed
+from table.domain.entities import TableConfig
+from table.domain.exceptions import (
+    NoOpenSeatsAtTableError,
+    TableAlreadyExistsError,
+    TableNotFoundError,
+)
 
 
 class TableRepository(ABC):
-    def create(self, table_data):
+    """
+    Table configs and seat occupancy. Seats are claimed here before a player
+    is seated in the table's game, so every worker sharing the repository
+    agrees on who sits where.
+    """
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def watch(self, callback: Callable[[str], Awaitable[None]]) -> bool:
+        """
+        Await callback with the id of every table whose config or seats
+        another worker changes. Returns False if the repository can't tell,
+        in which case callers have to poll.
+        """
+        return False
+
+    @abstractmethod
+    async def create(self, table_data: TableConfig) -> TableConfig:
+        """Add a table; raises TableAlreadyExistsError if the id is taken"""
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, table_id) -> Optional[TableConfig]:
+        pass
+
+    @abstractmethod
+    async def update(self, table_id, update_data: dict) -> TableConfig:
         pass
 
-    def get_by_id(self, table_id):
+    @abstractmethod
+    async def delete(self, table_id) -> None:
         pass
 
-    def update(self, table_id, update_data):
+    @abstractmethod
+    async def list(
+        self, filters=None, limit: Optional[int] = None
+    ) -> List[TableConfig]:
         pass
 
-    def delete(self, table_id):
+    @abstractmethod
+    async def seated(self, table_id) -> int:
         pass
 
-    def list(self, filters=None):
+    @abstractmethod
+    async def seat_counts(self, table_ids: List) -> List[int]:
+        pass
+
+    @abstractmethod
+    async def seat_map(self, table_id) -> Dict[int, str]:
+        """Seat -> player of everyone holding a seat at the table"""
+        pass
+
+    @abstractmethod
+    async def claim_seat(self, table_id, player_id: str) -> int:
+        """
+        Atomically take the lowest free seat for player_id, or return the seat
+        they already hold
+        """
+        pass
+
+    @abstractmethod
+    async def release_seat(self, table_id, player_id: str) -> Optional[int]:
+        """Free the player's seat; returns it, or None if they held none"""
         pass
 
 
 class InMemoryTableRepository(TableRepository):
-    pass
+    """
+    Table configs of this worker, with secondary indexes so filtered listings
+    never scan every table.
+
+    Stakes, game type and table size are hash indexes; open seats are bucketed
+    by count, since a table has only a handful of seats, so a seat change
+    moves one id between two buckets. Buy-in limits are kept in sorted lists
+    searched with bisect. A query walks the smallest matching index entry and
+    checks the remaining filters on each table in it.
+
+    Supported filters: stakes, game_type, max_seats, min_open_seats and
+    buy_in (an amount the table's buy-in range must allow); any other key is
+    compared with the config attribute of that name.
+    """
+
+    def __init__(self):
+        self._tables: Dict[str, TableConfig] = {}
+        self._seats: Dict[str, Dict[int, str]] = {}  # table -> seat -> player
+        self._by_stakes: Dict[str, Set[str]] = {}
+        self._by_game_type: Dict[GameType, Set[str]] = {}
+        self._by_max_seats: Dict[int, Set[str]] = {}
+        self._by_open_seats: Dict[int, Set[str]] = {}
+        self._min_buy_ins: List[Tuple[int, str]] = []  # sorted
+        self._max_buy_ins: List[Tuple[int, str]] = []  # sorted
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    async def watch(self, callback: Callable[[str], Awaitable[None]]) -> bool:
+        # No other worker shares these tables
+        return True
+
+    async def create(self, table_data: TableConfig) -> TableConfig:
+        table_id = str(table_data.id)
+        if table_id in self._tables:
+            raise TableAlreadyExistsError(f"Table {table_id} already exists")
+        self._tables[table_id] = table_data
+        self._seats.setdefault(table_id, {})
+        self._index(table_data)
+        return table_data
+
+    async def get_by_id(self, table_id) -> Optional[TableConfig]:
+        return self._tables.get(str(table_id))
+
+    async def update(self, table_id, update_data: dict) -> TableConfig:
+        config = self._tables.get(str(table_id))
+        if config is None:
+            raise TableNotFoundError(f"No table {table_id}")
+        self._unindex(config)
+        config = self._tables[str(table_id)] = replace(config, **update_data)
+        self._index(config)
+        return config
+
+    async def delete(self, table_id) -> None:
+        config = self._tables.pop(str(table_id), None)
+        if config is not None:
+            self._unindex(config)
+            del self._seats[str(table_id)]
+
+    async def seated(self, table_id) -> int:
+        return len(self._seats.get(str(table_id), ()))
+
+    async def seat_counts(self, table_ids: List) -> List[int]:
+        return [len(self._seats.get(str(table_id), ())) for table_id in table_ids]
+
+    async def seat_map(self, table_id) -> Dict[int, str]:
+        return dict(self._seats.get(str(table_id), {}))
+
+    async def claim_seat(self, table_id, player_id: str) -> int:
+        table_id = str(table_id)
+        config = self._tables.get(table_id)
+        if config is None:
+            raise TableNotFoundError(f"No table {table_id}")
+        seats = self._seats[table_id]
+        for seat, seated_player in seats.items():
+            if seated_player == player_id:
+                return seat
+        for seat in range(config.max_seats):
+            if seat not in seats:
+                before = self._open_seats(config)
+                seats[seat] = player_id
+                self._open_seats_changed(config, before)
+                return seat
+        raise NoOpenSeatsAtTableError(f"Table {table_id} has no open seats")
+
+    async def release_seat(self, table_id, player_id: str) -> Optional[int]:
+        table_id = str(table_id)
+        seats = self._seats.get(table_id, {})
+        for seat, seated_player in seats.items():
+            if seated_player == player_id:
+                config = self._tables[table_id]
+                before = self._open_seats(config)
+                del seats[seat]
+                self._open_seats_changed(config, before)
+                return seat
+        return None
+
+    async def list(
+        self, filters=None, limit: Optional[int] = None
+    ) -> List[TableConfig]:
+        """Tables matching every filter, in no particular order"""
+        filters = dict(filters or {})
+        if "game_type" in filters:
+            filters["game_type"] = GameType(filters["game_type"])
+        source = self._smallest_source(filters)
+        tables = []
+        for table_id in source:
+            config = self._tables[table_id]
+            if self._matches(config, filters):
+                tables.append(config)
+                if limit is not None and len(tables) >= limit:
+                    break
+        return tables
+
+    def _smallest_source(self, filters: dict) -> Iterable[str]:
+        sources: List[Tuple[int, Iterable[str]]] = [
+            (len(self._tables), self._tables.keys())
+        ]
+        for name, index in (
+            ("stakes", self._by_stakes),
+            ("game_type", self._by_game_type),
+            ("max_seats", self._by_max_seats),
+        ):
+            if name in filters:
+                ids = index.get(filters[name], set())
+                sources.append((len(ids), ids))
+        if "min_open_seats" in filters:
+            buckets = [
+                ids
+                for open_seats, ids in self._by_open_seats.items()
+                if open_seats >= filters["min_open_seats"]
+            ]
+            sources.append((sum(map(len, buckets)), chain.from_iterable(buckets)))
+        if "buy_in" in filters:
+            buy_in = filters["buy_in"]
+            # Tables whose minimum is low enough, or whose maximum is high enough
+            low = bisect.bisect_right(self._min_buy_ins, buy_in, key=itemgetter(0))
+            high = bisect.bisect_left(self._max_buy_ins, buy_in, key=itemgetter(0))
+            count = len(self._max_buy_ins)
+            sources.append((low, _sorted_ids(self._min_buy_ins, 0, low)))
+            sources.append((count - high, _sorted_ids(self._max_buy_ins, high, count)))
+        return min(sources, key=itemgetter(0))[1]
+
+    def _matches(self, config: TableConfig, filters: dict) -> bool:
+        for name, value in filters.items():
+            if name == "min_open_seats":
+                if self._open_seats(config) < value:
+                    return False
+            elif name == "buy_in":
+                if not config.min_buy_in <= value <= config.max_buy_in:
+                    return False
+            elif getattr(config, name) != value:
+                return False
+        return True
+
+    def _open_seats(self, config: TableConfig) -> int:
+        return max(config.max_seats - len(self._seats.get(str(config.id), ())), 0)
+
+    def _open_seats_changed(self, config: TableConfig, before: int) -> None:
+        table_id = str(config.id)
+        _discard(self._by_open_seats, before, table_id)
+        self._by_open_seats.setdefault(self._open_seats(config), set()).add(table_id)
+
+    def _index(self, config: TableConfig) -> None:
+        table_id = str(config.id)
+        self._by_stakes.setdefault(config.stakes, set()).add(table_id)
+        self._by_game_type.setdefault(config.game_type, set()).add(table_id)
+        self._by_max_seats.setdefault(config.max_seats, set()).add(table_id)
+        self._by_open_seats.setdefault(self._open_seats(config), set()).add(table_id)
+        bisect.insort(self._min_buy_ins, (config.min_buy_in, table_id))
+        bisect.insort(self._max_buy_ins, (config.max_buy_in, table_id))
+
+    def _unindex(self, config: TableConfig) -> None:
+        table_id = str(config.id)
+        _discard(self._by_stakes, config.stakes, table_id)
+        _discard(self._by_game_type, config.game_type, table_id)
+        _discard(self._by_max_seats, config.max_seats, table_id)
+        _discard(self._by_open_seats, self._open_seats(config), table_id)
+        _remove_sorted(self._min_buy_ins, (config.min_buy_in, table_id))
+        _remove_sorted(self._max_buy_ins, (config.max_buy_in, table_id))
+
+
+def _discard(index: dict, key, table_id: str) -> None:
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(table_id)
+        if not ids:
+            del index[key]
+
+
+def _sorted_ids(items: list, start: int, stop: int) -> Iterable[str]:
+    return (items[i][1] for i in range(start, stop))
+
+
+def _remove_sorted(items: list, item: tuple) -> None:
+    position = bisect.bisect_left(items, item)
+    if position < len(items) and items[position] == item:
+        del items[position]
 
 
 class PostgresTableRepository(TableRepository):
     pass
 
 
+# Every key shares the {tables} hash tag so the scripts below, which touch
+# several keys, also run on Redis Cluster
+# ARGV[3] is '1' on create, which must not replace an existing table; returns 0
+# if it would have
+_UPSERT_TABLE = """
+local prefix, id = ARGV[1], ARGV[2]
+local old = redis.call('HMGET', KEYS[1], 'stakes', 'game_type', 'max_seats')
+if old[1] and ARGV[3] == '1' then return 0 end
+if old[1] then
+  redis.call('SREM', prefix .. 'stakes:' .. old[1], id)
+  redis.call('SREM', prefix .. 'game_type:' .. old[2], id)
+  redis.call('SREM', prefix .. 'max_seats:' .. old[3], id)
+end
+local fields = {}
+for i = 4, #ARGV, 2 do fields[ARGV[i]] = ARGV[i + 1] end
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+redis.call('SADD', KEYS[3], id)
+redis.call('SADD', prefix .. 'stakes:' .. fields.stakes, id)
+redis.call('SADD', prefix .. 'game_type:' .. fields.game_type, id)
+redis.call('SADD', prefix .. 'max_seats:' .. fields.max_seats, id)
+local taken = redis.call('HLEN', KEYS[2])
+local open_seats = math.max(tonumber(fields.max_seats) - taken, 0)
+redis.call('ZADD', KEYS[4], open_seats, id)
+redis.call('ZADD', KEYS[5], fields.min_buy_in, id)
+redis.call('ZADD', KEYS[6], fields.max_buy_in, id)
+return 1
+"""
+
+_DELETE_TABLE = """
+local prefix, id = ARGV[1], ARGV[2]
+local old = redis.call('HMGET', KEYS[1], 'stakes', 'game_type', 'max_seats')
+if not old[1] then return 0 end
+redis.call('SREM', prefix .. 'stakes:' .. old[1], id)
+redis.call('SREM', prefix .. 'game_type:' .. old[2], id)
+redis.call('SREM', prefix .. 'max_seats:' .. old[3], id)
+redis.call('DEL', KEYS[1], KEYS[2])
+redis.call('SREM', KEYS[3], id)
+redis.call('ZREM', KEYS[4], id)
+redis.call('ZREM', KEYS[5], id)
+redis.call('ZREM', KEYS[6], id)
+return 1
+"""
+
+# Returns the seat, -1 if the table is full or -2 if there is no such table
+_CLAIM_SEAT = """
+local max_seats = tonumber(redis.call('HGET', KEYS[1], 'max_seats'))
+if not max_seats then return -2 end
+local seats = redis.call('HGETALL', KEYS[2])
+for i = 1, #seats, 2 do
+  if seats[i + 1] == ARGV[2] then return tonumber(seats[i]) end
+end
+local taken = #seats / 2
+if taken >= max_seats then return -1 end
+for seat = 0, max_seats - 1 do
+  if redis.call('HSETNX', KEYS[2], seat, ARGV[2]) == 1 then
+    redis.call('ZADD', KEYS[3], max_seats - taken - 1, ARGV[1])
+    return seat
+  end
+end
+return -1
+"""
+
+# Returns the freed seat or -1 if the player held none
+_RELEASE_SEAT = """
+local seats = redis.call('HGETALL', KEYS[2])
+for i = 1, #seats, 2 do
+  if seats[i + 1] == ARGV[2] then
+    redis.call('HDEL', KEYS[2], seats[i])
+    local max_seats = tonumber(redis.call('HGET', KEYS[1], 'max_seats'))
+    if max_seats then
+      local open_seats = math.max(max_seats - #seats / 2 + 1, 0)
+      redis.call('ZADD', KEYS[3], open_seats, ARGV[1])
+    end
+    return tonumber(seats[i])
+  end
+end
+return -1
+"""
+
+# KEYS: all tables, open seats, min buy-ins, max buy-ins, then any set indexes
+# to intersect. ARGV: min open seats, buy-in, limit; "" or 0 for none.
+_LIST_TABLES = """
+local min_open, buy_in = tonumber(ARGV[1]), tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local ids
+if #KEYS > 4 then
+  ids = redis.call('SINTER', unpack(KEYS, 5))
+elseif min_open then
+  ids = redis.call('ZRANGEBYSCORE', KEYS[2], min_open, '+inf')
+elseif buy_in then
+  ids = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', buy_in)
+else
+  ids = redis.call('SMEMBERS', KEYS[1])
+end
+local out = {}
+for _, id in ipairs(ids) do
+  local ok = true
+  if min_open then
+    ok = tonumber(redis.call('ZSCORE', KEYS[2], id)) >= min_open
+  end
+  if ok and buy_in then
+    ok = tonumber(redis.call('ZSCORE', KEYS[3], id)) <= buy_in
+      and tonumber(redis.call('ZSCORE', KEYS[4], id)) >= buy_in
+  end
+  if ok then
+    out[#out + 1] = id
+    if limit > 0 and #out >= limit then break end
+  end
+end
+return out
+"""
+
+
+def _config_to_hash(config: TableConfig) -> Dict[str, str]:
+    return {
+        "id": str(config.id),
+        "name": config.name,
+        "stakes": config.stakes,
+        "max_seats": str(config.max_seats),
+        "min_buy_in": str(config.min_buy_in),
+        "max_buy_in": str(config.max_buy_in),
+        "game_type": config.game_type.value,
+    }
+
+
+def _config_from_hash(data: Dict[str, str]) -> TableConfig:
+    return TableConfig(
+        id=data["id"],
+        name=data["name"],
+        stakes=data["stakes"],
+        max_seats=int(data["max_seats"]),
+        min_buy_in=int(data["min_buy_in"]),
+        max_buy_in=int(data["max_buy_in"]),
+        game_type=GameType(data["game_type"]),
+    )
+
+
 class RedisTableRepository(TableRepository):
-    pass
+    """
+    Table configs and seats in Redis, shared by every API worker.
+
+    A table is a config hash and a seat -> player hash; the set of all tables,
+    a set per stakes, game type and table size, and sorted sets of open seats
+    and buy-in limits index them. Writes and seat claims are Lua scripts, so
+    indexes never disagree with the tables and two workers can never hand out
+    the same seat. Listings run their filters server-side and fetch configs
+    with one pipeline per batch.
+
+    Configs are cached locally, up to cache_size of them, and evicted when a
+    keyspace notification says the hash changed. The cache is only used while
+    the notification subscription is up; if it drops, the cache is emptied
+    and reads go to Redis until it is back. The same notifications, for the
+    config and seat hashes, are passed on to watch() callbacks.
+
+    Keyspace notifications are server configuration the repository only
+    reads: notify-keyspace-events must include K plus h and g (or A), e.g.
+    "Khg". Without them there is no cache and watch() returns False. Where
+    CONFIG is disabled, pass keyspace_events=True if they are configured.
+
+    Expects a redis.asyncio client created with decode_responses=True.
+    """
+
+    def __init__(
+        self,
+        redis,
+        key_prefix: str = "poker:{tables}:",
+        cache_size: int = 10_000,
+        batch_size: int = 1000,
+        reconnect_delay: float = 1.0,
+        keyspace_events: Optional[bool] = None,
+    ):
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.reconnect_delay = reconnect_delay
+        self.keyspace_events = keyspace_events
+        self._cache: "OrderedDict[str, TableConfig]" = OrderedDict()
+        self._generation = 0  # bumped by every invalidation
+        self._listening = False
+        self._listener: Optional[asyncio.Task] = None
+        self._watchers: List[Callable[[str], Awaitable[None]]] = []
+        self._upsert = redis.register_script(_UPSERT_TABLE)
+        self._delete = redis.register_script(_DELETE_TABLE)
+        self._claim = redis.register_script(_CLAIM_SEAT)
+        self._release = redis.register_script(_RELEASE_SEAT)
+        self._list = redis.register_script(_LIST_TABLES)
+
+    @classmethod
+    def from_url(cls, url: str, **options) -> "RedisTableRepository":
+        from redis.asyncio import Redis
+
+        return cls(Redis.from_url(url, decode_responses=True), **options)
+
+    async def start(self) -> None:
+        if self.cache_size > 0:
+            await self._start_listener()
+
+    async def watch(self, callback: Callable[[str], Awaitable[None]]) -> bool:
+        self._watchers.append(callback)
+        return await self._start_listener()
+
+    async def _start_listener(self) -> bool:
+        if self._listener is None and await self._notifications_enabled():
+            self._listener = asyncio.create_task(self._listen())
+        return self._listener is not None
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.redis.aclose()
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "create")
+    async def create(self, table_data: TableConfig) -> TableConfig:
+        if not await self._write(table_data, only_new=True):
+            raise TableAlreadyExistsError(f"Table {table_data.id} already exists")
+        return table_data
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "get_by_id")
+    async def get_by_id(self, table_id) -> Optional[TableConfig]:
+        configs = await self._get_many([str(table_id)])
+        return configs[0] if configs else None
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "update")
+    async def update(self, table_id, update_data: dict) -> TableConfig:
+        self._invalidate(str(table_id))
+        config = await self.get_by_id(table_id)
+        if config is None:
+            raise TableNotFoundError(f"No table {table_id}")
+        config = replace(config, **update_data)
+        await self._write(config, only_new=False)
+        return config
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "delete")
+    async def delete(self, table_id) -> None:
+        table_id = str(table_id)
+        await self._delete(
+            keys=self._table_keys(table_id), args=[self.key_prefix, table_id]
+        )
+        self._invalidate(table_id)
+
+    async def _write(self, config: TableConfig, only_new: bool) -> bool:
+        table_id = str(config.id)
+        fields = [item for pair in _config_to_hash(config).items() for item in pair]
+        written = await self._upsert(
+            keys=self._table_keys(table_id),
+            args=[self.key_prefix, table_id, "1" if only_new else "0", *fields],
+        )
+        self._invalidate(table_id)
+        return bool(written)
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "list")
+    async def list(
+        self, filters=None, limit: Optional[int] = None
+    ) -> List[TableConfig]:
+        """Tables matching every filter, see InMemoryTableRepository"""
+        filters = dict(filters or {})
+        index_keys = []
+        for name in ("stakes", "game_type", "max_seats"):
+            if name in filters:
+                value = filters.pop(name)
+                if name == "game_type":
+                    value = GameType(value).value
+                index_keys.append(f"{self.key_prefix}{name}:{value}")
+        min_open_seats = filters.pop("min_open_seats", "")
+        buy_in = filters.pop("buy_in", "")
+        if filters:
+            raise ValueError(f"Unsupported filters: {', '.join(filters)}")
+        ids = await self._list(
+            keys=[
+                self._key("all"),
+                self._key("open_seats"),
+                self._key("min_buy_in"),
+                self._key("max_buy_in"),
+                *index_keys,
+            ],
+            args=[min_open_seats, buy_in, limit or 0],
+        )
+        return await self._get_many(ids)
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "seated")
+    async def seated(self, table_id) -> int:
+        return await self.redis.hlen(self._key("seats:", table_id))
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "seat_counts")
+    async def seat_counts(self, table_ids: List) -> List[int]:
+        counts = []
+        for start in range(0, len(table_ids), self.batch_size):
+            pipe = self.redis.pipeline(transaction=False)
+            for table_id in table_ids[start : start + self.batch_size]:
+                pipe.hlen(self._key("seats:", table_id))
+            counts.extend(await pipe.execute())
+        return counts
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "seat_map")
+    async def seat_map(self, table_id) -> Dict[int, str]:
+        seats = await self.redis.hgetall(self._key("seats:", table_id))
+        return {int(seat): player_id for seat, player_id in seats.items()}
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "claim_seat")
+    async def claim_seat(self, table_id, player_id: str) -> int:
+        table_id = str(table_id)
+        seat = await self._claim(
+            keys=self._table_keys(table_id)[:2] + [self._key("open_seats")],
+            args=[table_id, player_id],
+        )
+        if seat == -2:
+            raise TableNotFoundError(f"No table {table_id}")
+        if seat == -1:
+            raise NoOpenSeatsAtTableError(f"Table {table_id} has no open seats")
+        return seat
+
+    @timed(REPOSITORY_SECONDS, "redis_table", "release_seat")
+    async def release_seat(self, table_id, player_id: str) -> Optional[int]:
+        table_id = str(table_id)
+        seat = await self._release(
+            keys=self._table_keys(table_id)[:2] + [self._key("open_seats")],
+            args=[table_id, player_id],
+        )
+        return None if seat == -1 else seat
+
+    def _key(self, name: str, table_id=None) -> str:
+        if table_id is None:
+            return self.key_prefix + name
+        return f"{self.key_prefix}{name}{table_id}"
+
+    def _table_keys(self, table_id: str) -> List[str]:
+        return [
+            self._key("config:", table_id),
+            self._key("seats:", table_id),
+            self._key("all"),
+            self._key("open_seats"),
+            self._key("min_buy_in"),
+            self._key("max_buy_in"),
+        ]
+
+    async def _get_many(self, table_ids: List[str]) -> List[TableConfig]:
+        """Configs in table_ids order, from the cache or one pipeline per batch"""
+        found: Dict[str, TableConfig] = {}
+        missing = []
+        for table_id in table_ids:
+            config = self._cache.get(table_id)
+            if config is None:
+                missing.append(table_id)
+            else:
+                self._cache.move_to_end(table_id)
+                found[table_id] = config
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            generation = self._generation
+            pipe = self.redis.pipeline(transaction=False)
+            for table_id in batch:
+                pipe.hgetall(self._key("config:", table_id))
+            for table_id, data in zip(batch, await pipe.execute()):
+                if data:
+                    found[table_id] = _config_from_hash(data)
+                    self._cache_put(table_id, found[table_id], generation)
+        return [found[table_id] for table_id in table_ids if table_id in found]
+
+    def _cache_put(self, table_id: str, config: TableConfig, generation: int) -> None:
+        # A config read before an invalidation may already be stale
+        if not self._listening or generation != self._generation:
+            return
+        self._cache[table_id] = config
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _invalidate(self, table_id: str) -> None:
+        self._cache.pop(table_id, None)
+        self._generation += 1
+
+    async def _notifications_enabled(self) -> bool:
+        """Whether the server publishes keyspace events for hash and generic commands"""
+        if self.keyspace_events is not None:
+            return self.keyspace_events
+        try:
+            current = (await self.redis.config_get("notify-keyspace-events")).get(
+                "notify-keyspace-events", ""
+            )
+        except Exception:
+            # e.g. CONFIG is disabled on a managed Redis; run without a cache
+            return False
+        return "K" in current and ({"h", "g"} <= set(current) or "A" in current)
+
+    async def _listen(self) -> None:
+        db = self.redis.connection_pool.connection_kwargs.get("db", 0)
+        config_prefix = f"__keyspace@{db}__:{self._key('config:')}"
+        seats_prefix = f"__keyspace@{db}__:{self._key('seats:')}"
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(config_prefix + "*", seats_prefix + "*")
+                async for message in pubsub.listen():
+                    if message["type"] == "psubscribe":
+                        self._listening = True
+                    elif message["type"] != "pmessage":
+                        continue
+                    elif message["channel"].startswith(config_prefix):
+                        table_id = message["channel"][len(config_prefix) :]
+                        self._invalidate(table_id)
+                        await self._notify(table_id)
+                    else:
+                        await self._notify(message["channel"][len(seats_prefix) :])
+            except Exception:
+                pass
+            finally:
+                self._listening = False
+                self._cache.clear()
+                self._generation += 1
+                await pubsub.aclose()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _notify(self, table_id: str) -> None:
+        for callback in self._watchers:
+            await callback(table_id)
@@ -1,37 +1,79 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Generic, List, Optional, TypeVar
 
-from shared.types import WalletId
+from shared.types import PlayerId, WalletId
 from wallet.domain.entities import Wallet
+from wallet.domain.value_objects import Reservation, Transaction
+
+T = TypeVar("T")
 
 
 class IWalletService(ABC):
+    """Amounts are integer minor units"""
+
+    @abstractmethod
+    async def create_wallet(self, player_id: PlayerId) -> Wallet:
+        pass
 
     @abstractmethod
-    async def get_balance(self, wallet_id: WalletId) -> Wallet:
+    async def get_balance(self, player_id: PlayerId) -> Wallet:
         pass
 
     @abstractmethod
-    async def get_active_reservations(self, wallet: Wallet) -> str:
+    async def get_active_reservations(self, player_id: PlayerId) -> List[Reservation]:
         pass
 
     @abstractmethod
-    async def create_reservation(self, wallet: Wallet) -> None:
+    async def create_reservation(
+        self, player_id: PlayerId, table_id: str, amount: int
+    ) -> Reservation:
         pass
 
     @abstractmethod
-    async def apply_transaction(self, wallet: Wallet) -> None:
+    async def release_reservation(self, player_id: PlayerId, table_id: str) -> None:
         pass
 
+    @abstractmethod
+    async def settle_reservation(
+        self, player_id: PlayerId, table_id: str, final_stack: int
+    ) -> Transaction:
+        pass
+
+    @abstractmethod
+    async def apply_transaction(
+        self, player_id: PlayerId, amount: int, reason: str
+    ) -> Transaction:
+        pass
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a newest-first listing; pass next_cursor to get the next"""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+
 
 class IWalletQueryService(ABC):
     @abstractmethod
-    async def get_wallet_balance(self, wallet_id: WalletId) -> float:
+    async def get_wallet_balance(self, wallet_id: WalletId) -> int:
         pass
 
     @abstractmethod
-    async def get_wallet_reservations(self, wallet_id: WalletId) -> list:
+    async def get_wallet_reservations(
+        self, wallet_id: WalletId, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[Reservation]:
         pass
 
     @abstractmethod
-    async def get_wallet_transactions(self, wallet_id: WalletId) -> list:
+    async def get_wallet_transactions(
+        self, wallet_id: WalletId, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[Transaction]:
         pass
+
+    @abstractmethod
+    def stream_wallet_transactions(
+        self, wallet_id: WalletId, batch_size: int = 500, cursor: Optional[str] = None
+    ) -> AsyncIterator[Transaction]:
+        """Yield every transaction newest first, holding one batch at a time"""
@@ -1,40 +1,270 @@
-from wallet.application.interfaces import IWalletQueryService, IWalletService
+import base64
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
 
+from sqlalchemy import text
 
-class FileSystemWalletQueryService(IWalletService):
+from shared.types import WalletId
+from wallet.application.interfaces import IWalletQueryService, Page
+from wallet.application.wallet_service import WalletService
+from wallet.domain.exceptions import WalletNotFoundError
+from wallet.domain.value_objects import (
+    Reservation,
+    ReservationId,
+    Transaction,
+    TransactionId,
+)
+from wallet.infrastructure.wallet_ledger import WalletLedger
+
+
+def encode_cursor(*position) -> str:
+    """Opaque cursor for a keyset position, e.g. (timestamp, id) of the last row"""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except ValueError as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _transaction_from_record(record: dict) -> Transaction:
+    return Transaction(
+        id=TransactionId(record["transaction_id"]),
+        wallet_id=record["wallet_id"],
+        amount=record["amount"],
+        reason=record["reason"],
+        timestamp=datetime.fromisoformat(record["timestamp"]),
+        reservation_id=record.get("reservation_id"),
+    )
+
+
+def _reservation_page(
+    reservations: List[Reservation], limit: int, cursor: Optional[str]
+) -> Page[Reservation]:
+    ordered = sorted(
+        reservations, key=lambda r: (r.timestamp.isoformat(), r.id), reverse=True
+    )
+    if cursor is not None:
+        position = decode_cursor(cursor)
+        if not (
+            isinstance(position, list)
+            and len(position) == 2
+            and all(isinstance(part, str) for part in position)
+        ):
+            raise ValueError("Invalid cursor")
+        position = tuple(position)
+        ordered = [r for r in ordered if (r.timestamp.isoformat(), r.id) < position]
+    items = ordered[:limit]
+    next_cursor = None
+    if len(ordered) > limit:
+        next_cursor = encode_cursor(items[-1].timestamp.isoformat(), items[-1].id)
+    return Page(items, next_cursor)
+
+
+class FileSystemWalletQueryService(IWalletQueryService):
     """
     Implementation of WalletQueryService for file system storage.
+
+    Balances and active reservations come from the live wallets; history is
+    read from the ledger's per-wallet index of transaction records. A cursor
+    is a position in that index, which only ever grows, so pages stay stable
+    while new transactions arrive.
     """
 
-    async def get_wallet_balance(self, wallet_id: str) -> float:
-        # Placeholder for actual file system query logic
-        return 100.0  # Example balance
+    def __init__(self, wallet_service: WalletService, ledger: WalletLedger):
+        self.wallet_service = wallet_service
+        self.ledger = ledger
+
+    async def get_wallet_balance(self, wallet_id: WalletId) -> int:
+        return self.wallet_service.get_wallet(wallet_id).balance
+
+    async def get_wallet_reservations(
+        self, wallet_id: WalletId, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[Reservation]:
+        wallet = self.wallet_service.get_wallet(wallet_id)
+        return _reservation_page(wallet.active_reservations(), limit, cursor)
 
-    async def get_wallet_reservations(self, wallet_id: str) -> list:
-        # Placeholder for actual file system query logic
-        return []
+    async def get_wallet_transactions(
+        self, wallet_id: WalletId, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[Transaction]:
+        self.wallet_service.get_wallet(wallet_id)
+        if cursor is None:
+            end = self.ledger.transaction_count(wallet_id)
+        else:
+            position = decode_cursor(cursor)
+            if (
+                not isinstance(position, list)
+                or len(position) != 1
+                or type(position[0]) is not int
+                or position[0] < 0
+            ):
+                raise ValueError("Invalid cursor")
+            end = position[0]
+        start = max(end - limit, 0)
+        records = self.ledger.read_transactions(wallet_id, start, end)
+        items = [_transaction_from_record(record) for record in reversed(records)]
+        return Page(items, encode_cursor(start) if start > 0 else None)
 
-    async def get_wallet_transactions(self, wallet_id: str) -> list:
-        # Placeholder for actual file system query logic
-        return []
+    async def stream_wallet_transactions(
+        self, wallet_id: WalletId, batch_size: int = 500, cursor: Optional[str] = None
+    ) -> AsyncIterator[Transaction]:
+        while True:
+            page = await self.get_wallet_transactions(wallet_id, batch_size, cursor)
+            for transaction in page.items:
+                yield transaction
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
 
 
 class PostgresWalletQueryService(IWalletQueryService):
     """
     Implementation of WalletQueryService for PostgreSQL.
+
+    Listings use keyset pagination on (created_at, id) rather than OFFSET, so
+    every page is one seek on the (wallet_id, created_at, id) indexes below
+    however deep into the history it is. create_schema() creates the tables
+    and indexes if they don't exist yet.
     """
 
-    def __init__(self, db_session):
-        self.db_session = db_session
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS wallets (
+            wallet_id TEXT PRIMARY KEY,
+            owner_id TEXT NOT NULL UNIQUE,
+            account_balance BIGINT NOT NULL DEFAULT 0,
+            version INTEGER NOT NULL DEFAULT 1
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS reservations (
+            id TEXT PRIMARY KEY,
+            wallet_id TEXT NOT NULL REFERENCES wallets (wallet_id),
+            table_id TEXT NOT NULL,
+            player_id TEXT NOT NULL,
+            amount BIGINT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'ACTIVE',
+            created_at TIMESTAMPTZ NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS wallet_transactions (
+            id TEXT PRIMARY KEY,
+            wallet_id TEXT NOT NULL REFERENCES wallets (wallet_id),
+            amount BIGINT NOT NULL,
+            reason TEXT NOT NULL,
+            reservation_id TEXT,
+            created_at TIMESTAMPTZ NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS wallet_transactions_wallet_time"
+        " ON wallet_transactions (wallet_id, created_at DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS reservations_wallet_time_active"
+        " ON reservations (wallet_id, created_at DESC, id DESC)"
+        " WHERE status = 'ACTIVE'",
+    )
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def create_schema(self) -> None:
+        async with self.session_factory() as session:
+            for statement in self.SCHEMA:
+                await session.execute(text(statement))
+            await session.commit()
+
+    async def get_wallet_balance(self, wallet_id: WalletId) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                text(
+                    "SELECT account_balance FROM wallets WHERE wallet_id = :wallet_id"
+                ),
+                {"wallet_id": wallet_id},
+            )
+            balance = result.scalar_one_or_none()
+        if balance is None:
+            raise WalletNotFoundError(f"No wallet {wallet_id}")
+        return balance
+
+    async def get_wallet_reservations(
+        self, wallet_id: WalletId, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[Reservation]:
+        rows = await self._page(
+            "SELECT id, wallet_id, table_id, player_id, amount, created_at"
+            " FROM reservations WHERE wallet_id = :wallet_id AND status = 'ACTIVE'",
+            wallet_id,
+            limit,
+            cursor,
+        )
+        items = [
+            Reservation(
+                id=ReservationId(str(row.id)),
+                wallet_id=row.wallet_id,
+                table_id=row.table_id,
+                player_id=row.player_id,
+                amount=row.amount,
+                timestamp=row.created_at,
+            )
+            for row in rows[:limit]
+        ]
+        return Page(items, self._next_cursor(rows, limit))
+
+    async def get_wallet_transactions(
+        self, wallet_id: WalletId, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[Transaction]:
+        rows = await self._page(
+            "SELECT id, wallet_id, amount, reason, reservation_id, created_at"
+            " FROM wallet_transactions WHERE wallet_id = :wallet_id",
+            wallet_id,
+            limit,
+            cursor,
+        )
+        items = [
+            Transaction(
+                id=TransactionId(str(row.id)),
+                wallet_id=row.wallet_id,
+                amount=row.amount,
+                reason=row.reason,
+                timestamp=row.created_at,
+                reservation_id=row.reservation_id,
+            )
+            for row in rows[:limit]
+        ]
+        return Page(items, self._next_cursor(rows, limit))
 
-    async def get_wallet_balance(self, wallet_id: str) -> float:
-        # Placeholder for actual database query logic
-        return 100.0  # Example balance
+    async def stream_wallet_transactions(
+        self, wallet_id: WalletId, batch_size: int = 500, cursor: Optional[str] = None
+    ) -> AsyncIterator[Transaction]:
+        while True:
+            page = await self.get_wallet_transactions(wallet_id, batch_size, cursor)
+            for transaction in page.items:
+                yield transaction
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
 
-    async def get_wallet_reservations(self, wallet_id: str) -> list:
-        # Placeholder for actual database query logic
-        return []
+    async def _page(
+        self, select: str, wallet_id: WalletId, limit: int, cursor: Optional[str]
+    ) -> list:
+        # One extra row tells whether there is a next page
+        params = {"wallet_id": wallet_id, "limit": limit + 1}
+        if cursor is not None:
+            created_at, row_id = decode_cursor(cursor)
+            select += " AND (created_at, id) < (:created_at, :id)"
+            params["created_at"] = datetime.fromisoformat(created_at)
+            params["id"] = row_id
+        query = text(select + " ORDER BY created_at DESC, id DESC LIMIT :limit")
+        async with self.session_factory() as session:
+            result = await session.execute(query, params)
+            return result.all()
 
-    async def get_wallet_transactions(self, wallet_id: str) -> list:
-        # Placeholder for actual database query logic
-        return []
+    @staticmethod
+    def _next_cursor(rows: list, limit: int) -> Optional[str]:
+        if len(rows) <= limit:
+            return None
+        last = rows[limit - 1]
+        return encode_cursor(last.created_at.isoformat(), str(last.id))
@@ -1,22 +1,225 @@
-from shared.types import WalletId
+import copy
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple, TypeVar
+from uuid import uuid4
+
+from shared.types import PlayerId, WalletId
 from wallet.application.interfaces import IWalletService
 from wallet.domain.entities import Wallet
-from wallet.domain.value_objects import Reservation, Transaction
+from wallet.domain.exceptions import ReservationNotFoundError, WalletNotFoundError
+from wallet.domain.value_objects import (
+    Reservation,
+    ReservationId,
+    Transaction,
+    TransactionId,
+)
+from wallet.infrastructure.wallet_ledger import WalletLedger
+
+T = TypeVar("T")
 
 
 class WalletService(IWalletService):
     """
     Implementation of IWalletService for managing wallet operations.
+
+    Wallets live in memory and every change is made inside ledger.exclusive(),
+    which first replays whatever other worker processes committed, so the
+    balance check and the record it allows are against the shared log and
+    can't interleave with another request in any process. A change whose
+    record can't be written is undone before the error is raised, so the
+    caller may retry it. Reservations and releases are write-behind;
+    settlements and transactions return once the ledger has made them
+    durable. The ledger is replayed through the same Wallet methods on
+    start-up.
     """
 
-    def __init__(self, wallet_repository):
-        self.wallet_repository = wallet_repository
+    def __init__(self, ledger: WalletLedger):
+        self.ledger = ledger
+        self.ledger.on_record = self._replay
+        self._wallets: Dict[WalletId, Wallet] = {}
+        self._by_owner: Dict[str, Wallet] = {}
+
+    async def start(self) -> None:
+        for record in self.ledger.load():
+            self._replay(record)
+        await self.ledger.start()
+
+    async def stop(self) -> None:
+        await self.ledger.stop()
+
+    async def create_wallet(self, player_id: PlayerId) -> Wallet:
+        with self.ledger.exclusive():
+            if str(player_id) in self._by_owner:
+                return self._by_owner[str(player_id)]
+            wallet = Wallet(WalletId(uuid4().hex), player_id, version=1)
+            self._add(wallet)
+            try:
+                self._commit(wallet, "create", owner_id=str(player_id))
+            except Exception:
+                del self._wallets[wallet.id]
+                del self._by_owner[str(player_id)]
+                raise
+        return wallet
+
+    async def get_balance(self, player_id: PlayerId) -> Wallet:
+        return self._wallet_of(player_id)
+
+    def get_wallet(self, wallet_id: WalletId) -> Wallet:
+        self.ledger.refresh()
+        wallet = self._wallets.get(wallet_id)
+        if wallet is None:
+            raise WalletNotFoundError(f"No wallet {wallet_id}")
+        return wallet
+
+    async def get_active_reservations(self, player_id: PlayerId) -> List[Reservation]:
+        return self._wallet_of(player_id).active_reservations()
+
+    async def create_reservation(
+        self, player_id: PlayerId, table_id: str, amount: int
+    ) -> Reservation:
+        def reserve(wallet: Wallet) -> Tuple[Reservation, int]:
+            reservation = wallet.reserve_funds(table_id, amount)
+            sequence = self._commit(
+                wallet,
+                "reserve",
+                reservation_id=reservation.id,
+                table_id=table_id,
+                amount=amount,
+                timestamp=reservation.timestamp.isoformat(),
+            )
+            return reservation, sequence
+
+        reservation, _ = self._change(player_id, reserve)
+        return reservation
+
+    async def release_reservation(self, player_id: PlayerId, table_id: str) -> None:
+        def release(wallet: Wallet) -> Tuple[None, int]:
+            reservation = self._reservation_at(wallet, table_id)
+            wallet.release_reservation(reservation)
+            return None, self._commit(wallet, "release", reservation_id=reservation.id)
+
+        self._change(player_id, release)
+
+    async def settle_reservation(
+        self, player_id: PlayerId, table_id: str, final_stack: int
+    ) -> Transaction:
+        def settle(wallet: Wallet) -> Tuple[Transaction, int]:
+            reservation = self._reservation_at(wallet, table_id)
+            transaction = wallet.settle_reservation(reservation, final_stack)
+            sequence = self._commit(
+                wallet,
+                "settle",
+                reservation_id=reservation.id,
+                final_stack=final_stack,
+                transaction_id=transaction.id,
+                amount=transaction.amount,
+                reason=transaction.reason,
+                timestamp=transaction.timestamp.isoformat(),
+            )
+            return transaction, sequence
+
+        transaction, sequence = self._change(player_id, settle)
+        await self.ledger.wait_durable(sequence)
+        return transaction
+
+    async def apply_transaction(
+        self, player_id: PlayerId, amount: int, reason: str
+    ) -> Transaction:
+        def apply(wallet: Wallet) -> Tuple[Transaction, int]:
+            transaction = Transaction(
+                id=TransactionId(uuid4().hex),
+                wallet_id=wallet.id,
+                amount=amount,
+                reason=reason,
+                timestamp=datetime.now(timezone.utc),
+            )
+            wallet.apply_transaction(transaction)
+            sequence = self._commit(
+                wallet,
+                "transaction",
+                transaction_id=transaction.id,
+                amount=amount,
+                reason=reason,
+                timestamp=transaction.timestamp.isoformat(),
+            )
+            return transaction, sequence
+
+        transaction, sequence = self._change(player_id, apply)
+        await self.ledger.wait_durable(sequence)
+        return transaction
+
+    def _change(
+        self, player_id: PlayerId, change: Callable[[Wallet], Tuple[T, int]]
+    ) -> Tuple[T, int]:
+        """Run change on the player's wallet under the ledger lock, undoing it if
+        its record isn't committed"""
+        with self.ledger.exclusive():
+            wallet = self._wallet_of(player_id)
+            before = copy.copy(wallet)
+            before.reservations = dict(wallet.reservations)
+            try:
+                return change(wallet)
+            except Exception:
+                self._add(before)
+                raise
+
+    def _wallet_of(self, player_id: PlayerId) -> Wallet:
+        self.ledger.refresh()
+        wallet = self._by_owner.get(str(player_id))
+        if wallet is None:
+            raise WalletNotFoundError(f"Player {player_id} has no wallet")
+        return wallet
+
+    @staticmethod
+    def _reservation_at(wallet: Wallet, table_id: str) -> Reservation:
+        reservation = wallet.reservation_for_table(table_id)
+        if reservation is None:
+            raise ReservationNotFoundError(f"No reservation at table {table_id}")
+        return reservation
 
-    async def get_balance(self, wallet_id: WalletId) -> Wallet:
-        pass
+    def _add(self, wallet: Wallet) -> None:
+        self._wallets[wallet.id] = wallet
+        self._by_owner[str(wallet.owner_id)] = wallet
 
-    async def get_active_reservations(self, wallet: Wallet) -> str:
-        pass
+    def _commit(self, wallet: Wallet, op: str, **fields) -> int:
+        return self.ledger.append(
+            {"wallet_id": wallet.id, "version": wallet.version, "op": op, **fields}
+        )
 
-    async def create_reservation(self, wallet: Wallet) -> None:
-        pass
+    def _replay(self, record: dict) -> None:
+        op = record["op"]
+        if op == "create":
+            self._add(
+                Wallet(
+                    record["wallet_id"], record["owner_id"], version=record["version"]
+                )
+            )
+            return
+        wallet = self._wallets[record["wallet_id"]]
+        if op == "reserve":
+            wallet.reserve_funds(
+                record["table_id"],
+                record["amount"],
+                ReservationId(record["reservation_id"]),
+                datetime.fromisoformat(record["timestamp"]),
+            )
+        elif op == "release":
+            wallet.release_reservation(wallet.reservations[record["reservation_id"]])
+        elif op == "settle":
+            wallet.settle_reservation(
+                wallet.reservations[record["reservation_id"]],
+                record["final_stack"],
+                TransactionId(record["transaction_id"]),
+                datetime.fromisoformat(record["timestamp"]),
+            )
+        elif op == "transaction":
+            wallet.apply_transaction(
+                Transaction(
+                    id=TransactionId(record["transaction_id"]),
+                    wallet_id=wallet.id,
+                    amount=record["amount"],
+                    reason=record["reason"],
+                    timestamp=datetime.fromisoformat(record["timestamp"]),
+                )
+            )
+        wallet.version = record["version"]
@@ -1,24 +1,133 @@
-from typing import List
-from DateTime import DateTime
-from player.domain.entities import PlayerId
-from table.domain.entities import TableId
-from wallet.domain.value_objects import Reservation, Transaction
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import uuid4
 
-from shared.types import WalletId
+from shared.types import PlayerId, WalletId
+from wallet.domain.exceptions import (
+    DuplicateReservationError,
+    InsufficientFundsError,
+    ReservationNotFoundError,
+)
+from wallet.domain.value_objects import (
+    Reservation,
+    ReservationId,
+    Transaction,
+    TransactionId,
+)
 
 
 class Wallet:
+    """
+    A player's funds in integer minor units. balance includes reserved chips;
+    available_balance is what can still be reserved or withdrawn. version is
+    bumped by every change and checked when the change is committed.
+    """
+
     id: WalletId
     owner_id: PlayerId
-    available_balance: float
-    reservations: List[Reservation]
-    transactions: List[Transaction]
+    balance: int
+    reservations: Dict[ReservationId, Reservation]
+    version: int
+
+    def __init__(
+        self, id: WalletId, owner_id: PlayerId, balance: int = 0, version: int = 0
+    ):
+        self.id = id
+        self.owner_id = owner_id
+        self.balance = balance
+        self.reservations = {}
+        self.version = version
+        self._reserved = 0
+
+    @property
+    def reserved_balance(self) -> int:
+        return self._reserved
+
+    @property
+    def available_balance(self) -> int:
+        return self.balance - self._reserved
 
-    def reserve_funds(self, amount: float) -> Reservation:
-        pass
+    def can_afford(self, amount: int) -> bool:
+        return 0 <= amount <= self.available_balance
+
+    def reservation_for_table(self, table_id: str) -> Optional[Reservation]:
+        for reservation in self.reservations.values():
+            if reservation.table_id == table_id:
+                return reservation
+        return None
+
+    def active_reservations(self) -> List[Reservation]:
+        return list(self.reservations.values())
+
+    def reserve_funds(
+        self,
+        table_id: str,
+        amount: int,
+        reservation_id: Optional[ReservationId] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> Reservation:
+        """Set aside a table buy-in; one reservation per table"""
+        if amount <= 0:
+            raise ValueError("Reservation amount must be positive")
+        if self.reservation_for_table(table_id) is not None:
+            raise DuplicateReservationError(f"Already holding a seat at {table_id}")
+        if not self.can_afford(amount):
+            raise InsufficientFundsError(
+                f"Available balance {self.available_balance} is below {amount}"
+            )
+        reservation = Reservation(
+            id=reservation_id or ReservationId(uuid4().hex),
+            wallet_id=self.id,
+            table_id=table_id,
+            player_id=self.owner_id,
+            amount=amount,
+            timestamp=timestamp or datetime.now(timezone.utc),
+        )
+        self.reservations[reservation.id] = reservation
+        self._reserved += amount
+        self.version += 1
+        return reservation
 
     def release_reservation(self, reservation: Reservation) -> bool:
-        pass
+        """Give reserved chips back untouched, e.g. when seating failed"""
+        if self.reservations.pop(reservation.id, None) is None:
+            raise ReservationNotFoundError(f"No active reservation {reservation.id}")
+        self._reserved -= reservation.amount
+        self.version += 1
+        return True
+
+    def settle_reservation(
+        self,
+        reservation: Reservation,
+        final_stack: int,
+        transaction_id: Optional[TransactionId] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> Transaction:
+        """Close a reservation, applying the final stack's difference from the buy-in"""
+        if final_stack < 0:
+            raise ValueError("Final stack cannot be negative")
+        if self.reservations.pop(reservation.id, None) is None:
+            raise ReservationNotFoundError(f"No active reservation {reservation.id}")
+        self._reserved -= reservation.amount
+        transaction = Transaction(
+            id=transaction_id or TransactionId(uuid4().hex),
+            wallet_id=self.id,
+            amount=final_stack - reservation.amount,
+            reason=f"table:{reservation.table_id}",
+            timestamp=timestamp or datetime.now(timezone.utc),
+            reservation_id=reservation.id,
+        )
+        self.balance += transaction.amount
+        self.version += 1
+        return transaction
 
     def apply_transaction(self, transaction: Transaction) -> bool:
-        pass
+        """Apply a deposit (positive) or withdrawal (negative)"""
+        if transaction.amount < 0 and not self.can_afford(-transaction.amount):
+            raise InsufficientFundsError(
+                f"Available balance {self.available_balance} is below "
+                f"{-transaction.amount}"
+            )
+        self.balance += transaction.amount
+        self.version += 1
+        return True
@@ -0,0 +1,18 @@
+class WalletNotFoundError(Exception):
+    pass
+
+
+class InsufficientFundsError(Exception):
+    pass
+
+
+class ReservationNotFoundError(Exception):
+    pass
+
+
+class DuplicateReservationError(Exception):
+    pass
+
+
+class ConcurrentUpdateError(Exception):
+    pass
@@ -1,29 +1,31 @@
+from dataclasses import dataclass
 from datetime import datetime
+from typing import NewType, Optional
 
-from player.domain.entities import PlayerId
-from table.domain.entities import TableId
-
-
-class ReservationId:
-    pass
-
-
-class TransactionId:
-    pass
+ReservationId = NewType("ReservationId", str)
+TransactionId = NewType("TransactionId", str)
 
 
+@dataclass(frozen=True)
 class Reservation:
+    """Chips set aside from a wallet for one table; amounts are minor units"""
+
     id: ReservationId
-    table_id: TableId
-    player_id: PlayerId
-    amount: float
-    is_active: bool
+    wallet_id: str
+    table_id: str
+    player_id: str
+    amount: int
     timestamp: datetime
+    is_active: bool = True
 
 
+@dataclass(frozen=True)
 class Transaction:
+    """A change to a wallet's balance in minor units, e.g. cents"""
+
     id: TransactionId
     wallet_id: str
-    amount: float
+    amount: int
     reason: str
     timestamp: datetime
+    reservation_id: Optional[ReservationId] = None
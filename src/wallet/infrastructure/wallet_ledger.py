@@ -0,0 +1,278 @@
+import asyncio
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from shared.metrics import REPOSITORY_SECONDS
+from wallet.domain.exceptions import ConcurrentUpdateError
+
+_FLUSH_SECONDS = REPOSITORY_SECONDS.labels("wallet_ledger", "flush")
+
+
+@dataclass
+class LedgerMetrics:
+    appended: int = 0
+    flushes: int = 0
+    conflicts: int = 0
+    failed_writes: int = 0
+    failed_flushes: int = 0
+    caught_up: int = 0  # records read back from other processes
+    max_batch: int = 0
+    last_flush_seconds: float = 0.0
+
+
+TRANSACTION_OPS = ("settle", "transaction")
+
+
+class LedgerWriteError(Exception):
+    pass
+
+
+class LedgerSyncError(Exception):
+    pass
+
+
+class WalletLedger:
+    """
+    Durable append-only log of wallet changes, one JSON record per line,
+    shared by every worker process on the host.
+
+    Every record carries the wallet version it produces, and append() rejects
+    a record that does not follow the last committed version of its wallet.
+    Changes are made inside exclusive(), which holds an flock on the file and
+    first reads back whatever other processes appended, passing each record
+    to on_record; so the version check is against the log itself and two
+    processes can never both commit on top of the same version. append()
+    writes the record before the lock is released, and a background task
+    fsyncs everything written in one go; wait_durable() waits for that.
+
+    A write that fails is cut off the file and raises LedgerWriteError, so
+    nothing was committed. A failed fsync is retried with backoff, and
+    whoever was waiting on it gets LedgerSyncError: the change is committed
+    but not yet known to be durable.
+
+    The (offset, length) of every transaction record is indexed per wallet
+    in commit order, so a page of history is a few preads.
+    """
+
+    def __init__(
+        self,
+        file_path: str = "wallet_ledger.jsonl",
+        flush_interval: float = 0.002,
+        retry_delay: float = 0.05,
+        max_retry_delay: float = 5.0,
+    ):
+        self.file_path = file_path
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.on_record: Optional[Callable[[dict], None]] = None
+        self.metrics = LedgerMetrics()
+        self._versions: Dict[str, int] = {}
+        self._transactions: Dict[str, List[Tuple[int, int]]] = {}
+        self._size = 0  # end of the last complete record read or written
+        self._appended = 0
+        self._synced = 0
+        self._failed = 0  # last sequence a failed fsync covered
+        self._locked = False
+        self._fd: Optional[int] = None
+        self._wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._synced_cond = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self) -> List[dict]:
+        """Read every committed record, dropping a line torn by a crash"""
+        self._fd = os.open(
+            self.file_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        with self._lock():
+            return self._read_new(truncate_torn=True)
+
+    async def start(self) -> None:
+        if self._fd is None:
+            self.load()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Let a flush in progress finish rather than cancel it mid-fsync
+            self._stopping.set()
+            self._wake.set()
+            await self._task
+            self._task = None
+        if self._fd is not None:
+            try:
+                await self._flush()
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """
+        Hold the ledger for a check-and-append, after passing the records
+        other processes appended to on_record. Blocks while another process
+        holds it, which is only ever for the length of one write.
+        """
+        with self._lock():
+            self._apply(self._read_new(truncate_torn=True))
+            yield
+
+    def refresh(self) -> None:
+        """Catch up on records other processes appended, without locking"""
+        if self._locked or os.fstat(self._fd).st_size == self._size:
+            return
+        self._apply(self._read_new(truncate_torn=False))
+
+    def check_version(self, wallet_id: str, version: int) -> None:
+        """Raise if version is not the last committed version of the wallet"""
+        if self._versions.get(wallet_id, 0) != version:
+            self.metrics.conflicts += 1
+            raise ConcurrentUpdateError(
+                f"Wallet {wallet_id} is at version {self._versions.get(wallet_id, 0)}, "
+                f"not {version}"
+            )
+
+    def append(self, record: dict) -> int:
+        """Commit a record that moves its wallet to record["version"]"""
+        if not self._locked:
+            raise RuntimeError("append() must be called inside exclusive()")
+        wallet_id = record["wallet_id"]
+        self.check_version(wallet_id, record["version"] - 1)
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        try:
+            view = memoryview(line)
+            while view:
+                view = view[os.write(self._fd, view) :]
+        except OSError as exc:
+            self.metrics.failed_writes += 1
+            # Drop whatever part of the record made it to the file
+            os.ftruncate(self._fd, self._size)
+            raise LedgerWriteError(
+                f"Could not write to the wallet ledger: {exc}"
+            ) from exc
+        self._index(record, len(line))
+        self._appended += 1
+        self.metrics.appended += 1
+        self._wake.set()
+        return self._appended
+
+    def transaction_count(self, wallet_id: str) -> int:
+        return len(self._transactions.get(wallet_id, ()))
+
+    def read_transactions(self, wallet_id: str, start: int, stop: int) -> List[dict]:
+        """Committed transaction records start..stop-1 of a wallet, oldest first"""
+        return [
+            json.loads(os.pread(self._fd, length, offset))
+            for offset, length in self._transactions.get(wallet_id, [])[start:stop]
+        ]
+
+    async def wait_durable(self, sequence: int) -> None:
+        async with self._synced_cond:
+            await self._synced_cond.wait_for(
+                lambda: self._synced >= sequence or self._failed >= sequence
+            )
+        if self._synced < sequence:
+            raise LedgerSyncError(
+                "The change is committed but the ledger could not fsync it yet"
+            )
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._locked = True
+        try:
+            yield
+        finally:
+            self._locked = False
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read_new(self, truncate_torn: bool) -> List[dict]:
+        """Records appended past self._size, indexed as they are read"""
+        end = os.fstat(self._fd).st_size
+        data = os.pread(self._fd, end - self._size, self._size) if end else b""
+        records = []
+        offset = 0
+        while offset < len(data):
+            newline = data.find(b"\n", offset)
+            if newline < 0:
+                # Torn by a process that died mid-write; only cut it off while
+                # holding the lock, when nobody can be writing it
+                if truncate_torn:
+                    os.ftruncate(self._fd, self._size)
+                break
+            line = data[offset : newline + 1]
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if truncate_torn:
+                    raise
+                break  # still being written; read it on the next refresh
+            self._index(record, len(line))
+            records.append(record)
+            offset = newline + 1
+        return records
+
+    def _index(self, record: dict, length: int) -> None:
+        self._versions[record["wallet_id"]] = record["version"]
+        if record["op"] in TRANSACTION_OPS:
+            self._transactions.setdefault(record["wallet_id"], []).append(
+                (self._size, length)
+            )
+        self._size += length
+
+    def _apply(self, records: List[dict]) -> None:
+        self.metrics.caught_up += len(records)
+        if self.on_record is not None:
+            for record in records:
+                self.on_record(record)
+
+    async def _run(self) -> None:
+        delay = self.retry_delay
+        while not self._stopping.is_set():
+            await self._wake.wait()
+            # Let concurrent appends pile into the same fsync
+            await self._pause(self.flush_interval)
+            self._wake.clear()
+            try:
+                await self._flush()
+            except Exception:
+                await self._pause(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                self._wake.set()
+            else:
+                delay = self.retry_delay
+
+    async def _pause(self, seconds: float) -> None:
+        """Sleep, cut short by stop()"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _flush(self) -> None:
+        target = self._appended
+        if self._synced >= target:
+            return
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(os.fsync, self._fd)
+        except Exception:
+            self.metrics.failed_flushes += 1
+            async with self._synced_cond:
+                self._failed = target
+                self._synced_cond.notify_all()
+            raise
+        _FLUSH_SECONDS.observe(time.perf_counter() - started)
+        self.metrics.flushes += 1
+        self.metrics.max_batch = max(self.metrics.max_batch, target - self._synced)
+        self.metrics.last_flush_seconds = time.perf_counter() - started
+        async with self._synced_cond:
+            self._synced = target
+            self._synced_cond.notify_all()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The code imports its packages from src/, as the app and tools run them
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
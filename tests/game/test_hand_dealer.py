@@ -0,0 +1,114 @@
+import asyncio
+
+from game.application.hand_dealer import HandDealer
+from game.application.table_actor import TableActorRegistry
+from game.domain.factories import GameFactory
+from game.domain.poker.engine import PokerRulesEngine
+from game.domain.poker.enums import Action
+from game.domain.poker.value_objects import PlayerAction, PokerGameState
+from game.infrastructure.deck_service import DeckService
+from game.infrastructure.entropy_pool import EntropyPool
+from game.infrastructure.randomness_provider import LocalRandomnessProvider
+
+
+async def _wait_for(actor, predicate):
+    for _ in range(500):
+        state = await actor.read(lambda game: game.game_state)
+        if predicate(state):
+            return state
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out waiting for the table")
+
+
+async def _play_out(actor, state):
+    while not state.is_complete:
+        player_id = state.player_ids[state.action_on]
+        action = PlayerAction(Action.CHECK)
+        if not PokerRulesEngine.validate_action(state, player_id, action):
+            action = PlayerAction(Action.FOLD)
+        state = await actor.act(player_id, action)
+
+
+def test_rejoining_mid_hand_keeps_the_new_buy_in():
+    async def run():
+        pool = EntropyPool(LocalRandomnessProvider())
+        await pool.start()
+        dealer = None
+
+        def on_state(table_id, state):
+            if isinstance(state, PokerGameState) and state.is_complete:
+                payouts = PokerRulesEngine.calculate_payouts(state)
+                dealer.hand_finished(table_id, state, payouts)
+
+        actors = TableActorRegistry(GameFactory(), on_state=on_state)
+        dealer = HandDealer(actors, DeckService(pool), next_hand_delay=0.0)
+        actor = actors.actor_for("t", 6)
+        for seat, player_id in enumerate(("a", "b", "c")):
+            await actor.join(player_id, seat)
+            dealer.sit_down("t", player_id, 1_000, "5/10")
+        state = await _wait_for(actor, lambda state: state is not None)
+        dealer.next_hand_delay = 60.0  # deal nothing more during the test
+
+        # The first player to act folds, stands up and buys in again
+        leaver = state.player_ids[state.action_on]
+        state = await actor.act(leaver, PlayerAction(Action.FOLD))
+        cashed_out = await dealer.stand_up("t", leaver)
+        await actor.join(leaver)
+        dealer.sit_down("t", leaver, 700, "5/10")
+
+        await _play_out(actor, state)
+        chips = {
+            player_id: await dealer.stand_up("t", player_id)
+            for player_id in ("a", "b", "c")
+        }
+        await actors.close()
+        await pool.stop()
+        return leaver, cashed_out, chips
+
+    leaver, cashed_out, chips = asyncio.run(run())
+    assert chips[leaver] == 700
+    assert cashed_out + sum(chips.values()) - 700 == 3_000
+
+
+def test_table_handed_to_another_dealer_keeps_seats_stacks_and_button():
+    async def run():
+        pool = EntropyPool(LocalRandomnessProvider())
+        await pool.start()
+        dealers = []
+
+        def on_state(table_id, state):
+            if isinstance(state, PokerGameState) and state.is_complete:
+                payouts = PokerRulesEngine.calculate_payouts(state)
+                dealers[0].hand_finished(table_id, state, payouts)
+
+        source_actors = TableActorRegistry(GameFactory(), on_state=on_state)
+        target_actors = TableActorRegistry(GameFactory())
+        dealers.append(HandDealer(source_actors, DeckService(pool), 0.0))
+        target = HandDealer(target_actors, DeckService(pool), next_hand_delay=60.0)
+        actor = source_actors.actor_for("t", 6)
+        for seat, player_id in ((0, "a"), (2, "b"), (5, "c")):
+            await actor.join(player_id, seat)
+            dealers[0].sit_down("t", player_id, 1_000, "5/10")
+        state = await _wait_for(actor, lambda state: state is not None)
+        dealers[0].next_hand_delay = 60.0
+        await _play_out(actor, state)
+        await _wait_for(actor, lambda state: state.is_complete)
+
+        handoff = await dealers[0].hand_off("t")
+        assert await actor.read(lambda game: dict(game.seats)) == {}
+        await target.take_over("t", handoff)
+        moved = target_actors.get("t")
+        seats = await moved.read(lambda game: dict(game.seats))
+        stacks = {
+            player_id: await target.stand_up("t", player_id)
+            for player_id in ("a", "b", "c")
+        }
+        await source_actors.close()
+        await target_actors.close()
+        await pool.stop()
+        return handoff, seats, stacks
+
+    handoff, seats, stacks = asyncio.run(run())
+    assert seats == {0: "a", 2: "b", 5: "c"}
+    assert handoff["button_seat"] >= 0
+    assert stacks == handoff["stacks"] and sum(stacks.values()) == 3_000
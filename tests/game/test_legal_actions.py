@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from game.application.self_play import AggressiveBot, RandomBot
+from game.domain.exceptions import InvalidActionError
+from game.domain.poker.engine import PokerRulesEngine, _check_action, shuffle_deck
+from game.domain.poker.enums import Action
+from game.domain.poker.value_objects import PlayerAction, PokerGameState
+
+
+def _states(players: int, hands: int = 60):
+    rng = random.Random(players)
+    player_ids = [f"p{seat}" for seat in range(players)]
+    for number in range(hands):
+        state = PokerRulesEngine.start_hand(
+            f"h{number}",
+            player_ids,
+            [rng.randint(150, 5_000) for _ in player_ids],
+            number % players,
+            50,
+            100,
+            shuffle_deck(f"legal:{players}:{number}"),
+        )
+        bot = AggressiveBot() if number % 3 == 0 else RandomBot()
+        while not state.is_complete:
+            yield state
+            seat = state.action_on
+            state = PokerRulesEngine.apply_action(
+                state, player_ids[seat], bot.act(state, seat, rng)
+            )
+        yield state
+
+
+def _candidates(state: PokerGameState):
+    """Every action kind at amounts around each limit a rule checks"""
+    amounts = {0, state.current_bet, state.current_bet + state.min_raise}
+    amounts |= {amount - 1 for amount in amounts if amount}
+    if state.action_on >= 0:
+        all_in = state.bets[state.action_on] + state.stacks[state.action_on]
+        amounts |= {all_in - 1, all_in, all_in + 1}
+    for kind in Action:
+        for amount in sorted(amounts):
+            yield PlayerAction(kind, amount)
+
+
+@pytest.mark.parametrize("players", (2, 3, 6, 9))
+def test_cached_legal_actions_agree_with_rules(players):
+    for state in _states(players):
+        # Without the cache, _check_action falls back to the rules themselves
+        uncached = state.evolve(legal_actions=None)
+        on_clock = state.player_ids[state.action_on] if state.action_on >= 0 else None
+        for player_id in {state.player_ids[0], state.player_ids[-1], on_clock}:
+            if player_id is None:
+                continue
+            for action in _candidates(state):
+                try:
+                    _check_action(uncached, player_id, action)
+                    allowed = True
+                except InvalidActionError as exc:
+                    allowed = "is not allowed" in str(exc)
+                assert (
+                    PokerRulesEngine.validate_action(state, player_id, action)
+                    == allowed
+                ), (state.street, player_id, action)
+
+
+@pytest.mark.parametrize("players", (2, 6, 9))
+def test_validated_actions_are_the_ones_apply_action_takes(players):
+    for state in _states(players, hands=30):
+        if state.is_complete:
+            continue
+        player_id = state.player_ids[state.action_on]
+        for action in _candidates(state):
+            try:
+                PokerRulesEngine.apply_action(state, player_id, action)
+                applied = True
+            except InvalidActionError:
+                applied = False
+            assert (
+                PokerRulesEngine.validate_action(state, player_id, action) == applied
+            ), (state.street, player_id, action)
@@ -0,0 +1,81 @@
+import random
+from typing import Dict, List
+
+import pytest
+
+from game.application.self_play import AggressiveBot, CallingStationBot, RandomBot
+from game.domain.poker.engine import PokerRulesEngine, shuffle_deck
+from game.domain.poker.hand_evaluator import evaluate_batch
+from game.domain.poker.value_objects import PokerGameState
+
+BOTS = (AggressiveBot(), RandomBot(), CallingStationBot())
+
+
+def reference_payouts(state: PokerGameState, starts: List[int]) -> Dict[str, int]:
+    """
+    Pay a finished hand layer by layer: every distinct amount put in caps a
+    layer, which goes to the best live hand among those who put in that much
+    """
+    seats = len(starts)
+    put_in = [starts[seat] - state.stacks[seat] for seat in range(seats)]
+    live = [seat for seat in range(seats) if not state.folded >> seat & 1]
+    if len(live) > 1:
+        hands = [state.cards_for_seat(seat) for seat in live]
+        strength = dict(zip(live, evaluate_batch(state.board, hands)))
+    else:
+        strength = {live[0]: 0}
+    layers: List[list] = []
+    below = 0
+    for level in sorted({chips for chips in put_in if chips}):
+        amount = sum(min(chips, level) - min(chips, below) for chips in put_in)
+        eligible = [seat for seat in live if put_in[seat] >= level]
+        below = level
+        # Layers nobody live reached, or with the same contenders, merge down
+        if layers and (not eligible or layers[-1][1] == eligible):
+            layers[-1][0] += amount
+        else:
+            layers.append([amount, eligible])
+    won = [0] * seats
+    odd_chip_order = [(state.button + step) % seats for step in range(1, seats + 1)]
+    for amount, eligible in layers:
+        best = max(strength[seat] for seat in eligible)
+        winners = [
+            seat
+            for seat in odd_chip_order
+            if seat in eligible and strength[seat] == best
+        ]
+        share, odd_chips = divmod(amount, len(winners))
+        for i, seat in enumerate(winners):
+            won[seat] += share + (1 if i < odd_chips else 0)
+    return {state.player_ids[seat]: won[seat] for seat in range(seats) if won[seat]}
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_payouts_match_layered_reference(seed):
+    rng = random.Random(seed)
+    for number in range(500):
+        players = rng.randint(2, 9)
+        player_ids = [f"p{seat}" for seat in range(players)]
+        # Few distinct stack sizes, so all-ins often tie and pots merge
+        starts = [
+            rng.choice((100, 250, 400, 1000, 3000)) + rng.randint(0, 7)
+            for _ in range(players)
+        ]
+        state = PokerRulesEngine.start_hand(
+            f"h{seed}-{number}",
+            player_ids,
+            starts,
+            number % players,
+            50,
+            100,
+            shuffle_deck(f"side-pots:{seed}:{number}"),
+        )
+        bots = [rng.choice(BOTS) for _ in range(players)]
+        while not state.is_complete:
+            seat = state.action_on
+            action = bots[seat].act(state, seat, rng)
+            state = PokerRulesEngine.apply_action(state, player_ids[seat], action)
+
+        payouts = PokerRulesEngine.calculate_payouts(state)
+        assert payouts == reference_payouts(state, starts), (number, starts)
+        assert sum(payouts.values()) == sum(starts) - sum(state.stacks)
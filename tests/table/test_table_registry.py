@@ -0,0 +1,78 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from table.infrastructure.table_registry import (
+    ConsistentHashTableRegistry,
+    InMemoryRegistryStore,
+    RedisRegistryStore,
+    WorkerInfo,
+)
+
+
+def _stores():
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return InMemoryRegistryStore(), RedisRegistryStore(redis)
+
+
+@pytest.mark.parametrize("which", [0, 1])
+def test_concurrent_assignments_agree_and_count_load_once(which):
+    async def run():
+        store = _stores()[which]
+        workers = [
+            ConsistentHashTableRegistry(store, vnodes_per_weight=8) for _ in range(2)
+        ]
+        await workers[0].register_worker(WorkerInfo("a", "http://a"))
+        await workers[1].register_worker(WorkerInfo("b", "http://b"))
+        urls = await asyncio.gather(
+            *(
+                registry.assign_table_to_server(f"t{n}")
+                for n in range(40)
+                for registry in workers
+            )
+        )
+        assert urls[0::2] == urls[1::2]
+        loads = {w.worker_id: w.load for w in (await store.get_workers()).values()}
+        assert sum(loads.values()) == 40
+        await store.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("which", [0, 1])
+def test_migrations_planned_by_one_worker_are_applied_by_another(which):
+    async def run():
+        store = _stores()[which]
+        planner = ConsistentHashTableRegistry(store, vnodes_per_weight=8)
+        source = ConsistentHashTableRegistry(store, vnodes_per_weight=8)
+        await planner.register_worker(WorkerInfo("a", "http://a"))
+        for n in range(20):
+            await source.assign_table_to_server(f"t{n}")
+        await planner.register_worker(WorkerInfo("b", "http://b"))
+
+        planned = await planner.rebalance()
+        assert planned and await planner.rebalance() == []
+        outgoing = await source.migrations_from("a")
+        assert {m.table_id for m in outgoing} == {m.table_id for m in planned}
+
+        moved = outgoing[0]
+        handoff = {"seats": {"0": "p1"}, "stacks": {"p1": 500}}
+        assert await source.on_hand_boundary(moved, handoff)
+        assert not await source.on_hand_boundary(moved)
+        assert await planner.get_server_for_table(moved.table_id) == "http://b"
+        assert await planner.handed_off_to("b") == [moved.table_id]
+        assert await planner.take_handoff(moved.table_id) == handoff
+        assert await planner.take_handoff(moved.table_id) is None
+        # The worker the table left can no longer release it
+        await source.release_table(moved.table_id, "a")
+        assert await planner.get_server_for_table(moved.table_id) == "http://b"
+
+        # Releasing a table drops the move planned for it
+        await source.release_table(outgoing[1].table_id, "a")
+        assert not await source.on_hand_boundary(outgoing[1])
+        loads = {w.worker_id: w.load for w in (await store.get_workers()).values()}
+        assert loads == {"a": 18, "b": 1}
+        await store.close()
+
+    asyncio.run(run())
@@ -0,0 +1,92 @@
+import asyncio
+import random
+
+import fakeredis
+import pytest
+
+from game.domain.enums import GameType
+from table.domain.entities import TableConfig
+from table.domain.exceptions import (
+    NoOpenSeatsAtTableError,
+    TableAlreadyExistsError,
+    TableNotFoundError,
+)
+from table.infrastructure.table_respository import (
+    InMemoryTableRepository,
+    RedisTableRepository,
+)
+
+
+FILTERS = (
+    {},
+    {"stakes": "1/2"},
+    {"stakes": "2/5", "max_seats": 6},
+    {"game_type": "poker", "max_seats": 9},
+    {"min_open_seats": 1},
+    {"min_open_seats": 5},
+    {"buy_in": 150},
+    {"buy_in": 2_000, "stakes": "5/10"},
+    {"stakes": "1/2", "min_open_seats": 2, "buy_in": 400},
+)
+
+
+def _config(number: int, rng: random.Random) -> TableConfig:
+    min_buy_in = rng.choice((100, 200, 500))
+    return TableConfig(
+        id=f"t{number}",
+        name=f"Table {number}",
+        stakes=rng.choice(("1/2", "2/5", "5/10")),
+        max_seats=rng.choice((2, 6, 9)),
+        min_buy_in=min_buy_in,
+        max_buy_in=min_buy_in * rng.choice((2, 5, 10)),
+        game_type=GameType.POKER,
+    )
+
+
+async def _apply(repository, rng: random.Random) -> list:
+    """Run one random workload, returning everything the repository said"""
+    said = []
+    for number in range(40):
+        await repository.create(_config(number, rng))
+    with pytest.raises(TableAlreadyExistsError):
+        await repository.create(_config(0, rng))
+    for _ in range(150):
+        table_id = f"t{rng.randrange(42)}"
+        player_id = f"p{rng.randrange(20)}"
+        try:
+            if rng.random() < 0.7:
+                said.append(await repository.claim_seat(table_id, player_id))
+            else:
+                said.append(await repository.release_seat(table_id, player_id))
+        except (NoOpenSeatsAtTableError, TableNotFoundError) as exc:
+            said.append(type(exc).__name__)
+    await repository.update("t3", {"stakes": "5/10", "max_seats": 9})
+    await repository.delete("t4")
+    with pytest.raises(TableNotFoundError):
+        await repository.update("t4", {"name": "gone"})
+    ids = [f"t{number}" for number in range(42)]
+    said.append(await repository.seat_counts(ids))
+    said.append([await repository.seat_map(table_id) for table_id in ids])
+    said.append([await repository.get_by_id(table_id) for table_id in ids])
+    for filters in FILTERS:
+        said.append(sorted(config.id for config in await repository.list(filters)))
+        said.append(len(await repository.list(filters, limit=3)))
+    return said
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_redis_repository_matches_in_memory(seed):
+    async def run():
+        redis = RedisTableRepository(
+            fakeredis.FakeAsyncRedis(decode_responses=True), batch_size=7
+        )
+        try:
+            return (
+                await _apply(InMemoryTableRepository(), random.Random(seed)),
+                await _apply(redis, random.Random(seed)),
+            )
+        finally:
+            await redis.close()
+
+    in_memory, redis = asyncio.run(run())
+    assert redis == in_memory
@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+import pytest
+
+from wallet.application.wallet_service import WalletService
+from wallet.domain.exceptions import InsufficientFundsError
+from wallet.infrastructure.wallet_ledger import LedgerWriteError, WalletLedger
+
+
+def test_workers_sharing_a_ledger_cannot_double_spend(tmp_path):
+    async def run():
+        path = str(tmp_path / "ledger.jsonl")
+        first = WalletService(WalletLedger(path))
+        second = WalletService(WalletLedger(path))
+        await first.start()
+        await second.start()
+        wallet = await first.create_wallet("p1")
+        assert (await second.create_wallet("p1")).id == wallet.id
+        await first.apply_transaction("p1", 100, "deposit")
+        await second.apply_transaction("p1", -100, "withdraw")
+        with pytest.raises(InsufficientFundsError):
+            await first.apply_transaction("p1", -100, "withdraw")
+        assert (await first.get_balance("p1")).balance == 0
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(run())
+
+
+def test_failed_write_leaves_the_wallet_unchanged(tmp_path, monkeypatch):
+    async def run():
+        service = WalletService(WalletLedger(str(tmp_path / "ledger.jsonl")))
+        await service.start()
+        await service.create_wallet("p1")
+        await service.apply_transaction("p1", 100, "deposit")
+
+        def full_disk(fd, data):
+            raise OSError(28, "No space left on device")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(os, "write", full_disk)
+            with pytest.raises(LedgerWriteError):
+                await service.apply_transaction("p1", 50, "deposit")
+            with pytest.raises(LedgerWriteError):
+                await service.create_reservation("p1", "t1", 100)
+        wallet = await service.get_balance("p1")
+        assert (wallet.balance, wallet.reserved_balance) == (100, 0)
+        await service.apply_transaction("p1", 50, "deposit")
+        await service.stop()
+
+        replayed = WalletService(WalletLedger(str(tmp_path / "ledger.jsonl")))
+        await replayed.start()
+        assert (await replayed.get_balance("p1")).balance == 150
+        await replayed.stop()
+
+    asyncio.run(run())